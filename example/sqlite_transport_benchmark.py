@@ -0,0 +1,91 @@
+"""
+Measures SQLiteTransport and DiskTransport write and read throughput (objects/sec).
+
+    python example/sqlite_transport_benchmark.py --count 1000000
+    python example/sqlite_transport_benchmark.py --transport disk
+"""
+
+import argparse
+import random
+import string
+import tempfile
+import time
+from functools import partial
+
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.disk import DiskTransport
+from specklepy.transports.sqlite import SQLiteTransport
+
+
+def make_objects(count: int, size: int):
+    letters = string.ascii_lowercase
+    filler = "".join(random.choice(letters) for _ in range(size))
+    return [
+        (f"{i:032x}", f'{{"id":"{i:032x}","speckle_type":"Base","data":"{filler}"}}')
+        for i in range(count)
+    ]
+
+
+def bench_write(transport: AbstractTransport, objects) -> float:
+    start = time.perf_counter()
+    transport.begin_write()
+    for id, obj in objects:
+        transport.save_object(id, obj)
+    transport.end_write()
+    return time.perf_counter() - start
+
+
+def bench_single_reads(transport: AbstractTransport, ids) -> float:
+    start = time.perf_counter()
+    for id in ids:
+        transport.get_object(id)
+    return time.perf_counter() - start
+
+
+def bench_bulk_reads(transport: AbstractTransport, ids, batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(ids), batch_size):
+        transport.get_objects(ids[i : i + batch_size])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--object-size", type=int, default=200)
+    parser.add_argument("--read-batch-size", type=int, default=10_000)
+    parser.add_argument("--transport", choices=["sqlite", "disk"], default="sqlite")
+    args = parser.parse_args()
+
+    objects = make_objects(args.count, args.object_size)
+    ids = [id for id, _ in objects]
+    random.shuffle(ids)
+
+    def report(label: str, seconds: float):
+        print(f"\t{label:<22}{args.count / seconds:>12,.0f} objects/sec")
+
+    if args.transport == "disk":
+        configurations = {"disk": DiskTransport}
+    else:
+        configurations = {
+            f"background_writer={background_writer}": partial(
+                SQLiteTransport, background_writer=background_writer
+            )
+            for background_writer in (False, True)
+        }
+
+    for label, create_transport in configurations.items():
+        print(label)
+        with tempfile.TemporaryDirectory() as base_path:
+            transport = create_transport(base_path=base_path)
+            report("write", bench_write(transport, objects))
+            report("read (get_object)", bench_single_reads(transport, ids))
+            report(
+                "read (get_objects)",
+                bench_bulk_reads(transport, ids, args.read_batch_size),
+            )
+            transport.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """This module provides an abstraction layer above the Speckle Automate runtime."""
 
+import os
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -30,6 +31,16 @@ from specklepy.objects.base import Base
 from specklepy.transports.memory import MemoryTransport
 from specklepy.transports.server import ServerTransport
 
+#: received versions bigger than this are spilled to disk, to fit tight containers
+DEFAULT_MEMORY_BUDGET_MB = 512
+
+
+def _memory_transport() -> MemoryTransport:
+    budget = os.environ.get("SPECKLE_AUTOMATE_MEMORY_BUDGET_MB")
+    return MemoryTransport(
+        max_memory_mb=float(budget) if budget else DEFAULT_MEMORY_BUDGET_MB
+    )
+
 
 @dataclass
 class AutomationContext:
@@ -47,7 +58,8 @@ class AutomationContext:
     _speckle_token: str
 
     #: keep a memory transponrt at hand, to speed up things if needed
-    _memory_transport: MemoryTransport = field(default_factory=MemoryTransport)
+    #: its budget can be set with the SPECKLE_AUTOMATE_MEMORY_BUDGET_MB env var
+    _memory_transport: MemoryTransport = field(default_factory=_memory_transport)
 
     #: added for performance measuring
     _init_time: float = field(default_factory=time.perf_counter)
@@ -19,6 +19,7 @@ from typing import Any
 from specklepy.bundle.envelope_writer import SceneView, SceneViewKey
 from specklepy.bundle.pipeline import ObjectsArtifactPipeline
 from specklepy.bundle.spec import Rel
+from specklepy.logging import profiling
 from specklepy.objects.base import Base
 from specklepy.objects.data_objects import DataObject
 from specklepy.objects.geometry import Mesh
@@ -49,6 +50,10 @@ class IfcBundleExporter:
 
         Returns ``(root_id, object_count)`` for the uploader.
         """
+        with profiling.profile("bundle-export"):
+            return self._export(root)
+
+    def _export(self, root: Collection) -> tuple[str, int]:
         mesh_by_id = self._index_definition_geometry(root)
 
         self._emit_definitions(root, mesh_by_id)
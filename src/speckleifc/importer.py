@@ -19,6 +19,7 @@ from speckleifc.proxy_managers.render_material_proxy_manager import (
     RenderMaterialProxyManager,
 )
 from speckleifc.proxy_managers.system_proxy_manager import SystemProxyManager
+from specklepy.logging import profiling, tracing
 from specklepy.logging.exceptions import SpeckleException
 from specklepy.objects import Base
 from specklepy.objects.data_objects import DataObject
@@ -152,15 +153,29 @@ class ImportJob:
         return s
 
     def convert(self) -> Base:
+        with profiling.profile("ifc-convert"):
+            return self._convert()
+
+    def _convert(self) -> Base:
         start = time.time()
-        self.pre_process_geometry()
+        with (
+            profiling.profile("geometry"),
+            tracing.span("speckleifc.geometry") as span,
+        ):
+            self.pre_process_geometry()
+            span.set_attribute("geometries", self.geometries_count)
         print(
             f"Geometry conversion complete after {(time.time() - start):.3f}s"  # noqa: E501
         )
         print(f"Created {self.geometries_count} geometries")
 
         start = time.time()
-        root = self._convert_project_tree()
+        with (
+            profiling.profile("element-tree"),
+            tracing.span("speckleifc.element_tree") as span,
+        ):
+            root = self._convert_project_tree()
+            span.set_attribute("geometries_used", self.geometries_used)
         print(
             f"Element tree conversion complete after {(time.time() - start):.3f}s"  # noqa: E501
         )
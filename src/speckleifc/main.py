@@ -1,5 +1,6 @@
 import contextlib
 import importlib.metadata
+import logging
 import os
 import tempfile
 import time
@@ -19,12 +20,14 @@ from specklepy.core.api.inputs.model_ingestion_inputs import (
 )
 from specklepy.core.api.models.current import Project, Version
 from specklepy.core.api.operations import send
-from specklepy.logging import metrics
+from specklepy.logging import metrics, profiling
 from specklepy.logging.exceptions import SpeckleException
 from specklepy.progress.ingestion_progress import IngestionProgressManager
 from specklepy.progress.progress_transport import ProgressTransport
 from specklepy.transports.server import ServerTransport
 
+LOG = logging.getLogger(__name__)
+
 # Since progress messages are currently blocking (no async), we're being extra coarse
 # with progress updates to ensure we're not waisting time sending updates.
 # We could maybe go a little lower, but for now I'm not risking degrading performance
@@ -102,6 +105,7 @@ def open_and_convert_file(
                 data,
                 transports=[remote_transport, progress_transport],
                 use_default_cache=False,
+                on_report=lambda report: LOG.info("%s", report.summary()),
             )
             print(
                 f"Sending to speckle complete after: {(time.time() - start):.3f}s"  # noqa: E501
@@ -142,6 +146,9 @@ def open_and_convert_file(
         return version
     except Exception as e:
         stack_trace = traceback.format_exc()
+        profiles = profiling.recent_profiles()
+        if profiles:
+            stack_trace += "\nProfiles:\n" + "\n".join(profiles)
         with contextlib.suppress(Exception):
             # make sure to not report process kills when we're cancelling
             client.model_ingestion.fail_with_error(
@@ -1,18 +1,25 @@
-from typing import List, Optional
+from typing import Callable, List, Optional, Union
 
 from specklepy.core.api.operations import deserialize as core_deserialize
 from specklepy.core.api.operations import receive as _untracked_receive
+from specklepy.core.api.operations import receive_async as _untracked_receive_async
 from specklepy.core.api.operations import send as core_send
+from specklepy.core.api.operations import send_async as core_send_async
 from specklepy.core.api.operations import serialize as core_serialize
 from specklepy.logging import metrics
+from specklepy.logging.report import OperationReport
 from specklepy.objects.base import Base
+from specklepy.progress.receive_progress import ReceiveProgress
 from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.server.async_server import AsyncServerTransport
 
 
 def send(
     base: Base,
     transports: Optional[List[AbstractTransport]] = None,
     use_default_cache: bool = True,
+    concurrent_writes: bool = False,
+    on_report: Optional[Callable[[OperationReport], None]] = None,
 ):
     """Sends an object via the provided transports. Defaults to the local cache.
 
@@ -21,6 +28,9 @@ def send(
         transports {list} -- where you want to send them
         use_default_cache {bool} -- toggle for the default cache.
         If set to false, it will only send to the provided transports
+        concurrent_writes {bool} -- write to every transport from its own thread,
+        so a slow transport doesn't hold up serialization
+        on_report {callable} -- called with the timings of the send once it is done
 
     Returns:
         str -- the object id of the sent object
@@ -30,13 +40,16 @@ def send(
     else:
         metrics.track(metrics.SEND, getattr(transports[0], "account", None))
 
-    return core_send(base, transports, use_default_cache)
+    return core_send(base, transports, use_default_cache, concurrent_writes, on_report)
 
 
 def receive(
     obj_id: str,
     remote_transport: Optional[AbstractTransport] = None,
     local_transport: Optional[AbstractTransport] = None,
+    on_report: Optional[Callable[[OperationReport], None]] = None,
+    on_progress: Optional[Callable[[ReceiveProgress], None]] = None,
+    progress_interval_seconds: float = 0.5,
 ) -> Base:
     """Receives an object from a transport.
 
@@ -45,12 +58,69 @@ def receive(
         remote_transport {Transport} -- the transport to receive from
         local_transport {Transport} -- the local cache to check for existing objects
                                        (defaults to `SQLiteTransport`)
+        on_report {callable} -- called with the timings of the receive once it is
+                                done
+        on_progress {callable} -- called with the objects and bytes downloaded, then
+                                  the objects deserialized, at most every
+                                  `progress_interval_seconds` and at the end of
+                                  each stage
 
     Returns:
         Base -- the base object
     """
     metrics.track(metrics.RECEIVE, getattr(remote_transport, "account", None))
-    return _untracked_receive(obj_id, remote_transport, local_transport)
+    return _untracked_receive(
+        obj_id,
+        remote_transport,
+        local_transport,
+        on_report,
+        on_progress,
+        progress_interval_seconds,
+    )
+
+
+async def send_async(
+    base: Base,
+    transports: Optional[List[Union[AbstractTransport, AsyncServerTransport]]] = None,
+    use_default_cache: bool = True,
+) -> str:
+    """Sends an object via the provided transports, without blocking the event loop.
+
+    Arguments:
+        obj {Base} -- the object you want to send
+        transports {list} -- where you want to send them
+        use_default_cache {bool} -- toggle for the default cache.
+        If set to false, it will only send to the provided transports
+
+    Returns:
+        str -- the object id of the sent object
+    """
+    if transports is None:
+        metrics.track(metrics.SEND)
+    else:
+        metrics.track(metrics.SEND, getattr(transports[0], "account", None))
+
+    return await core_send_async(base, transports, use_default_cache)
+
+
+async def receive_async(
+    obj_id: str,
+    remote_transport: Optional[AsyncServerTransport] = None,
+    local_transport: Optional[AbstractTransport] = None,
+) -> Base:
+    """Receives an object from a transport, without blocking the event loop.
+
+    Arguments:
+        obj_id {str} -- the id of the object to receive
+        remote_transport {AsyncServerTransport} -- the transport to receive from
+        local_transport {Transport} -- the local cache to check for existing objects
+                                       (defaults to `SQLiteTransport`)
+
+    Returns:
+        Base -- the base object
+    """
+    metrics.track(metrics.RECEIVE, getattr(remote_transport, "account", None))
+    return await _untracked_receive_async(obj_id, remote_transport, local_transport)
 
 
 def serialize(
@@ -98,4 +168,11 @@ def deserialize(
     return core_deserialize(obj_string, read_transport)
 
 
-__all__ = ["receive", "send", "serialize", "deserialize"]
+__all__ = [
+    "receive",
+    "send",
+    "receive_async",
+    "send_async",
+    "serialize",
+    "deserialize",
+]
@@ -30,6 +30,7 @@ from specklepy.bundle.envelope_writer import EnvelopeWriter, SceneView
 from specklepy.bundle.geometries_writer import GeometriesParquetWriter
 from specklepy.bundle.interner import IdInterner
 from specklepy.bundle.spec import NodeKind, Rel
+from specklepy.logging import tracing
 
 
 def _format_transform(transform: Sequence[float]) -> str:
@@ -405,9 +406,10 @@ class ObjectsArtifactPipeline:
 
     def complete(self) -> None:
         """Flush + finalize every artefact. All parquet files written on return."""
-        self._geometries.complete()
-        self._envelope.complete()
-        self._eav.complete()
+        with tracing.span("speckle.bundle.complete"):
+            self._geometries.complete()
+            self._envelope.complete()
+            self._eav.complete()
 
     def __enter__(self) -> ObjectsArtifactPipeline:
         return self
@@ -21,6 +21,7 @@ from typing import Mapping
 import httpx
 
 from specklepy.core.api.credentials import Account
+from specklepy.logging import tracing
 
 
 class ArtifactUploadError(Exception):
@@ -118,7 +119,8 @@ class ArtifactPipeline:
             f"projects/{self._project_id}/modelingestion/{self._ingestion_id}"
             "/uploads/sign"
         )
-        resp = self._speckle.post(uri, json={"files": files})
+        with tracing.span("speckle.artifacts.sign", files=len(files)):
+            resp = self._speckle.post(uri, json={"files": files})
         self._ensure_success(resp, "artifacts sign")
         return resp.json()
 
@@ -126,8 +128,15 @@ class ArtifactPipeline:
         url = presigned["url"]
         extra = presigned.get("additionalRequestHeaders") or {}
         headers = {"Content-Type": "application/octet-stream", **extra}
-        with open(file_path, "rb") as f:
-            resp = self._s3.put(url, content=f.read(), headers=headers)
+        with (
+            tracing.span(
+                "speckle.artifacts.put", file=os.path.basename(file_path)
+            ) as span,
+            open(file_path, "rb") as f,
+        ):
+            content = f.read()
+            span.set_attribute("bytes", len(content))
+            resp = self._s3.put(url, content=content, headers=headers)
         resp.raise_for_status()
         return _parse_etag(resp)
 
@@ -138,14 +147,15 @@ class ArtifactPipeline:
             f"projects/{self._project_id}/modelingestion/{self._ingestion_id}"
             "/uploads/complete"
         )
-        resp = self._speckle.post(
-            uri,
-            json={
-                "etags": dict(etags),
-                "rootId": root_id,
-                "totalChildrenCount": total_children_count,
-            },
-        )
+        with tracing.span("speckle.artifacts.complete", files=len(etags)):
+            resp = self._speckle.post(
+                uri,
+                json={
+                    "etags": dict(etags),
+                    "rootId": root_id,
+                    "totalChildrenCount": total_children_count,
+                },
+            )
         self._ensure_success(resp, "artifacts complete")
 
         # The version id is pre-allocated (server-minted at ingestion creation) and is
@@ -0,0 +1,248 @@
+"""
+Prefetches the new versions of a project into the local cache, as they are
+published, so a later `operations.receive` of them finds everything locally.
+"""
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Optional, Set, Tuple
+
+from specklepy.core.api.client import SpeckleClient
+from specklepy.core.api.enums import ProjectVersionsUpdatedMessageType
+from specklepy.core.api.models.subscription_messages import (
+    ProjectVersionsUpdatedMessage,
+)
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.serialization.json_codec import get_json_codec
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.server import ServerTransport
+from specklepy.transports.sqlite import SQLiteTransport
+
+LOG = logging.getLogger(__name__)
+
+# the missing objects of a version are downloaded and saved in chunks of this length
+_DOWNLOAD_CHUNK_LENGTH = 1000
+
+WARMED = "warmed"
+ALREADY_CACHED = "already_cached"
+OVER_BUDGET = "over_budget"
+
+
+@dataclass
+class CacheWarmerStats:
+    versions_seen: int = 0
+    versions_warmed: int = 0
+    versions_already_cached: int = 0
+    versions_over_budget: int = 0
+    versions_failed: int = 0
+    objects_downloaded: int = 0
+    bytes_downloaded: int = 0
+
+    @property
+    def average_object_bytes(self) -> Optional[float]:
+        if not self.objects_downloaded:
+            return None
+        return self.bytes_downloaded / self.objects_downloaded
+
+
+class CacheWarmer:
+    """
+    Subscribes to the versions of a project, and copies the objects of every new
+    version into the local cache in the background.
+
+    At most `max_concurrent` versions are copied at once, each into a transport of
+    its own. A `local_transport` given by the caller is shared, so the versions are
+    copied into it one at a time. Only the objects missing from the local cache
+    (checked in bulk with `has_objects`) are downloaded. With a size bounded cache,
+    a version is skipped when it's expected to take more than `budget_fraction` of
+    the budget, as prefetching it would mostly evict what is already cached.
+
+    ```py
+    warmer = CacheWarmer(client, project_id, model_ids=[model_id])
+    await warmer.run()  # until cancelled
+    ```
+
+    Arguments:
+        client {SpeckleClient} -- subscribes to the versions, and authenticates the
+                                  default remote transport
+        project_id {str} -- the project to warm the cache with
+        model_ids {list} -- only warm the versions of these models, all by default
+        remote_transport {ServerTransport} -- where to download the objects from
+        local_transport {Transport} -- the cache to fill, by default the
+                                       `SQLiteTransport` receive uses
+        max_concurrent {int} -- the number of versions copied at once
+        cache_budget_bytes {int} -- the size of the cache, by default the
+                                    `max_cache_size` of a `SQLiteTransport` or the
+                                    `max_memory_bytes` of a `MemoryTransport`
+        budget_fraction {float} -- the part of the budget a single version may take
+    """
+
+    def __init__(
+        self,
+        client: Optional[SpeckleClient],
+        project_id: str,
+        model_ids: Optional[Iterable[str]] = None,
+        remote_transport: Optional[ServerTransport] = None,
+        local_transport: Optional[AbstractTransport] = None,
+        max_concurrent: int = 2,
+        cache_budget_bytes: Optional[int] = None,
+        budget_fraction: float = 0.5,
+    ) -> None:
+        if client is None and remote_transport is None:
+            raise SpeckleException(
+                "The cache warmer needs a client or a remote transport to download from"
+            )
+        self.client = client
+        self.project_id = project_id
+        self.model_ids = set(model_ids) if model_ids is not None else None
+        self.remote_transport = remote_transport or ServerTransport(
+            project_id, client=client
+        )
+        self.local_transport = local_transport
+        self.cache_budget_bytes = cache_budget_bytes
+        self.budget_fraction = budget_fraction
+        self.stats = CacheWarmerStats()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        # the writes of concurrent copies into a shared transport would interleave
+        self._local_lock = threading.Lock()
+        self._in_flight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def run(self) -> None:
+        """Warms the cache with every new version, until cancelled."""
+        if self.client is None:
+            raise SpeckleException("The cache warmer needs a client to subscribe with")
+        try:
+            await self.client.subscription.project_versions_updated(
+                self.on_versions_updated, self.project_id
+            )
+        finally:
+            await self.close()
+
+    def on_versions_updated(self, message: ProjectVersionsUpdatedMessage) -> None:
+        """Schedules the warming of a new version. Runs on the event loop."""
+        if message.type == ProjectVersionsUpdatedMessageType.DELETED:
+            return
+        if self.model_ids is not None and message.model_id not in self.model_ids:
+            return
+        if message.version is None or not message.version.referenced_object:
+            return
+        task = asyncio.create_task(self.warm(message.version.referenced_object))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def warm(self, object_id: str) -> Optional[str]:
+        """
+        Copies the object and its children to the local cache. Returns how it went,
+        or None if it failed or the object is being warmed already.
+        """
+        if object_id in self._in_flight:
+            return None
+        self._in_flight.add(object_id)
+        self.stats.versions_seen += 1
+        try:
+            async with self._semaphore:
+                outcome, objects, size = await asyncio.to_thread(
+                    self._prefetch, object_id
+                )
+        except Exception as ex:
+            self.stats.versions_failed += 1
+            LOG.warning("Could not warm the cache with %s: %s", object_id, ex)
+            return None
+        finally:
+            self._in_flight.discard(object_id)
+
+        self.stats.objects_downloaded += objects
+        self.stats.bytes_downloaded += size
+        if outcome == WARMED:
+            self.stats.versions_warmed += 1
+        elif outcome == ALREADY_CACHED:
+            self.stats.versions_already_cached += 1
+        else:
+            self.stats.versions_over_budget += 1
+        return outcome
+
+    async def wait_idle(self) -> None:
+        """Waits for the versions scheduled so far to be warmed."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _prefetch(self, object_id: str) -> Tuple[str, int, int]:
+        """Returns the outcome, and the objects and bytes downloaded"""
+        if self.local_transport is not None:
+            with self._local_lock:
+                return self.__prefetch_into(object_id, self.local_transport)
+        # a transport per copy, as their writes aren't meant to be interleaved
+        local = SQLiteTransport()
+        try:
+            return self.__prefetch_into(object_id, local)
+        finally:
+            local.close()
+
+    def __prefetch_into(
+        self, object_id: str, local: AbstractTransport
+    ) -> Tuple[str, int, int]:
+        codec = get_json_codec()
+
+        downloaded_objects = downloaded_bytes = 0
+        root = local.get_object(object_id)
+        if root is None:
+            root = self.remote_transport.get_object(object_id)
+            if root is None:
+                raise SpeckleException(
+                    f"Could not find {object_id} in project {self.project_id}"
+                )
+            downloaded_objects, downloaded_bytes = 1, len(root)
+        closure = codec.loads(root).get("__closure") or {}
+        found = local.has_objects(list(closure))
+        missing = [id for id, has in found.items() if not has]
+        if not missing and not downloaded_objects:
+            return ALREADY_CACHED, 0, 0
+
+        budget = self.cache_budget_bytes or _cache_budget(local)
+        if budget is not None:
+            # the root's size is the best guess until objects were downloaded
+            object_bytes = self.stats.average_object_bytes or len(root)
+            expected_bytes = (len(missing) + 1) * object_bytes
+            if expected_bytes > budget * self.budget_fraction:
+                LOG.info(
+                    "Not warming the cache with %s, it's about %.1fMB for a %.1fMB"
+                    " cache",
+                    object_id,
+                    expected_bytes / 1e6,
+                    budget / 1e6,
+                )
+                return OVER_BUDGET, downloaded_objects, downloaded_bytes
+
+        # the root is only saved once all its children are, like
+        # `copy_object_and_children` does, so an interrupted copy isn't cached
+        local.begin_write()
+        for i in range(0, len(missing), _DOWNLOAD_CHUNK_LENGTH):
+            chunk = missing[i : i + _DOWNLOAD_CHUNK_LENGTH]
+            objects = self.remote_transport.get_objects(chunk)
+            for id in chunk:
+                obj = objects.get(id)
+                if obj is None:
+                    local.end_write()
+                    raise SpeckleException(
+                        f"Could not find {id} in project {self.project_id}"
+                    )
+                local.save_object(id, obj)
+                downloaded_bytes += len(obj)
+            downloaded_objects += len(chunk)
+        local.save_object(object_id, root)
+        local.end_write()
+        return WARMED, downloaded_objects, downloaded_bytes
+
+
+def _cache_budget(transport: AbstractTransport) -> Optional[int]:
+    if isinstance(transport, SQLiteTransport):
+        return transport.max_cache_size
+    return getattr(transport, "max_memory_bytes", None)
@@ -22,7 +22,7 @@ from specklepy.core.api.resources import (
     VersionResource,
     WorkspaceResource,
 )
-from specklepy.logging import metrics
+from specklepy.logging import metrics, tracing
 from specklepy.logging.exceptions import SpeckleException, SpeckleWarning
 
 
@@ -192,7 +192,8 @@ class SpeckleClient:
         self._init_resources()
 
     def execute_query(self, query: str) -> Dict:
-        return self.httpclient.execute(query)
+        with tracing.span("speckle.graphql"):
+            return self.httpclient.execute(query)
 
     def _init_resources(self) -> None:
         self.server = ServerResource(
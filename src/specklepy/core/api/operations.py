@@ -1,10 +1,26 @@
-from typing import List, Optional
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Union
 
 # from specklepy.logging import metrics
+from specklepy.logging import profiling
 from specklepy.logging.exceptions import SpeckleException
+from specklepy.logging.report import OperationReport, recording
 from specklepy.objects.base import Base
+from specklepy.progress.receive_progress import (
+    ReceiveProgress,
+    ReceiveProgressTracker,
+    tracking,
+)
 from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.serialization.json_codec import get_json_codec
 from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.caching import CachingTransport
+from specklepy.transports.server.async_server import (
+    AsyncServerTransport,
+    BlockingWriter,
+)
 from specklepy.transports.sqlite import SQLiteTransport
 
 
@@ -12,6 +28,8 @@ def send(
     base: Base,
     transports: Optional[List[AbstractTransport]] = None,
     use_default_cache: bool = True,
+    concurrent_writes: bool = False,
+    on_report: Optional[Callable[[OperationReport], None]] = None,
 ):
     """Sends an object via the provided transports. Defaults to the local cache.
 
@@ -20,6 +38,9 @@ def send(
         transports {list} -- where you want to send them
         use_default_cache {bool} -- toggle for the default cache.
         If set to false, it will only send to the provided transports
+        concurrent_writes {bool} -- write to every transport from its own thread,
+        so a slow transport doesn't hold up serialization
+        on_report {callable} -- called with the timings of the send once it is done
 
     Returns:
         str -- the object id of the sent object
@@ -42,9 +63,12 @@ def send(
     if use_default_cache:
         transports.insert(0, SQLiteTransport())
 
-    serializer = BaseObjectSerializer(write_transports=transports)
+    serializer = BaseObjectSerializer(
+        write_transports=transports, concurrent_writes=concurrent_writes
+    )
 
-    obj_hash, _ = serializer.write_json(base=base)
+    with profiling.profile("send"), _reporting("send", on_report):
+        obj_hash, _ = serializer.write_json(base=base)
 
     return obj_hash
 
@@ -53,6 +77,9 @@ def receive(
     obj_id: str,
     remote_transport: Optional[AbstractTransport] = None,
     local_transport: Optional[AbstractTransport] = None,
+    on_report: Optional[Callable[[OperationReport], None]] = None,
+    on_progress: Optional[Callable[[ReceiveProgress], None]] = None,
+    progress_interval_seconds: float = 0.5,
 ) -> Base:
     """Receives an object from a transport.
 
@@ -61,20 +88,202 @@ def receive(
         remote_transport {Transport} -- the transport to receive from
         local_transport {Transport} -- the local cache to check for existing objects
                                        (defaults to `SQLiteTransport`)
+        on_report {callable} -- called with the timings of the receive once it is
+                                done
+        on_progress {callable} -- called with the objects and bytes downloaded, then
+                                  the objects deserialized, at most every
+                                  `progress_interval_seconds` and at the end of
+                                  each stage
 
     Returns:
         Base -- the base object
     """
+    with (
+        profiling.profile("receive"),
+        _reporting("receive", on_report) as report,
+        _tracking_progress(on_progress, progress_interval_seconds),
+    ):
+        return _receive(obj_id, remote_transport, local_transport, report)
+
+
+def _receive(
+    obj_id: str,
+    remote_transport: Optional[AbstractTransport],
+    local_transport: Optional[AbstractTransport],
+    report: Optional[OperationReport],
+) -> Base:
     if not local_transport:
         local_transport = SQLiteTransport()
 
     serializer = BaseObjectSerializer(read_transport=local_transport)
 
     # try local transport first. if the parent is there, we assume all the children
-    # are there and continue with deserialization using the local transport
-    obj_string = local_transport.get_object(obj_id)
-    if obj_string:
-        return serializer.read_json(obj_string=obj_string)
+    # are there and continue with deserialization using the local transport.
+    # caches with a size budget may have evicted some of them though, so when there
+    # is a remote to fall back to, their children are checked in bulk
+    with _phase(report, "local_lookup"):
+        obj_string = local_transport.get_object(obj_id)
+        found_locally = obj_string and (
+            not remote_transport
+            or not _may_have_evicted(local_transport)
+            or _has_all_children(obj_string, local_transport)
+        )
+    if found_locally:
+        return _read_json(serializer, obj_id, obj_string, report)
+
+    if not remote_transport:
+        raise SpeckleException(
+            message=(
+                "Could not find the specified object using the local transport, and you"
+                " didn't provide a fallback remote from which to pull it."
+            )
+        )
+
+    with _phase(report, "fetch"):
+        obj_string = remote_transport.copy_object_and_children(
+            id=obj_id, target_transport=local_transport
+        )
+
+    return _read_json(serializer, obj_id, obj_string, report)
+
+
+def _read_json(
+    serializer: BaseObjectSerializer,
+    obj_id: str,
+    obj_string: str,
+    report: Optional[OperationReport],
+) -> Base:
+    with _phase(report, "deserialization"):
+        base = serializer.read_json(obj_string=obj_string)
+    if report is not None:
+        report.object_id = obj_id
+        report.object_count = len(serializer.deserialized)
+    return base
+
+
+@contextmanager
+def _reporting(
+    operation: str, on_report: Optional[Callable[[OperationReport], None]]
+) -> Iterator[Optional[OperationReport]]:
+    """Records an `OperationReport` of the operation, if anyone wants it"""
+    if on_report is None:
+        yield None
+        return
+    report = OperationReport(operation)
+    with recording(report):
+        yield report
+    on_report(report)
+
+
+@contextmanager
+def _tracking_progress(
+    on_progress: Optional[Callable[[ReceiveProgress], None]],
+    update_interval_seconds: float,
+) -> Iterator[None]:
+    if on_progress is None:
+        yield
+        return
+    with tracking(ReceiveProgressTracker(on_progress, update_interval_seconds)):
+        yield
+
+
+@contextmanager
+def _phase(report: Optional[OperationReport], phase: str) -> Iterator[None]:
+    if report is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        report.add_phase(phase, time.perf_counter() - start)
+
+
+def _may_have_evicted(transport: AbstractTransport) -> bool:
+    """Whether the transport is a size bounded cache, which may miss children"""
+    if isinstance(transport, CachingTransport):
+        return any(_may_have_evicted(tier) for tier in transport.tiers)
+    return getattr(transport, "max_cache_size", None) is not None
+
+
+def _has_all_children(obj_string: str, transport: AbstractTransport) -> bool:
+    closure = get_json_codec().loads(obj_string).get("__closure")
+    if not closure:
+        return True
+    return all(transport.has_objects(list(closure)).values())
+
+
+async def send_async(
+    base: Base,
+    transports: Optional[List[Union[AbstractTransport, AsyncServerTransport]]] = None,
+    use_default_cache: bool = True,
+) -> str:
+    """Sends an object via the provided transports, without blocking the event loop.
+
+    Serialization runs in a worker thread, while `AsyncServerTransport`s upload on
+    the event loop. Blocking transports are written to from the worker thread.
+
+    Arguments:
+        obj {Base} -- the object you want to send
+        transports {list} -- where you want to send them
+        use_default_cache {bool} -- toggle for the default cache.
+        If set to false, it will only send to the provided transports
+
+    Returns:
+        str -- the object id of the sent object
+    """
+    if isinstance(transports, AbstractTransport | AsyncServerTransport):
+        transports = [transports]
+    if not transports and not use_default_cache:
+        raise SpeckleException(
+            message=(
+                "You need to provide at least one transport: cannot send with an empty"
+                " transport list and no default cache"
+            )
+        )
+
+    loop = asyncio.get_running_loop()
+    write_transports: List[AbstractTransport] = [
+        BlockingWriter(t, loop) if isinstance(t, AsyncServerTransport) else t
+        for t in transports or []
+    ]
+    if use_default_cache:
+        write_transports.insert(0, await asyncio.to_thread(SQLiteTransport))
+
+    serializer = BaseObjectSerializer(write_transports=write_transports)
+    obj_hash, _ = await asyncio.to_thread(serializer.write_json, base)
+
+    return obj_hash
+
+
+async def receive_async(
+    obj_id: str,
+    remote_transport: Optional[AsyncServerTransport] = None,
+    local_transport: Optional[AbstractTransport] = None,
+) -> Base:
+    """Receives an object from a transport, without blocking the event loop.
+
+    Arguments:
+        obj_id {str} -- the id of the object to receive
+        remote_transport {AsyncServerTransport} -- the transport to receive from
+        local_transport {Transport} -- the local cache to check for existing objects
+                                       (defaults to `SQLiteTransport`)
+
+    Returns:
+        Base -- the base object
+    """
+    if not local_transport:
+        local_transport = await asyncio.to_thread(SQLiteTransport)
+
+    serializer = BaseObjectSerializer(read_transport=local_transport)
+
+    obj_string = await asyncio.to_thread(local_transport.get_object, obj_id)
+    if obj_string and (
+        not remote_transport
+        or not _may_have_evicted(local_transport)
+        or await asyncio.to_thread(_has_all_children, obj_string, local_transport)
+    ):
+        return await asyncio.to_thread(serializer.read_json, obj_string)
 
     if not remote_transport:
         raise SpeckleException(
@@ -84,11 +293,11 @@ def receive(
             )
         )
 
-    obj_string = remote_transport.copy_object_and_children(
+    obj_string = await remote_transport.copy_object_and_children(
         id=obj_id, target_transport=local_transport
     )
 
-    return serializer.read_json(obj_string=obj_string)
+    return await asyncio.to_thread(serializer.read_json, obj_string)
 
 
 def serialize(
@@ -141,4 +350,11 @@ def deserialize(
     return serializer.read_json(obj_string=obj_string)
 
 
-__all__ = ["receive", "send", "serialize", "deserialize"]
+__all__ = [
+    "receive",
+    "send",
+    "receive_async",
+    "send_async",
+    "serialize",
+    "deserialize",
+]
@@ -7,6 +7,7 @@ from graphql import DocumentNode
 from pydantic import BaseModel
 
 from specklepy.core.api.credentials import Account
+from specklepy.logging import tracing
 from specklepy.logging.exceptions import (
     GraphQLException,
     SpeckleException,
@@ -53,7 +54,7 @@ class ResourceBase:
         variables: Optional[Dict[str, Any]] = None,
     ) -> T:
         try:
-            with self.__lock:
+            with self.__lock, tracing.span("speckle.graphql", resource=self.name):
                 response = self.client.execute(query, variable_values=variables)
         except TransportQueryError as ex:
             raise GraphQLException(
@@ -105,7 +106,7 @@ class ResourceBase:
         # and counter-intuitive error handling
         # We are going to phase it out in favour of `make_request_and_parse_response`
         try:
-            with self.__lock:
+            with self.__lock, tracing.span("speckle.graphql", resource=self.name):
                 response = self.client.execute(query, variable_values=params)
         except Exception as ex:
             if isinstance(ex, TransportQueryError):
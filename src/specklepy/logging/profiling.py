@@ -0,0 +1,282 @@
+"""
+Opt-in sampling profiles of SDK operations, to diagnose slow imports.
+
+Profiling is enabled by setting `SPECKLE_PROFILE_DIR`, or by wrapping code in
+`profile(name, directory=...)`. Send, receive, the IFC conversion and the bundle
+export are wrapped in `profile` too: when profiling is enabled each of them writes
+a profile, and when it runs within an outer profile it marks a phase of it.
+
+A profile is sampled by a background thread reading the stacks of every thread
+(`sys._current_frames`), so the profiled code itself runs untouched. It is written
+as collapsed stacks (for flamegraph.pl and friends) or speedscope json
+(`SPECKLE_PROFILE_FORMAT`). With `SPECKLE_PROFILE_MEMORY=1`, tracemalloc
+snapshots are taken at the start and end of every phase too. Tracing allocations
+slows allocation heavy code like (de)serialization down a lot, so it is off by
+default.
+
+Profiles are bound to the context that started them (like the reports of
+`specklepy.logging.report`): operations running concurrently in other threads
+record profiles of their own, and only share the sampler's view of all threads.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+FORMATS = ("collapsed", "speedscope")
+DEFAULT_INTERVAL_SECONDS = 0.005
+# the frames captured on the memory snapshots' allocations
+_TRACEMALLOC_FRAMES = 10
+_RECENT_PROFILES = 20
+
+_lock = threading.Lock()
+_active_profile: ContextVar[Optional["ProfileRun"]] = ContextVar(
+    "speckle_profile", default=None
+)
+# the runs tracing memory, tracemalloc is stopped once the last one ends
+_tracing_runs = 0
+_recent_paths: Deque[str] = deque(maxlen=_RECENT_PROFILES)
+
+Frame = Tuple[str, str, int]  # function, file, first line
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads, from a daemon thread."""
+
+    def __init__(self, interval_seconds: float = DEFAULT_INTERVAL_SECONDS) -> None:
+        self.interval_seconds = interval_seconds
+        self.samples: Counter[Tuple[str, Tuple[Frame, ...]]] = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_names: Dict[int, str] = {}
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.__sample, name="SpeckleProfiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def collapsed(self) -> List[str]:
+        """The samples as `thread;outer;...;inner count` lines."""
+        return [
+            ";".join([thread, *(_frame_name(f) for f in stack)]) + f" {count}"
+            for (thread, stack), count in self.samples.most_common()
+        ]
+
+    def speedscope(self, name: str) -> dict:
+        """The samples as a speedscope profile, with one sampled profile per thread."""
+        frames: List[Frame] = []
+        frame_index: Dict[Frame, int] = {}
+        profiles: Dict[str, dict] = {}
+        for (thread, stack), count in self.samples.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append(frame)
+                indices.append(frame_index[frame])
+            profile = profiles.setdefault(
+                thread,
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": 0,
+                    "samples": [],
+                    "weights": [],
+                },
+            )
+            profile["samples"].append(indices)
+            profile["weights"].append(count * self.interval_seconds)
+            profile["endValue"] += count * self.interval_seconds
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "specklepy",
+            "shared": {
+                "frames": [
+                    {"name": func, "file": file, "line": line}
+                    for func, file, line in frames
+                ]
+            },
+            "profiles": list(profiles.values()),
+        }
+
+    def __sample(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            frames = sys._current_frames()
+            if len(self._thread_names) != threading.active_count():
+                self._thread_names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                thread = self._thread_names.get(thread_id, str(thread_id))
+                self.samples[(thread, tuple(reversed(stack)))] += 1
+            self.sample_count += 1
+
+
+def _frame_name(frame: Frame) -> str:
+    func, file, line = frame
+    return f"{func} ({os.path.basename(file)}:{line})"
+
+
+@dataclass
+class ProfileRun:
+    """A profile being recorded, and the files written for it."""
+
+    name: str
+    directory: str
+    format: str
+    profiler: SamplingProfiler
+    trace_memory: bool
+    started: float = field(default_factory=time.time)
+    paths: List[str] = field(default_factory=list)
+
+    @property
+    def prefix(self) -> str:
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        return os.path.join(self.directory, f"{self.name}-{stamp}-{os.getpid()}")
+
+    def snapshot(self, label: str) -> None:
+        """Writes a tracemalloc snapshot, eg. at a phase boundary."""
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot()
+        path = f"{self.prefix}.{len(self.paths):03d}-{label}.tracemalloc"
+        snapshot.dump(path)
+        self.paths.append(path)
+
+    def write(self) -> None:
+        if self.format == "speedscope":
+            path = f"{self.prefix}.speedscope.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.profiler.speedscope(self.name), f)
+        else:
+            path = f"{self.prefix}.collapsed"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(self.profiler.collapsed()) + "\n")
+        self.paths.append(path)
+
+
+def active_profile() -> Optional[ProfileRun]:
+    """The profile being recorded in this context, if any."""
+    return _active_profile.get()
+
+
+def recent_profiles() -> List[str]:
+    """The files written by the latest profiles, eg. to attach to error reports."""
+    with _lock:
+        return list(_recent_paths)
+
+
+@contextmanager
+def profile(
+    name: str,
+    directory: Optional[str] = None,
+    format: Optional[str] = None,
+    interval_seconds: Optional[float] = None,
+    trace_memory: Optional[bool] = None,
+) -> Iterator[Optional[ProfileRun]]:
+    """
+    Profiles the code within the context into `directory`, or the
+    `SPECKLE_PROFILE_DIR` env var, and does nothing if neither is set.
+
+    Within an already running profile, it only snapshots the memory at the start
+    and end of the phase.
+    """
+    run = _active_profile.get()
+    if run is not None:
+        run.snapshot(f"{name}-start")
+        try:
+            yield run
+        finally:
+            run.snapshot(f"{name}-end")
+        return
+
+    directory = directory or os.environ.get("SPECKLE_PROFILE_DIR")
+    if not directory:
+        yield None
+        return
+
+    format = format or os.environ.get("SPECKLE_PROFILE_FORMAT", "speedscope")
+    if format not in FORMATS:
+        raise ValueError(f"Unknown profile format {format}, expected one of {FORMATS}")
+    if interval_seconds is None:
+        interval_seconds = (
+            float(os.environ.get("SPECKLE_PROFILE_INTERVAL_MS", 0)) / 1000
+            or DEFAULT_INTERVAL_SECONDS
+        )
+    if trace_memory is None:
+        trace_memory = os.environ.get("SPECKLE_PROFILE_MEMORY", "0") != "0"
+
+    os.makedirs(directory, exist_ok=True)
+    run = ProfileRun(
+        name, directory, format, SamplingProfiler(interval_seconds), trace_memory
+    )
+    token = _active_profile.set(run)
+    started_tracing = trace_memory and _start_tracing()
+    run.snapshot(f"{name}-start")
+    run.profiler.start()
+    try:
+        yield run
+    finally:
+        run.profiler.stop()
+        try:
+            run.snapshot(f"{name}-end")
+            run.write()
+            LOG.info("Wrote the %s profile to %s", name, run.paths[-1])
+        except OSError as ex:
+            LOG.warning("Could not write the %s profile: %s", name, ex)
+        finally:
+            if started_tracing:
+                _stop_tracing()
+            _active_profile.reset(token)
+            with _lock:
+                _recent_paths.extend(run.paths)
+
+
+def _start_tracing() -> bool:
+    """Starts tracemalloc for a run, unless it was started outside of profiles"""
+    global _tracing_runs
+    with _lock:
+        if _tracing_runs == 0:
+            if tracemalloc.is_tracing():
+                return False
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+        _tracing_runs += 1
+        return True
+
+
+def _stop_tracing() -> None:
+    global _tracing_runs
+    with _lock:
+        _tracing_runs -= 1
+        if _tracing_runs == 0:
+            tracemalloc.stop()
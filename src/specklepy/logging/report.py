@@ -0,0 +1,202 @@
+"""
+Structured timing reports of `operations.send` and `operations.receive`.
+
+While a report is being recorded (see `recording`), the serializer and the
+transports add their timings and counters to it. When no report is recorded the
+hooks cost a context variable lookup per operation and a `None` check per object.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+# upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    float("inf"),
+)
+
+_active_report: ContextVar[Optional["OperationReport"]] = ContextVar(
+    "speckle_operation_report", default=None
+)
+
+
+@dataclass
+class LatencyHistogram:
+    """Counts of latencies, in the buckets of `LATENCY_BUCKETS`."""
+
+    counts: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def mean_seconds(self) -> float:
+        count = self.count
+        return self.total_seconds / count if count else 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def percentile(self, p: float) -> float:
+        """The upper bound of the bucket holding the `p`th percentile (0-100)."""
+        count = self.count
+        if not count:
+            return 0.0
+        rank = p / 100 * count
+        seen = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, self.counts, strict=True):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+
+@dataclass
+class TransportReport:
+    """What a single transport did during an operation."""
+
+    name: str
+    #: time spent handing objects to the transport, per object
+    enqueue: LatencyHistogram = field(default_factory=LatencyHistogram)
+    #: time spent in `end_write`, waiting for the transport to finish writing
+    flush_seconds: float = 0.0
+    #: time spent per batch written (commits, uploads) or read (downloads)
+    batches: LatencyHistogram = field(default_factory=LatencyHistogram)
+    bytes_raw: int = 0
+    bytes_compressed: int = 0
+    objects_diffed: int = 0
+    objects_found: int = 0
+
+    @property
+    def batch_count(self) -> int:
+        return self.batches.count
+
+    @property
+    def diff_hit_ratio(self) -> float:
+        """The fraction of diffed objects the target already had."""
+        return self.objects_found / self.objects_diffed if self.objects_diffed else 0.0
+
+
+@dataclass
+class OperationReport:
+    """
+    Timings and throughput of a send or receive.
+
+    `phases` holds the seconds spent per stage: for a send `traversal`, `hashing`,
+    `encoding`, `enqueue` and `flush`, for a receive `local_lookup`, `fetch` and
+    `deserialization`. Timings of work happening in other threads (like uploads)
+    are in the `transports` reports, and overlap with the phases.
+    """
+
+    operation: str
+    object_id: Optional[str] = None
+    total_seconds: float = 0.0
+    phases: Dict[str, float] = field(default_factory=dict)
+    object_count: int = 0
+    #: the size of the serialized objects
+    bytes_raw: int = 0
+    transports: Dict[str, TransportReport] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.object_count / self.total_seconds if self.total_seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_raw / self.total_seconds if self.total_seconds else 0.0
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def transport(self, name: str) -> TransportReport:
+        with self._lock:
+            report = self.transports.get(name)
+            if report is None:
+                report = self.transports[name] = TransportReport(name)
+            return report
+
+    def record_batch(
+        self,
+        transport: str,
+        seconds: float,
+        bytes_raw: int = 0,
+        bytes_compressed: int = 0,
+    ) -> None:
+        report = self.transport(transport)
+        with self._lock:
+            report.batches.record(seconds)
+            report.bytes_raw += bytes_raw
+            report.bytes_compressed += bytes_compressed
+
+    def record_diff(self, transport: str, diffed: int, found: int) -> None:
+        report = self.transport(transport)
+        with self._lock:
+            report.objects_diffed += diffed
+            report.objects_found += found
+
+    def summary(self) -> str:
+        """A human readable summary, eg. for logs."""
+        lines = [
+            f"{self.operation} {self.object_id}: {self.object_count} objects,"
+            f" {self.bytes_raw / 1e6:.1f}MB in {self.total_seconds:.3f}s"
+            f" ({self.objects_per_second:.0f} objects/s)"
+        ]
+        lines.extend(
+            f"  {phase}: {seconds:.3f}s" for phase, seconds in self.phases.items()
+        )
+        for t in self.transports.values():
+            lines.append(
+                f"  {t.name}: enqueue p99 {t.enqueue.percentile(99) * 1e3:.2f}ms,"
+                f" flush {t.flush_seconds:.3f}s, {t.batch_count} batches"
+                f" (p50 {t.batches.percentile(50) * 1e3:.1f}ms, p99"
+                f" {t.batches.percentile(99) * 1e3:.1f}ms), {t.bytes_raw} bytes"
+                f" ({t.bytes_compressed} compressed), diff hit ratio"
+                f" {t.diff_hit_ratio:.2f}"
+            )
+        return "\n".join(lines)
+
+
+def current_report() -> Optional[OperationReport]:
+    """The report being recorded in this context, if any."""
+    return _active_report.get()
+
+
+@contextmanager
+def recording(report: OperationReport) -> Iterator[OperationReport]:
+    """Records the operations run within the context into `report`."""
+    token = _active_report.set(report)
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report.total_seconds += time.perf_counter() - start
+        _active_report.reset(token)
@@ -0,0 +1,150 @@
+"""
+Tracing spans and metrics of the SDK's hot paths, for services running specklepy.
+
+Instrumentation goes through the `Tracer` set with `set_tracer`, which is a no-op
+by default. `enable_opentelemetry` (or the `SPECKLE_TRACING=opentelemetry` env var)
+switches to an adapter emitting OpenTelemetry spans and histograms, to the global
+providers unless others are given.
+
+Spans are nested through context variables, so work handed to worker threads is
+wrapped with `propagate` to keep it within the span that started it.
+"""
+
+import contextvars
+import functools
+import importlib.metadata
+import logging
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from specklepy.logging.exceptions import SpeckleException
+
+try:
+    from opentelemetry import metrics as otel_metrics
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_metrics = None
+    otel_trace = None
+
+LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_INSTRUMENTATION_NAME = "specklepy"
+
+
+class Span:
+    """A span that records nothing. Tracers return spans with the same methods."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+
+_NO_OP_SPAN = Span()
+
+
+class Tracer:
+    """Does nothing. Subclasses send the spans and metrics somewhere."""
+
+    @contextmanager
+    def span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        yield _NO_OP_SPAN
+
+    def record(self, name: str, value: float, attributes: Dict[str, Any]) -> None:
+        pass
+
+
+class OpenTelemetryTracer(Tracer):
+    """Emits OpenTelemetry spans, and records metrics as histograms."""
+
+    def __init__(self, tracer_provider=None, meter_provider=None) -> None:
+        if otel_trace is None:
+            raise SpeckleException(
+                "Tracing with OpenTelemetry needs the opentelemetry-api package,"
+                " install specklepy[opentelemetry]"
+            )
+        try:
+            version = importlib.metadata.version("specklepy")
+        except importlib.metadata.PackageNotFoundError:
+            version = None
+        self._tracer = otel_trace.get_tracer(
+            _INSTRUMENTATION_NAME, version, tracer_provider=tracer_provider
+        )
+        self._meter = otel_metrics.get_meter(
+            _INSTRUMENTATION_NAME, version, meter_provider=meter_provider
+        )
+        self._histograms: Dict[str, Any] = {}
+
+    @contextmanager
+    def span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        # exceptions are recorded on the span, and set its status, by otel itself
+        with self._tracer.start_as_current_span(name, attributes=attributes) as span:
+            yield span
+
+    def record(self, name: str, value: float, attributes: Dict[str, Any]) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = self._meter.create_histogram(name)
+        histogram.record(value, attributes)
+
+
+_tracer: Tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Sets the tracer the SDK reports to, `None` disables tracing."""
+    global _tracer
+    _tracer = tracer or Tracer()
+
+
+def enable_opentelemetry(tracer_provider=None, meter_provider=None) -> None:
+    set_tracer(OpenTelemetryTracer(tracer_provider, meter_provider))
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Traces the code within the context, as a child of the current span."""
+    with _tracer.span(name, attributes) as s:
+        yield s
+
+
+def record(name: str, value: float, **attributes: Any) -> None:
+    """Records a measurement, eg. the size of an upload."""
+    _tracer.record(name, value, attributes)
+
+
+def traced(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorates a function, to trace every call of it as a span."""
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs) -> T:
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def propagate(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Binds `fn` to a copy of the current context, to run it in another thread
+    within the current span. Every thread needs its own `propagate`d callable.
+    """
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+if os.environ.get("SPECKLE_TRACING", "").lower() == "opentelemetry":
+    try:
+        enable_opentelemetry()
+    except SpeckleException as ex:
+        LOG.warning("Could not enable tracing: %s", ex)
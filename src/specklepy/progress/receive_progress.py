@@ -0,0 +1,142 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import monotonic
+from typing import Callable, Iterator, Optional
+
+# the clock is only read every this many objects, to keep per object updates cheap
+_CLOCK_CHECK_INTERVAL = 256
+
+_active_tracker: ContextVar[Optional["ReceiveProgressTracker"]] = ContextVar(
+    "speckle_receive_progress", default=None
+)
+
+
+@dataclass(frozen=True)
+class ReceiveProgress:
+    """A snapshot of the progress of a stage of a receive."""
+
+    #: "download" or "deserialization"
+    stage: str
+    objects: int
+    #: None when the total isn't known up front
+    total_objects: Optional[int]
+    bytes: int
+    elapsed_seconds: float
+    done: bool = False
+
+    @property
+    def fraction(self) -> Optional[float]:
+        if not self.total_objects:
+            return None
+        return min(1.0, self.objects / self.total_objects)
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.objects / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """The time left at the current throughput, if the total is known."""
+        rate = self.objects_per_second
+        if self.total_objects is None or not rate:
+            return None
+        return max(0, self.total_objects - self.objects) / rate
+
+
+class ReceiveProgressTracker:
+    """
+    Counts the objects (and bytes) a receive went through, and reports them to a
+    callback at most every `update_interval_seconds`, like
+    `IngestionProgressManager.should_report_progress` throttles its updates.
+    The end of every stage is always reported.
+
+    Transports and the deserializer find the tracker of the receive they run in
+    with `current_receive_progress`.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[ReceiveProgress], None],
+        update_interval_seconds: float = 0.5,
+    ) -> None:
+        self.callback = callback
+        self.update_interval = update_interval_seconds
+        self.stage: Optional[str] = None
+        self.total_objects: Optional[int] = None
+        self.objects = 0
+        self.bytes = 0
+        self._started_at = 0.0
+        self._last_reported_at = 0.0
+        self._unchecked = 0
+        self._lock = threading.Lock()
+
+    def start(self, stage: str, total_objects: Optional[int] = None) -> None:
+        with self._lock:
+            self.stage = stage
+            self.total_objects = total_objects
+            self.objects = 0
+            self.bytes = 0
+            self._started_at = self._last_reported_at = monotonic()
+            self._unchecked = 0
+
+    def advance(self, objects: int = 1, size: int = 0) -> None:
+        with self._lock:
+            self.objects += objects
+            self.bytes += size
+            self._unchecked += objects
+            if self._unchecked < _CLOCK_CHECK_INTERVAL and objects == 1:
+                return
+            self._unchecked = 0
+            now = monotonic()
+            if now - self._last_reported_at < self.update_interval:
+                return
+            self._last_reported_at = now
+            progress = self.__snapshot(now)
+        self.callback(progress)
+
+    def finish(self) -> None:
+        """Reports the end of the current stage."""
+        with self._lock:
+            if self.stage is None:
+                return
+            progress = self.__snapshot(monotonic(), done=True)
+            self.stage = None
+        self.callback(progress)
+
+    @contextmanager
+    def stage_of(
+        self, stage: str, total_objects: Optional[int] = None
+    ) -> Iterator["ReceiveProgressTracker"]:
+        self.start(stage, total_objects)
+        yield self
+        self.finish()
+
+    def __snapshot(self, now: float, done: bool = False) -> ReceiveProgress:
+        return ReceiveProgress(
+            stage=self.stage,
+            objects=self.objects,
+            total_objects=self.total_objects,
+            bytes=self.bytes,
+            elapsed_seconds=now - self._started_at,
+            done=done,
+        )
+
+
+def current_receive_progress() -> Optional[ReceiveProgressTracker]:
+    """The progress tracker of the receive running in this context, if any."""
+    return _active_tracker.get()
+
+
+@contextmanager
+def tracking(tracker: ReceiveProgressTracker) -> Iterator[ReceiveProgressTracker]:
+    token = _active_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _active_tracker.reset(token)
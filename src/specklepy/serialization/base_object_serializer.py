@@ -1,38 +1,39 @@
 import hashlib
 import re
+import time
 import warnings
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 from warnings import warn
 
-import ujson
-
 # import for serialization
+from specklepy.logging import tracing
 from specklepy.logging.exceptions import SpeckleException, SpeckleWarning
+from specklepy.logging.report import OperationReport, current_report
 from specklepy.objects.base import Base, DataChunk
+from specklepy.progress.receive_progress import (
+    ReceiveProgressTracker,
+    current_receive_progress,
+)
+from specklepy.serialization.json_codec import JsonCodec, get_json_codec
+from specklepy.serialization.object_cache import (
+    DeserializedObjectCache,
+    get_object_cache,
+)
 from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.fan_out import fan_out
 
 PRIMITIVES = (int, float, str, bool)
 
 
-def hash_obj(obj: Any) -> str:
-    return hashlib.sha256(ujson.dumps(obj).encode()).hexdigest()[:32]
-
+def hash_obj(obj: Any, codec: Optional[JsonCodec] = None) -> str:
+    codec = codec or get_json_codec()
+    return hashlib.sha256(codec.dumpb(obj)).hexdigest()[:32]
 
-def safe_json_loads(obj: str, obj_id=None) -> Any:
-    try:
-        return ujson.loads(obj)
-    except ValueError as err:
-        import json
 
-        warn(
-            f"Failed to deserialise object (id: {obj_id}). This is likely a ujson big"
-            f" int error - falling back to json. \nError: {err}",
-            SpeckleWarning,
-            stacklevel=2,
-        )
-        return json.loads(obj)
+def safe_json_loads(obj: str | bytes, obj_id=None) -> Any:
+    return get_json_codec().loads(obj)
 
 
 class BaseObjectSerializer:
@@ -50,14 +51,30 @@ class BaseObjectSerializer:
         self,
         write_transports: Optional[List[AbstractTransport]] = None,
         read_transport: Optional[AbstractTransport] = None,
+        json_codec: Optional[JsonCodec] = None,
+        concurrent_writes: bool = False,
+        object_cache: Optional[DeserializedObjectCache] = None,
     ) -> None:
-        self.write_transports = write_transports or []
+        # with concurrent writes, every transport is written to by its own thread,
+        # so serialization isn't held up by the slowest one
+        self.write_transports = (
+            fan_out(write_transports or [])
+            if concurrent_writes
+            else write_transports or []
+        )
         self.read_transport = read_transport
+        self.json_codec = json_codec or get_json_codec()
+        # reuses the objects deserialized by earlier reads, process wide by default
+        self.object_cache = object_cache or get_object_cache()
         self.detach_lineage = []
         self.lineage = []
         self.family_tree = {}
         self.closure_table = {}
         self.deserialized = {}
+        # only set while recording an `OperationReport`
+        self._report: Optional[OperationReport] = None
+        self._progress: Optional[ReceiveProgressTracker] = None
+        self._phase_seconds: Dict[str, float] = {}
 
     def write_json(self, base: Base):
         """Serializes a given base object into a json string
@@ -71,7 +88,7 @@ class BaseObjectSerializer:
 
         obj_id, obj = self.traverse_base(base)
 
-        return obj_id, ujson.dumps(obj)
+        return obj_id, self.json_codec.dumps(obj)
 
     def traverse_base(self, base: Base) -> Tuple[str, Dict[str, Any]]:
         """Decomposes the given base object and builds a serializable dictionary
@@ -83,17 +100,45 @@ class BaseObjectSerializer:
             (str, dict) -- a tuple containing the object id of the base object and
             the constructed serializable dictionary
         """
+        with tracing.span("speckle.serialize", speckle_type=base.speckle_type) as span:
+            obj_id, obj = self.__traverse_and_flush(base)
+            span.set_attribute("object_id", obj_id)
+        return obj_id, obj
+
+    def __traverse_and_flush(self, base: Base) -> Tuple[str, Dict[str, Any]]:
         self.__reset_writer()
+        self._report = report = current_report()
+        start = time.perf_counter()
 
         if self.write_transports:
             for wt in self.write_transports:
                 wt.begin_write()
 
-        obj_id, obj = self._traverse_base(base)
+        with tracing.span("speckle.serialize.traverse"):
+            obj_id, obj = self._traverse_base(base)
+        traversed = time.perf_counter()
 
         if self.write_transports:
             for wt in self.write_transports:
-                wt.end_write()
+                flush_start = time.perf_counter()
+                with tracing.span("speckle.serialize.flush", transport=wt.name):
+                    wt.end_write()
+                if report is not None:
+                    report.transport(wt.name).flush_seconds += (
+                        time.perf_counter() - flush_start
+                    )
+
+        if report is not None:
+            report.object_id = obj_id
+            phases = self._phase_seconds
+            report.add_phase(
+                "traversal",
+                traversed - start - sum(phases.values()),
+            )
+            for phase, seconds in phases.items():
+                report.add_phase(phase, seconds)
+            report.add_phase("flush", time.perf_counter() - traversed)
+            self._report = None
 
         return obj_id, obj
 
@@ -191,7 +236,10 @@ class BaseObjectSerializer:
             }
         object_builder["totalChildrenCount"] = len(closure)
 
-        obj_id = hash_obj(object_builder)
+        if self._report is None:
+            obj_id = hash_obj(object_builder, self.json_codec)
+        else:
+            obj_id = self.__timed_hash(object_builder)
 
         object_builder["id"] = obj_id
         if closure:
@@ -199,9 +247,12 @@ class BaseObjectSerializer:
 
         # write detached or root objects to transports
         if detached and self.write_transports:
-            serialized_data = ujson.dumps(object_builder)
-            for t in self.write_transports:
-                t.save_object(id=obj_id, serialized_object=serialized_data)
+            if self._report is None:
+                serialized_data = self.json_codec.dumps(object_builder)
+                for t in self.write_transports:
+                    t.save_object(id=obj_id, serialized_object=serialized_data)
+            else:
+                self.__timed_save(obj_id, object_builder)
 
         del self.lineage[-1]
 
@@ -290,6 +341,26 @@ class BaseObjectSerializer:
             "speckle_type": "reference",
         }
 
+    def __timed_hash(self, object_builder: Dict[str, Any]) -> str:
+        start = time.perf_counter()
+        obj_id = hash_obj(object_builder, self.json_codec)
+        self._phase_seconds["hashing"] += time.perf_counter() - start
+        return obj_id
+
+    def __timed_save(self, obj_id: str, object_builder: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        serialized_data = self.json_codec.dumps(object_builder)
+        encoded = time.perf_counter()
+        self._phase_seconds["encoding"] += encoded - start
+        self._report.object_count += 1
+        self._report.bytes_raw += len(serialized_data)
+        for t in self.write_transports:
+            t.save_object(id=obj_id, serialized_object=serialized_data)
+            saved = time.perf_counter()
+            self._report.transport(t.name).enqueue.record(saved - encoded)
+            self._phase_seconds["enqueue"] += saved - encoded
+            encoded = saved
+
     def __reset_writer(self) -> None:
         """
         Reinitializes the lineage, and other variables that get used during the json
@@ -299,6 +370,7 @@ class BaseObjectSerializer:
         self.lineage = []
         self.family_tree = {}
         self.closure_table = {}
+        self._phase_seconds = {"hashing": 0.0, "encoding": 0.0, "enqueue": 0.0}
 
     def read_json(self, obj_string: str) -> Base:
         """Recomposes a Base object from the string representation of the object
@@ -313,8 +385,21 @@ class BaseObjectSerializer:
             return None
 
         self.deserialized = {}
-        obj = safe_json_loads(obj_string)
-        return self.recompose_base(obj=obj)
+        with tracing.span("speckle.deserialize") as span:
+            obj = self.json_codec.loads(obj_string)
+            self._progress = progress = current_receive_progress()
+            if progress is None:
+                base = self.recompose_base(obj=obj)
+            else:
+                # the root and its detached children
+                total = len(obj.get("__closure") or {}) + 1
+                try:
+                    with progress.stage_of("deserialization", total):
+                        base = self.recompose_base(obj=obj)
+                finally:
+                    self._progress = None
+            span.set_attribute("objects", len(self.deserialized))
+        return base
 
     def recompose_base(self, obj: dict) -> Base:
         """Steps through a base object dictionary and recomposes the base object
@@ -329,13 +414,25 @@ class BaseObjectSerializer:
         if not obj:
             return
         if isinstance(obj, str):
-            obj = safe_json_loads(obj)
+            obj = self.json_codec.loads(obj)
 
         if "id" in obj and obj["id"] in self.deserialized:
             return self.deserialized[obj["id"]]
 
         if "speckle_type" in obj and obj["speckle_type"] == "reference":
-            obj = self.get_child(obj=obj)
+            ref_id = obj["referencedId"]
+            cached = self.__get_cached(ref_id)
+            if cached is not None:
+                return cached
+            ref_obj_str = self.read_transport.get_object(id=ref_id)
+            if ref_obj_str:
+                return self.__recompose_child(ref_id, ref_obj_str)
+            warnings.warn(
+                f"Could not find the referenced child object of id `{ref_id}` in the"
+                f" given read transport: {self.read_transport.name}",
+                SpeckleWarning,
+                stacklevel=2,
+            )
 
         speckle_type = obj.get("speckle_type")
         # if speckle type is not in the object definition, it is treated as a dict
@@ -369,10 +466,13 @@ class BaseObjectSerializer:
             # 2. handle referenced child objects
             elif "referencedId" in value:
                 ref_id = value["referencedId"]
+                cached = self.__get_cached(ref_id)
+                if cached is not None:
+                    base.__setattr__(prop, cached)
+                    continue
                 ref_obj_str = self.read_transport.get_object(id=ref_id)
                 if ref_obj_str:
-                    ref_obj = safe_json_loads(ref_obj_str, ref_id)
-                    base.__setattr__(prop, self.recompose_base(obj=ref_obj))
+                    base.__setattr__(prop, self.__recompose_child(ref_id, ref_obj_str))
                 else:
                     warnings.warn(
                         f"Could not find the referenced child object of id `{ref_id}`"
@@ -388,9 +488,29 @@ class BaseObjectSerializer:
 
         if "id" in obj:
             self.deserialized[obj["id"]] = base
+            if self._progress is not None:
+                self._progress.advance()
 
         return base
 
+    def __get_cached(self, id: str) -> Optional[Base]:
+        """The object of `id` if it was deserialized already, by this read or not"""
+        if id in self.deserialized:
+            return self.deserialized[id]
+        if self.object_cache is None:
+            return None
+        known = len(self.deserialized)
+        cached = self.object_cache.get(id, self.deserialized)
+        if cached is not None and self._progress is not None:
+            self._progress.advance(len(self.deserialized) - known)
+        return cached
+
+    def __recompose_child(self, id: str, obj_string: str) -> Any:
+        child = self.recompose_base(obj=self.json_codec.loads(obj_string))
+        if self.object_cache is not None and isinstance(child, Base):
+            self.object_cache.put(id, child, len(obj_string))
+        return child
+
     def handle_value(self, obj: Any):
         """Helper for recomposing a base object by handling the dictionary
         representation's values
@@ -446,4 +566,4 @@ class BaseObjectSerializer:
             )
             return obj
 
-        return safe_json_loads(ref_obj_str, ref_id)
+        return self.json_codec.loads(ref_obj_str)
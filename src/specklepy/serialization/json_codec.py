@@ -0,0 +1,194 @@
+"""
+Pluggable JSON encoding and decoding for the serialization hot path.
+
+Object ids are the hash of the JSON encoding of an object, so every backend must
+produce the exact same bytes as the reference `ujson` encoding (insertion ordered
+keys, no whitespace, ASCII only output with escaped forward slashes and `ujson`'s
+shortest round-trip float formatting). A backend that cannot guarantee this for a
+given object falls back to the reference encoder for that object.
+
+The codec is selected with the `SPECKLE_JSON_CODEC` environment variable
+(`ujson` or `orjson`) or with `set_json_codec`. `ujson` is the default.
+"""
+
+import json
+import logging
+import math
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Union
+
+import ujson
+
+from specklepy.logging.exceptions import SpeckleException
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+LOG = logging.getLogger(__name__)
+
+_codec_env_var = "SPECKLE_JSON_CODEC"
+
+
+def _stdlib_loads(data: Union[str, bytes], error: Exception) -> Any:
+    # ujson and orjson reject integers outside of the 64 bit range,
+    # the stdlib parser doesn't.
+    LOG.debug("Falling back to the stdlib json parser: %s", error)
+    return json.loads(data)
+
+
+class JsonCodec(ABC):
+    """Encodes and decodes JSON with `ujson` compatible canonical output."""
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        pass
+
+    @abstractmethod
+    def dumpb(self, obj: Any) -> bytes:
+        """Encodes the object into canonical JSON bytes."""
+        pass
+
+    @abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decodes a JSON document from a string or bytes."""
+        pass
+
+    def dumps(self, obj: Any) -> str:
+        """Encodes the object into a canonical JSON string."""
+        return self.dumpb(obj).decode()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class UjsonCodec(JsonCodec):
+    """The reference codec: its output defines the canonical encoding."""
+
+    @property
+    def name(self) -> str:
+        return "ujson"
+
+    def dumps(self, obj: Any) -> str:
+        return ujson.dumps(obj)
+
+    def dumpb(self, obj: Any) -> bytes:
+        return ujson.dumps(obj).encode()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return ujson.loads(data)
+        except ValueError as err:
+            return _stdlib_loads(data, err)
+
+
+# orjson formats floats below 1e-4 in decimal notation and drops the "+" of
+# positive exponents, where ujson writes `1e-5` and `1e+16`. To spot those cheaply,
+# the output is translated so that digits collapse to "1" (keeping "0", "e" and
+# "."), and any output that might contain such a number, or a string that looks
+# like one, is re-encoded with ujson. False positives only cost speed.
+_ORJSON_NUMBER_TABLE = bytes(
+    ord("1") if chr(c) in "123456789" else c if chr(c) in "0e." else ord(" ")
+    for c in range(256)
+)
+_ORJSON_DIVERGENT_NUMBERS = (b"1e", b"0e", b"0.0000")
+
+
+def _may_diverge_from_ujson(data: bytes) -> bool:
+    digits = data.translate(_ORJSON_NUMBER_TABLE)
+    return any(pattern in digits for pattern in _ORJSON_DIVERGENT_NUMBERS)
+
+
+def _has_non_finite(value: Any) -> bool:
+    """Whether the value holds a NaN or infinite float, which orjson writes as null"""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(item) for item in value.values())
+    if isinstance(value, list | tuple):
+        # sums lists of numbers in C, the items are only walked for other lists
+        try:
+            return not math.isfinite(math.fsum(value))
+        except (TypeError, ValueError, OverflowError):
+            return any(_has_non_finite(item) for item in value)
+    return False
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    A faster codec built on `orjson`, falling back to `ujson` for the objects
+    where the two encoders don't agree byte for byte, eg. the non-finite floats
+    orjson writes as `null` instead of ujson's `NaN` / `Infinity`.
+    """
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise SpeckleException(
+                "The orjson JSON codec requires the `orjson` package to be installed."
+            )
+        self._fallback = UjsonCodec()
+
+    @property
+    def name(self) -> str:
+        return "orjson"
+
+    def dumpb(self, obj: Any) -> bytes:
+        try:
+            data = orjson.dumps(obj)
+        except TypeError:
+            # non str dict keys, integers beyond 64 bits, unsupported types
+            return self._fallback.dumpb(obj)
+
+        if (
+            not data.isascii()
+            or _may_diverge_from_ujson(data)
+            or (b"null" in data and _has_non_finite(obj))
+        ):
+            return self._fallback.dumpb(obj)
+
+        # a forward slash can only occur inside of a string
+        return data.replace(b"/", b"\\/")
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return self._fallback.loads(data)
+
+
+_CODECS = {
+    "ujson": UjsonCodec,
+    "orjson": OrjsonCodec,
+}
+
+_codec: Optional[JsonCodec] = None
+
+
+def get_json_codec() -> JsonCodec:
+    """Returns the process wide JSON codec."""
+    global _codec
+    if _codec is None:
+        _codec = _create_codec(os.environ.get(_codec_env_var) or "ujson")
+    return _codec
+
+
+def set_json_codec(codec: Union[str, JsonCodec, None]) -> JsonCodec:
+    """
+    Sets the process wide JSON codec, either by name or by instance.
+    Passing `None` restores the default selection.
+    """
+    global _codec
+    _codec = _create_codec(codec) if isinstance(codec, str) else codec
+    return get_json_codec()
+
+
+def _create_codec(name: str) -> JsonCodec:
+    codec_type = _CODECS.get(name.lower())
+    if not codec_type:
+        raise SpeckleException(
+            f"Unknown JSON codec '{name}', expected one of: {', '.join(_CODECS)}"
+        )
+    return codec_type()
@@ -0,0 +1,156 @@
+"""
+A process wide cache of deserialized objects, shared by every receive.
+
+Object ids are content hashes, so an object received again, eg. an unchanged
+geometry chunk or material of the next version of a model, can be reused instead
+of fetched, parsed and recomposed again. The cache is bounded by a number of
+objects and / or by the size of their JSON.
+
+Cached objects are never handed out: every receive gets its own copy of them, so
+changes made to received objects don't leak into the cache or other receives.
+
+The cache is off by default. It is enabled with `set_object_cache`, or by setting
+the `SPECKLE_OBJECT_CACHE_MB` environment variable to its size budget.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects.base import Base
+from specklepy.transports.sqlite import CacheStats
+
+_cache_env_var = "SPECKLE_OBJECT_CACHE_MB"
+
+# lists made of these only are copied in one go
+_FLAT_TYPES = frozenset((int, float, str, bool, type(None)))
+
+
+class DeserializedObjectCache:
+    """An LRU of deserialized objects by id, bounded by count and / or bytes."""
+
+    def __init__(
+        self, max_objects: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> None:
+        if max_objects is None and max_bytes is None:
+            raise SpeckleException(
+                "The object cache needs a max_objects or max_bytes bound"
+            )
+        self.max_objects = max_objects
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        # id -> (object, size of its JSON)
+        self._entries: OrderedDict[str, Tuple[Base, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, id: str) -> bool:
+        with self._lock:
+            return id in self._entries
+
+    def get(self, id: str, received: Dict[str, Base]) -> Optional[Base]:
+        """
+        Returns a copy of the object of `id`, or None if it isn't cached.
+
+        `received` holds the objects already deserialized by the caller by id. They
+        are reused within the copy, and the copied objects are added to it.
+        """
+        with self._lock:
+            entry = self._entries.get(id)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(id)
+            self.stats.hits += 1
+        return _copy(entry[0], received)
+
+    def put(self, id: str, base: Base, size: int) -> None:
+        """Caches a copy of `base`, whose JSON is `size` bytes long."""
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        if id in self:
+            return
+        # the children cached already are shared, rather than copied again
+        pristine = _copy(base, {}, self._entries)
+        with self._lock:
+            if id in self._entries:
+                return
+            self._entries[id] = (pristine, size)
+            self.stats.size_bytes += size
+            self.__evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.stats.size_bytes = 0
+
+    def __evict(self) -> None:
+        while self._entries and (
+            (self.max_objects is not None and len(self._entries) > self.max_objects)
+            or (self.max_bytes is not None and self.stats.size_bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.stats.size_bytes -= size
+            self.stats.evicted_objects += 1
+            self.stats.evicted_bytes += size
+
+
+def _copy(
+    value: Any,
+    objects: Dict[str, Base],
+    cached: Optional[Dict[str, Tuple[Base, int]]] = None,
+) -> Any:
+    """
+    Copies a deserialized value. Objects with an id found in `objects` are reused
+    and the copied ones are added to it, so every object is copied only once.
+    The objects found in `cached` entries are shared too.
+    """
+    if isinstance(value, Base):
+        id = value.__dict__.get("id")
+        if id is not None:
+            if id in objects:
+                return objects[id]
+            entry = cached.get(id) if cached is not None else None
+            if entry is not None:
+                return entry[0]
+        copy = value.__class__.__new__(value.__class__)
+        if id is not None:
+            objects[id] = copy
+        # bypasses the type checks of __setattr__, the values were checked already
+        copy.__dict__.update(
+            (key, _copy(item, objects, cached)) for key, item in value.__dict__.items()
+        )
+        return copy
+    if isinstance(value, list):
+        if all(type(item) in _FLAT_TYPES for item in value):
+            return value.copy()
+        return [_copy(item, objects, cached) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy(item, objects, cached) for key, item in value.items()}
+    return value
+
+
+_cache: Optional[DeserializedObjectCache] = None
+_cache_from_env = False
+
+
+def get_object_cache() -> Optional[DeserializedObjectCache]:
+    """Returns the process wide object cache, if enabled."""
+    global _cache, _cache_from_env
+    if _cache is None and not _cache_from_env:
+        _cache_from_env = True
+        budget_mb = os.environ.get(_cache_env_var)
+        if budget_mb:
+            _cache = DeserializedObjectCache(max_bytes=int(float(budget_mb) * 1e6))
+    return _cache
+
+
+def set_object_cache(
+    cache: Optional[DeserializedObjectCache],
+) -> Optional[DeserializedObjectCache]:
+    """Sets the process wide object cache, `None` disables it."""
+    global _cache, _cache_from_env
+    _cache = cache
+    _cache_from_env = True
+    return _cache
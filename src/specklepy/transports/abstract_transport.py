@@ -56,6 +56,18 @@ class AbstractTransport(ABC):
         """
         pass
 
+    def get_objects(self, id_list: List[str]) -> Dict[str, Optional[str]]:
+        """Gets multiple objects. Transports that can read in bulk should override this.
+
+        Arguments:
+            id_list -- List of object id to be fetched
+
+        Returns:
+            Dict[str, Optional[str]] -- keys: input ids, values: the full string
+                representation of the object (or None if the object is not found)
+        """
+        return {id: self.get_object(id) for id in id_list}
+
     @abstractmethod
     def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
         """Checks the presence of multiple objects.
@@ -0,0 +1,323 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.serialization.json_codec import get_json_codec
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.sqlite import CacheStats
+
+WRITE_THROUGH = "write-through"
+WRITE_BACK = "write-back"
+
+# single objects read from a tier are back-filled into the tiers above it in
+# batches of this length, rather than in a write (and commit) each
+_BACK_FILL_BATCH_LENGTH = 1000
+# the closures of the latest prefetched roots, whose objects aren't roots to
+# prefetch the closure of in turn
+_PREFETCHED_ROOTS = 4
+_PREFETCH_CHUNK_LENGTH = 1000
+
+
+class _TierWriter(AbstractTransport):
+    """Writes objects copied out of a tier into the memory cache and the tiers above"""
+
+    def __init__(self, caching: "CachingTransport", tier_index: int) -> None:
+        self._caching = caching
+        self._tiers = caching.tiers[:tier_index]
+
+    @property
+    def name(self) -> str:
+        return f"{self._caching.name} back-fill"
+
+    def begin_write(self) -> None:
+        for tier in self._tiers:
+            tier.begin_write()
+
+    def end_write(self) -> None:
+        for tier in self._tiers:
+            tier.end_write()
+
+    def save_object(self, id: str, serialized_object: str) -> None:
+        self._caching._remember(id, serialized_object)
+        for tier in self._tiers:
+            tier.save_object(id, serialized_object)
+
+    def save_object_from_transport(
+        self, id: str, source_transport: AbstractTransport
+    ) -> None:
+        self.save_object(id, source_transport.get_object(id))
+
+    def get_object(self, id: str) -> Optional[str]:
+        return self._caching.get_object(id)
+
+    def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
+        return self._caching.has_objects(id_list)
+
+    def copy_object_and_children(
+        self, id: str, target_transport: AbstractTransport
+    ) -> str:
+        raise NotImplementedError
+
+
+class CachingTransport(AbstractTransport):
+    """
+    A transport layering a byte bounded, least recently used in memory cache over
+    a list of slower transports, eg. `[SQLiteTransport(), ServerTransport(...)]`.
+
+    Reads are served by the first tier that has the objects. Misses are fetched
+    from the next tier in bulk and back-filled into the memory cache and every
+    tier above it. Tiers that can't read single objects (raising
+    `NotImplementedError`) are fetched from with `copy_object_and_children`, and
+    any other error of a tier is raised. Single objects are back-filled in
+    batches, written once enough of them are read, on bulk reads and on `flush`.
+
+    Once a root object is read from below the memory cache, its closure is
+    prefetched in bulk, so deserializing it is served from memory. The objects of
+    a prefetched closure don't trigger prefetches of their own, and prefetching
+    stops once the memory cache is full, as the rest would only evict the start.
+
+    Writes either go to every tier as they are saved (`"write-through"`), or only
+    to the memory cache and are flushed to the tiers at `end_write`
+    (`"write-back"`), or as soon as they take more than `max_memory_mb`.
+    """
+
+    def __init__(
+        self,
+        tiers: List[AbstractTransport],
+        max_memory_mb: float = 256.0,
+        write_policy: str = WRITE_THROUGH,
+        name: str = "Caching",
+    ) -> None:
+        super().__init__()
+        if write_policy not in (WRITE_THROUGH, WRITE_BACK):
+            raise SpeckleException(
+                f"Unknown write policy {write_policy!r}, expected"
+                f" {WRITE_THROUGH!r} or {WRITE_BACK!r}"
+            )
+        self._name = name
+        self.tiers = list(tiers)
+        self.max_memory_bytes = int(max_memory_mb * 1000 * 1000)
+        self.write_policy = write_policy
+        self.stats = CacheStats()
+
+        self._lock = threading.Lock()
+        self._objects: OrderedDict[str, str] = OrderedDict()
+        self._dirty: Dict[str, str] = {}
+        self._dirty_bytes = 0
+        # tier index -> the objects read from it, to back-fill into the tiers above
+        self._back_fill: Dict[int, Dict[str, str]] = {}
+        self._prefetched: OrderedDict[str, Set[str]] = OrderedDict()
+        # the tiers that can't read single objects, only copy them
+        self._copy_only_tiers: Set[int] = set()
+
+    def __repr__(self) -> str:
+        return f"CachingTransport(tiers: {self.tiers}, policy: {self.write_policy})"
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def begin_write(self) -> None:
+        if self.write_policy == WRITE_THROUGH:
+            for tier in self.tiers:
+                tier.begin_write()
+
+    def end_write(self) -> None:
+        if self.write_policy == WRITE_THROUGH:
+            for tier in self.tiers:
+                tier.end_write()
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the objects saved with the write-back policy to every tier, and the
+        objects waiting to be back-filled to the tiers above the one they were
+        read from.
+        """
+        with self._lock:
+            back_fill, self._back_fill = self._back_fill, {}
+        for tier_index, objects in back_fill.items():
+            self.__write_back_fill(tier_index, objects)
+
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            self._dirty_bytes = 0
+        if not dirty:
+            return
+        for tier in self.tiers:
+            tier.begin_write()
+            for id, obj in dirty.items():
+                tier.save_object(id, obj)
+            tier.end_write()
+
+    def save_object(self, id: str, serialized_object: str) -> None:
+        self._remember(id, serialized_object)
+        if self.write_policy == WRITE_BACK:
+            with self._lock:
+                self._dirty[id] = serialized_object
+                self._dirty_bytes += len(serialized_object)
+                over_budget = self._dirty_bytes > self.max_memory_bytes
+            if over_budget:
+                self.flush()
+            return
+        for tier in self.tiers:
+            tier.save_object(id, serialized_object)
+
+    def save_object_from_transport(
+        self, id: str, source_transport: AbstractTransport
+    ) -> None:
+        self.save_object(id, source_transport.get_object(id))
+
+    def get_object(self, id: str) -> Optional[str]:
+        with self._lock:
+            obj = self.__lookup(id)
+        if obj is not None:
+            return obj
+
+        obj = self.__fetch([id]).get(id)
+        if obj is not None:
+            self.__prefetch_children(id, obj)
+            return obj
+        return self.__copy_from_tiers(id)
+
+    def get_objects(self, id_list: List[str]) -> Dict[str, Optional[str]]:
+        found = {}
+        with self._lock:
+            for id in id_list:
+                obj = self.__lookup(id)
+                if obj is not None:
+                    found[id] = obj
+
+        missing = [id for id in id_list if id not in found]
+        if missing:
+            found.update(self.__fetch(missing))
+        return {id: found.get(id) for id in id_list}
+
+    def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
+        with self._lock:
+            found = {id: id in self._objects or id in self._dirty for id in id_list}
+        missing = [id for id, has in found.items() if not has]
+        for tier in self.tiers:
+            if not missing:
+                break
+            tier_found = tier.has_objects(missing)
+            found.update({id: True for id in missing if tier_found.get(id)})
+            missing = [id for id in missing if not found[id]]
+        return found
+
+    def copy_object_and_children(
+        self, id: str, target_transport: AbstractTransport
+    ) -> str:
+        root = self.get_object(id)
+        if root is None:
+            raise SpeckleException(f"Could not find object {id} in {self}")
+
+        children = list(get_json_codec().loads(root).get("__closure", {}))
+        objects = self.get_objects(children)
+        target_transport.begin_write()
+        for child_id, child in objects.items():
+            if child is None:
+                raise SpeckleException(f"Could not find object {child_id} in {self}")
+            target_transport.save_object(child_id, child)
+        target_transport.save_object(id, root)
+        target_transport.end_write()
+
+        return root
+
+    def _remember(self, id: str, serialized_object: str) -> None:
+        size = len(serialized_object)
+        if size > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._objects.pop(id, None)
+            if previous is not None:
+                self.stats.size_bytes -= len(previous)
+            self._objects[id] = serialized_object
+            self.stats.size_bytes += size
+            while self.stats.size_bytes > self.max_memory_bytes:
+                _, evicted = self._objects.popitem(last=False)
+                self.stats.size_bytes -= len(evicted)
+                self.stats.evicted_objects += 1
+                self.stats.evicted_bytes += len(evicted)
+
+    def __lookup(self, id: str) -> Optional[str]:
+        obj = self._objects.get(id)
+        if obj is not None:
+            self._objects.move_to_end(id)
+            self.stats.hits += 1
+            return obj
+        obj = self._dirty.get(id)
+        if obj is not None:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return obj
+
+    def __fetch(self, id_list: List[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        missing = id_list
+        for i, tier in enumerate(self.tiers):
+            if not missing:
+                break
+            try:
+                objects = tier.get_objects(missing)
+            except NotImplementedError:
+                self._copy_only_tiers.add(i)
+                continue
+            hits = {id: obj for id, obj in objects.items() if obj is not None}
+            if not hits:
+                continue
+            for id, obj in hits.items():
+                self._remember(id, obj)
+            if i:
+                self.__back_fill(i, hits, bulk=len(id_list) > 1)
+            found.update(hits)
+            missing = [id for id in missing if id not in hits]
+        return found
+
+    def __back_fill(self, tier_index: int, objects: Dict[str, str], bulk: bool) -> None:
+        with self._lock:
+            pending = self._back_fill.setdefault(tier_index, {})
+            pending.update(objects)
+            if not bulk and len(pending) < _BACK_FILL_BATCH_LENGTH:
+                return
+            del self._back_fill[tier_index]
+        self.__write_back_fill(tier_index, pending)
+
+    def __write_back_fill(self, tier_index: int, objects: Dict[str, str]) -> None:
+        for tier in self.tiers[:tier_index]:
+            tier.begin_write()
+            for id, obj in objects.items():
+                tier.save_object(id, obj)
+            tier.end_write()
+
+    def __copy_from_tiers(self, id: str) -> Optional[str]:
+        # the readable tiers were just searched, and don't have the object
+        for i, tier in enumerate(self.tiers):
+            if i not in self._copy_only_tiers:
+                continue
+            try:
+                return tier.copy_object_and_children(id, _TierWriter(self, i))
+            except NotImplementedError:
+                continue
+        return None
+
+    def __prefetch_children(self, id: str, obj: str) -> None:
+        closure = get_json_codec().loads(obj).get("__closure")
+        if not closure:
+            return
+        with self._lock:
+            if any(id in children for children in self._prefetched.values()):
+                return
+            self._prefetched[id] = set(closure)
+            while len(self._prefetched) > _PREFETCHED_ROOTS:
+                self._prefetched.popitem(last=False)
+
+        children = list(closure)
+        prefetched_bytes = 0
+        for i in range(0, len(children), _PREFETCH_CHUNK_LENGTH):
+            objects = self.get_objects(children[i : i + _PREFETCH_CHUNK_LENGTH])
+            prefetched_bytes += sum(len(obj) for obj in objects.values() if obj)
+            if prefetched_bytes >= self.max_memory_bytes:
+                return
@@ -0,0 +1,273 @@
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.serialization.json_codec import get_json_codec
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.sqlite import SQLiteTransport
+
+# index records: id length, offset and length of the object in the pack, then the id
+_INDEX_RECORD = struct.Struct("<HQI")
+_PACK_SUFFIX = ".pack"
+_INDEX_SUFFIX = ".idx"
+
+
+class _Segment:
+    """A pack file of concatenated objects, read through a memory map"""
+
+    def __init__(self, pack_path: str) -> None:
+        self.pack_path = pack_path
+        self.index_path = pack_path[: -len(_PACK_SUFFIX)] + _INDEX_SUFFIX
+        self.index_read = 0
+        self._map: Optional[mmap.mmap] = None
+
+    def read(self, offset: int, length: int) -> bytes:
+        end = offset + length
+        if self._map is None or len(self._map) < end:
+            # the pack has grown since it was mapped
+            self.close()
+            with open(self.pack_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[offset:end]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class DiskTransport(AbstractTransport):
+    """
+    A transport storing objects in a directory of append-only pack files.
+
+    Every transport instance appends to its own pack segments, so any number of
+    threads and processes can write to the same directory without contending on a
+    lock. Each `<segment>.pack` is accompanied by a `<segment>.idx` of
+    `(id, offset, length)` records, which is only appended to once the objects it
+    points to have been written. All the indices are loaded into memory, so
+    `has_objects` and `get_objects` never touch the disk for missing objects, and
+    objects are read through memory maps of the packs.
+
+    Since files are only ever appended to, the directory can be copied or rsynced
+    between machines while in use; partially copied index records are ignored.
+    Segments written by other processes are picked up on lookup misses, at most
+    every `refresh_interval_seconds`, or explicitly with `refresh`.
+    """
+
+    def __init__(
+        self,
+        base_path: Optional[str] = None,
+        app_name: Optional[str] = None,
+        scope: Optional[str] = None,
+        name: str = "Disk",
+        max_segment_size_mb: float = 1024.0,
+        write_buffer_size_mb: float = 4.0,
+        refresh_interval_seconds: float = 1.0,
+    ) -> None:
+        super().__init__()
+        self._name = name
+        self.app_name = app_name or "Speckle"
+        self.scope = scope or "DiskObjects"
+        base_path = base_path or SQLiteTransport.get_base_path(self.app_name)
+        self._root_path = os.path.join(base_path, self.scope)
+        self.max_segment_size = int(max_segment_size_mb * 1000 * 1000)
+        self._write_buffer_size = int(write_buffer_size_mb * 1000 * 1000)
+        self.refresh_interval = refresh_interval_seconds
+        self.saved_obj_count = 0
+
+        self._lock = threading.RLock()
+        self._segments: Dict[str, _Segment] = {}
+        self._index: Dict[str, Tuple[_Segment, int, int]] = {}
+        self._last_refresh = 0.0
+
+        self._writer: Optional[_Segment] = None
+        self._pack_file: Optional[BinaryIO] = None
+        self._index_file: Optional[BinaryIO] = None
+        self._pack_size = 0
+        self._pending_index: List[bytes] = []
+
+        try:
+            os.makedirs(self._root_path, exist_ok=True)
+            self.refresh()
+        except Exception as ex:
+            raise SpeckleException(
+                f"DiskTransport could not initialise {self._root_path}. Either provide"
+                " a different `base_path` or use an alternative transport.",
+            ) from ex
+
+    def __repr__(self) -> str:
+        return f"DiskTransport(path: '{self._root_path}', objects: {len(self._index)})"
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def begin_write(self) -> None:
+        self.saved_obj_count = 0
+
+    def end_write(self) -> None:
+        with self._lock:
+            self.__flush()
+
+    def save_object(self, id: str, serialized_object: str) -> None:
+        data = serialized_object.encode()
+        with self._lock:
+            if id in self._index:
+                return
+            if self._writer is None or self._pack_size >= self.max_segment_size:
+                self.__open_segment()
+
+            offset = self._pack_size
+            self._pack_file.write(data)
+            self._pack_size += len(data)
+            self._index[id] = (self._writer, offset, len(data))
+
+            encoded_id = id.encode()
+            self._pending_index.append(
+                _INDEX_RECORD.pack(len(encoded_id), offset, len(data)) + encoded_id
+            )
+            self.saved_obj_count += 1
+
+    def save_object_from_transport(
+        self, id: str, source_transport: AbstractTransport
+    ) -> None:
+        self.save_object(id, source_transport.get_object(id))
+
+    def get_object(self, id: str) -> Optional[str]:
+        return self.get_objects([id])[id]
+
+    def get_objects(self, id_list: List[str]) -> Dict[str, Optional[str]]:
+        with self._lock:
+            locations = self.__locate(id_list)
+            if self._writer is not None and any(
+                segment is self._writer for segment, _, _ in locations.values()
+            ):
+                self.__flush()
+
+            # read every pack front to back
+            found = {}
+            for id, (segment, offset, length) in sorted(
+                locations.items(), key=lambda item: (item[1][0].pack_path, item[1][1])
+            ):
+                found[id] = segment.read(offset, length).decode()
+
+        return {id: found.get(id) for id in id_list}
+
+    def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
+        with self._lock:
+            locations = self.__locate(id_list)
+        return {id: id in locations for id in id_list}
+
+    def copy_object_and_children(
+        self, id: str, target_transport: AbstractTransport
+    ) -> str:
+        root = self.get_object(id)
+        if root is None:
+            raise SpeckleException(f"Could not find object {id} in {self}")
+
+        children = list(get_json_codec().loads(root).get("__closure", {}))
+        target_transport.begin_write()
+        for child_id, child in self.get_objects(children).items():
+            if child is None:
+                raise SpeckleException(f"Could not find object {child_id} in {self}")
+            target_transport.save_object(child_id, child)
+        target_transport.save_object(id, root)
+        target_transport.end_write()
+
+        return root
+
+    def refresh(self) -> None:
+        """Loads the segments and index records written by other transports."""
+        with self._lock:
+            self._last_refresh = time.monotonic()
+            for file_name in sorted(os.listdir(self._root_path)):
+                if not file_name.endswith(_PACK_SUFFIX):
+                    continue
+                pack_path = os.path.join(self._root_path, file_name)
+                segment = self._segments.get(pack_path)
+                if segment is None:
+                    segment = self._segments[pack_path] = _Segment(pack_path)
+                if segment is not self._writer:
+                    self.__read_index(segment)
+
+    def close(self) -> None:
+        with self._lock:
+            self.__flush()
+            self.__close_writer()
+            for segment in self._segments.values():
+                segment.close()
+
+    def __locate(self, id_list: List[str]) -> Dict[str, Tuple[_Segment, int, int]]:
+        locations = {id: self._index[id] for id in id_list if id in self._index}
+        if (
+            len(locations) < len(id_list)
+            and time.monotonic() - self._last_refresh >= self.refresh_interval
+        ):
+            self.refresh()
+            locations = {id: self._index[id] for id in id_list if id in self._index}
+        return locations
+
+    def __read_index(self, segment: _Segment) -> None:
+        try:
+            with open(segment.index_path, "rb") as f:
+                f.seek(segment.index_read)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        position = 0
+        header_size = _INDEX_RECORD.size
+        while position + header_size <= len(data):
+            id_length, offset, length = _INDEX_RECORD.unpack_from(data, position)
+            end = position + header_size + id_length
+            if end > len(data):
+                # partially written or copied record
+                break
+            id = data[position + header_size : end].decode()
+            self._index.setdefault(id, (segment, offset, length))
+            position = end
+        segment.index_read += position
+
+    def __open_segment(self) -> None:
+        self.__flush()
+        self.__close_writer()
+        name = f"{time.time_ns():x}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        pack_path = os.path.join(self._root_path, name + _PACK_SUFFIX)
+        # kept open for the lifetime of the segment, closed in __close_writer
+        self._pack_file = open(  # noqa: SIM115
+            pack_path, "ab", buffering=self._write_buffer_size
+        )
+        self._index_file = open(  # noqa: SIM115
+            pack_path[: -len(_PACK_SUFFIX)] + _INDEX_SUFFIX, "ab"
+        )
+        self._pack_size = 0
+        self._writer = self._segments[pack_path] = _Segment(pack_path)
+
+    def __flush(self) -> None:
+        if self._pack_file is None:
+            return
+        # objects must be on disk before the index records pointing to them
+        self._pack_file.flush()
+        if self._pending_index:
+            records = b"".join(self._pending_index)
+            self._index_file.write(records)
+            self._index_file.flush()
+            self._writer.index_read += len(records)
+            self._pending_index = []
+
+    def __close_writer(self) -> None:
+        if self._pack_file is not None:
+            self._pack_file.close()
+            self._index_file.close()
+        self._pack_file = None
+        self._index_file = None
+        self._writer = None
+
+    def __del__(self):
+        if hasattr(self, "_lock"):
+            self.close()
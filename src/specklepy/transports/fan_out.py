@@ -0,0 +1,136 @@
+import queue
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from specklepy.logging import tracing
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.transports.abstract_transport import AbstractTransport
+
+# objects are handed to the worker in batches, to keep queue overhead low
+_BATCH_LENGTH = 256
+
+
+class QueuedWriter(AbstractTransport):
+    """
+    Decouples writes to a transport from the thread saving objects.
+
+    Saved objects are queued, and written to the wrapped transport in order by a
+    worker thread. The queue is bounded, so a transport that can't keep up slows
+    the writer down rather than buffering without limit. Errors of the wrapped
+    transport are raised by `end_write`, once every queued object was handled.
+    Reads wait for the queued writes first.
+    """
+
+    def __init__(self, transport: AbstractTransport, queue_length: int = 64) -> None:
+        super().__init__()
+        self.transport = transport
+        self._queue: queue.Queue[Optional[List[Tuple[str, str]]]] = queue.Queue(
+            queue_length
+        )
+        self._batch: List[Tuple[str, str]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._exception: Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        return f"QueuedWriter({self.transport!r})"
+
+    @property
+    def name(self) -> str:
+        return self.transport.name
+
+    def begin_write(self) -> None:
+        self.transport.begin_write()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=tracing.propagate(self.__worker_main),
+                name=f"QueuedWriter({self.name})",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def end_write(self) -> None:
+        self.__stop_worker()
+        exception, self._exception = self._exception, None
+        try:
+            self.transport.end_write()
+        finally:
+            if exception is not None:
+                raise SpeckleException(
+                    f"Could not write objects to {self.transport.name}: {exception}",
+                    exception,
+                ) from exception
+
+    def save_object(self, id: str, serialized_object: str) -> None:
+        if self._thread is None:
+            # not within begin_write / end_write
+            self.transport.save_object(id, serialized_object)
+            return
+        self._batch.append((id, serialized_object))
+        if len(self._batch) >= _BATCH_LENGTH:
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def save_object_from_transport(
+        self, id: str, source_transport: AbstractTransport
+    ) -> None:
+        self.save_object(id, source_transport.get_object(id))
+
+    def get_object(self, id: str) -> Optional[str]:
+        self.__wait_for_writes()
+        return self.transport.get_object(id)
+
+    def get_objects(self, id_list: List[str]) -> Dict[str, Optional[str]]:
+        self.__wait_for_writes()
+        return self.transport.get_objects(id_list)
+
+    def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
+        self.__wait_for_writes()
+        return self.transport.has_objects(id_list)
+
+    def copy_object_and_children(
+        self, id: str, target_transport: AbstractTransport
+    ) -> str:
+        self.__wait_for_writes()
+        return self.transport.copy_object_and_children(id, target_transport)
+
+    def __wait_for_writes(self) -> None:
+        if self._thread is None:
+            return
+        if self._batch:
+            self._queue.put(self._batch)
+            self._batch = []
+        self._queue.join()
+
+    def __stop_worker(self) -> None:
+        if self._thread is None:
+            return
+        self.__wait_for_writes()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def __worker_main(self) -> None:
+        while True:
+            batch = self._queue.get()
+            try:
+                # None is a sentinel value, meaning the thread should exit
+                if batch is None:
+                    return
+                if self._exception is None:
+                    for id, obj in batch:
+                        self.transport.save_object(id, obj)
+            except Exception as ex:
+                # keep draining the queue, so the writer never blocks on it
+                self._exception = ex
+            finally:
+                self._queue.task_done()
+
+
+def fan_out(
+    transports: List[AbstractTransport], queue_length: int = 64
+) -> List[AbstractTransport]:
+    """Wraps every transport in a `QueuedWriter`, to write to all of them at once."""
+    return [
+        t if isinstance(t, QueuedWriter) else QueuedWriter(t, queue_length)
+        for t in transports
+    ]
@@ -1,24 +1,134 @@
-from typing import Dict, List
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import closing, suppress
+from typing import Dict, List, Optional, Tuple
 
 from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.sqlite import CacheStats
+
+# the lowest `SQLITE_MAX_VARIABLE_NUMBER` of the sqlite versions python ships with
+_MAX_QUERY_PARAMS = 999
+# once over budget, objects are spilled until memory is down to this fraction of
+# the budget, so that spilling happens in batches rather than on every write
+_SPILL_LOW_WATERMARK = 0.9
+
+
+def _utf8_size(serialized_object: str) -> int:
+    # isascii is constant time on CPython, and most objects are plain ascii
+    if serialized_object.isascii():
+        return len(serialized_object)
+    return len(serialized_object.encode())
+
+
+def _remove_file(path: str) -> None:
+    with suppress(OSError):
+        os.remove(path)
+
+
+class _SpillStore:
+    """A throwaway sqlite db in a temp file, for the objects spilled from memory"""
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        fd, self.path = tempfile.mkstemp(
+            prefix="speckle-spill-", suffix=".db", dir=directory
+        )
+        os.close(fd)
+        self._finalizer = weakref.finalize(self, _remove_file, self.path)
+        self._connection = sqlite3.connect(
+            self.path, isolation_level=None, check_same_thread=False
+        )
+        with closing(self._connection.cursor()) as c:
+            # nothing in here has to survive a crash
+            c.execute("PRAGMA journal_mode=OFF;")
+            c.execute("PRAGMA synchronous=OFF;")
+            c.execute(
+                "CREATE TABLE objects(hash TEXT PRIMARY KEY, content TEXT)"
+                " WITHOUT ROWID"
+            )
+        self.count = 0
+
+    def put(self, objects: List[Tuple[str, str]]) -> None:
+        with closing(self._connection.cursor()) as c:
+            c.execute("BEGIN")
+            # ids are content hashes, an object spilled again is the same object
+            c.executemany("INSERT OR IGNORE INTO objects VALUES(?, ?)", objects)
+            self.count += c.rowcount
+            c.execute("COMMIT")
+
+    def get(self, ids: List[str]) -> Dict[str, str]:
+        found = {}
+        with closing(self._connection.cursor()) as c:
+            for i in range(0, len(ids), _MAX_QUERY_PARAMS):
+                chunk = ids[i : i + _MAX_QUERY_PARAMS]
+                c.execute(
+                    "SELECT hash, content FROM objects WHERE hash IN"
+                    f" ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                found.update(c.fetchall())
+        return found
+
+    def ids(self) -> List[str]:
+        with closing(self._connection.cursor()) as c:
+            c.execute("SELECT hash FROM objects")
+            return [row[0] for row in c.fetchall()]
+
+    def close(self) -> None:
+        self._connection.close()
+        self._finalizer()
 
 
 class MemoryTransport(AbstractTransport):
-    def __init__(self, name="Memory") -> None:
+    """
+    Keeps objects in memory.
+
+    With a `max_memory_mb` budget, the least recently used objects are spilled to
+    a temporary sqlite db (in `spill_dir`, or the system's temp dir) once the
+    budget is exceeded, so that receiving versions bigger than the available memory
+    still works. Reads are served from either. `objects` only holds the objects
+    kept in memory, and `stats` counts the reads served from memory as hits and the
+    spilled objects as evicted. Sizes are the UTF-8 encoded size of the objects.
+    """
+
+    def __init__(
+        self,
+        name="Memory",
+        max_memory_mb: Optional[float] = None,
+        spill_dir: Optional[str] = None,
+    ) -> None:
         super().__init__()
         self._name = name
-        self.objects = {}
+        self.objects = {} if max_memory_mb is None else OrderedDict()
         self.saved_object_count = 0
+        self.max_memory_bytes = (
+            int(max_memory_mb * 1000 * 1000) if max_memory_mb is not None else None
+        )
+        self.spill_dir = spill_dir
+        self.stats = CacheStats()
+        self._spill: Optional[_SpillStore] = None
+        self._lock = threading.Lock()
 
     @property
     def name(self) -> str:
         return self._name
 
     def __repr__(self) -> str:
+        if self._spill is not None:
+            return (
+                f"MemoryTransport(objects: {len(self.objects)}, spilled:"
+                f" {self._spill.count})"
+            )
         return f"MemoryTransport(objects: {len(self.objects)})"
 
     def save_object(self, id: str, serialized_object: str) -> None:
-        self.objects[id] = serialized_object
+        if self.max_memory_bytes is None:
+            self.objects[id] = serialized_object
+        else:
+            self.__save_bounded(id, serialized_object)
 
         self.saved_object_count += 1
 
@@ -28,10 +138,36 @@ class MemoryTransport(AbstractTransport):
         raise NotImplementedError
 
     def get_object(self, id: str) -> str | None:
-        return self.objects.get(id, None)
+        if self.max_memory_bytes is None:
+            return self.objects.get(id, None)
+        return self.get_objects([id])[id]
+
+    def get_objects(self, id_list: List[str]) -> Dict[str, Optional[str]]:
+        if self.max_memory_bytes is None:
+            return {id: self.objects.get(id) for id in id_list}
+
+        found = {}
+        with self._lock:
+            for id in id_list:
+                obj = self.objects.get(id)
+                if obj is not None:
+                    self.objects.move_to_end(id)
+                    found[id] = obj
+            self.stats.hits += len(found)
+            self.stats.misses += len(id_list) - len(found)
+            missing = [id for id in id_list if id not in found]
+            if missing and self._spill is not None:
+                # spilled objects are served from disk, without evicting hot ones
+                found.update(self._spill.get(missing))
+        return {id: found.get(id) for id in id_list}
 
     def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
-        return {id: (id in self.objects) for id in id_list}
+        found = {id: (id in self.objects) for id in id_list}
+        missing = [id for id, has in found.items() if not has]
+        if missing and self._spill is not None:
+            with self._lock:
+                found.update(dict.fromkeys(self._spill.get(missing), True))
+        return found
 
     def begin_write(self) -> None:
         self.saved_object_count = 0
@@ -43,3 +179,42 @@ class MemoryTransport(AbstractTransport):
         self, id: str, target_transport: AbstractTransport
     ) -> str:
         raise NotImplementedError
+
+    def spilled_ids(self) -> List[str]:
+        """The ids of the objects spilled to disk."""
+        with self._lock:
+            return self._spill.ids() if self._spill is not None else []
+
+    def close(self) -> None:
+        """Deletes the spilled objects."""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def __save_bounded(self, id: str, serialized_object: str) -> None:
+        with self._lock:
+            previous = self.objects.pop(id, None)
+            if previous is not None:
+                self.stats.size_bytes -= _utf8_size(previous)
+            self.objects[id] = serialized_object
+            self.stats.size_bytes += _utf8_size(serialized_object)
+            if self.stats.size_bytes > self.max_memory_bytes:
+                self.__spill(
+                    self.__coldest(self.max_memory_bytes * _SPILL_LOW_WATERMARK)
+                )
+
+    def __coldest(self, target_bytes: float) -> List[Tuple[str, str]]:
+        spilled = []
+        while self.objects and self.stats.size_bytes > target_bytes:
+            id, obj = self.objects.popitem(last=False)
+            self.stats.size_bytes -= _utf8_size(obj)
+            spilled.append((id, obj))
+        return spilled
+
+    def __spill(self, objects: List[Tuple[str, str]]) -> None:
+        if self._spill is None:
+            self._spill = _SpillStore(self.spill_dir)
+        self._spill.put(objects)
+        self.stats.evicted_objects += len(objects)
+        self.stats.evicted_bytes += sum(_utf8_size(obj) for _, obj in objects)
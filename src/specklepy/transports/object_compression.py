@@ -0,0 +1,121 @@
+"""
+zstd compression of serialized objects, with optional dictionaries trained on the
+objects themselves. Speckle objects are small and repetitive (the same keys and
+`speckle_type`s over and over), which is exactly where a shared dictionary helps.
+
+Requires the optional `zstandard` package (`specklepy[zstd]`).
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from specklepy.logging.exceptions import SpeckleException
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# the first byte of every compressed object identifies the format of what follows
+ZSTD_FORMAT_MARKER = b"\x01"
+
+_DICTIONARY_SIZE = 112 * 1024
+_DICTIONARY_SAMPLE_COUNT = 2000
+_DICTIONARY_SAMPLE_MAX_SIZE = 4 * 1024
+
+
+class UnknownDictionaryError(SpeckleException):
+    def __init__(self, dict_id: int) -> None:
+        super().__init__(f"Unknown zstd compression dictionary {dict_id}")
+        self.dict_id = dict_id
+
+
+class ZstdObjectCompressor:
+    """
+    Compresses serialized objects into `ZSTD_FORMAT_MARKER` prefixed zstd frames.
+
+    Dictionaries are identified by the id zstd embeds in every frame, so objects
+    compressed with any previously added dictionary can be decompressed.
+    Instances are safe to use from multiple threads.
+    """
+
+    def __init__(self, level: int = 3, train_dictionary: bool = True) -> None:
+        if zstandard is None:
+            raise SpeckleException(
+                "zstd compression requires the `zstandard` package, install it with"
+                " `pip install specklepy[zstd]`."
+            )
+        self.level = level
+        self._dictionaries: Dict[int, zstandard.ZstdCompressionDict] = {}
+        self._dictionary: Optional[zstandard.ZstdCompressionDict] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._samples: Optional[List[bytes]] = [] if train_dictionary else None
+
+    @property
+    def dictionary_id(self) -> Optional[int]:
+        """The id of the dictionary new objects are compressed with, if any"""
+        return self._dictionary.dict_id() if self._dictionary else None
+
+    @staticmethod
+    def is_compressed(content) -> bool:
+        return isinstance(content, bytes) and content[:1] == ZSTD_FORMAT_MARKER
+
+    def add_dictionary(self, data: bytes) -> int:
+        """Registers a dictionary, and compresses new objects with it."""
+        dictionary = zstandard.ZstdCompressionDict(data)
+        with self._lock:
+            self._dictionaries[dictionary.dict_id()] = dictionary
+            self._dictionary = dictionary
+            self._samples = None
+            self._local = threading.local()
+        return dictionary.dict_id()
+
+    def collect_sample(self, data: bytes) -> Optional[bytes]:
+        """
+        Collects an object to train a dictionary with.
+
+        Returns:
+            Optional[bytes] -- the data of a newly trained dictionary, once enough
+            samples have been collected. The caller should persist it and pass it
+            to `add_dictionary`.
+        """
+        with self._lock:
+            if self._samples is None:
+                return None
+            self._samples.append(data[:_DICTIONARY_SAMPLE_MAX_SIZE])
+            if len(self._samples) < _DICTIONARY_SAMPLE_COUNT:
+                return None
+            samples = self._samples
+            self._samples = None
+
+        try:
+            return zstandard.train_dictionary(_DICTIONARY_SIZE, samples).as_bytes()
+        except zstandard.ZstdError:
+            # too little (or too uniform) data to train on
+            return None
+
+    def compress(self, text: str) -> bytes:
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(
+                level=self.level, dict_data=self._dictionary, write_content_size=True
+            )
+            self._local.compressor = compressor
+        return ZSTD_FORMAT_MARKER + compressor.compress(text.encode())
+
+    def decompress(self, data: bytes) -> str:
+        frame = memoryview(data)[1:]
+        dict_id = zstandard.get_frame_parameters(frame).dict_id
+        decompressors = getattr(self._local, "decompressors", None)
+        if decompressors is None:
+            decompressors = self._local.decompressors = {}
+
+        decompressor = decompressors.get(dict_id)
+        if decompressor is None:
+            dictionary = self._dictionaries.get(dict_id) if dict_id else None
+            if dict_id and dictionary is None:
+                raise UnknownDictionaryError(dict_id)
+            decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+            decompressors[dict_id] = decompressor
+        return decompressor.decompress(frame).decode()
@@ -0,0 +1,418 @@
+"""
+A portable single-file format for a root object and its full closure, for moving
+versions between environments and caching test fixtures.
+
+Layout, all integers little endian:
+
+    header      `_HEADER`, see below
+    objects     one compressed frame per object, the children sorted by id
+                followed by the root object
+    dictionary  the zstd dictionary the frames were compressed with, if any
+    metadata    json, including the id of the root object
+    index       `object_count` fixed width records of (id, offset, length),
+                sorted by id for binary search
+
+Ids are stored as ascii, padded with null bytes to `id_width`.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.serialization.json_codec import get_json_codec
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.object_compression import ZstdObjectCompressor, zstandard
+from specklepy.transports.sqlite import SQLiteTransport
+
+PACK_MAGIC = b"SPCKPACK"
+PACK_VERSION = 1
+
+# magic, version, compression, id width, object count, and the offset and length
+# of the dictionary, metadata and index sections
+_HEADER = struct.Struct("<8sHBBQQQQQQQ")
+_INDEX_POSITION = struct.Struct("<QI")
+
+# the children are read and written in batches of this many objects, the first of
+# which also trains the zstd dictionary
+_EXPORT_BATCH_LENGTH = 2000
+
+_COMPRESSION_NONE = 0
+_COMPRESSION_ZSTD = 1
+_COMPRESSION_ZLIB = 2
+_COMPRESSIONS = {
+    None: _COMPRESSION_NONE,
+    "zstd": _COMPRESSION_ZSTD,
+    "zlib": _COMPRESSION_ZLIB,
+}
+
+
+def export_pack(
+    object_id: str,
+    source_transport: AbstractTransport,
+    path: str,
+    compression: Optional[str] = "zstd",
+    compression_level: int = 3,
+) -> int:
+    """
+    Writes an object and its full closure to a pack file.
+
+    Arguments:
+        object_id {str} -- the id of the root object
+        source_transport {AbstractTransport} -- the transport to read the objects
+            from. Transports that can't read single objects, like the
+            `ServerTransport`, are copied from with `copy_object_and_children`.
+        path {str} -- the pack file to write
+        compression {str} -- "zstd", "zlib" or None. zstd falls back to zlib if
+            the `zstandard` package isn't installed.
+        compression_level {int} -- the zstd or zlib compression level
+
+    Returns:
+        int -- the number of objects written
+    """
+    if compression not in _COMPRESSIONS:
+        raise SpeckleException(
+            f"Unknown pack compression {compression!r}, expected one of"
+            f" {list(_COMPRESSIONS)}"
+        )
+    if compression == "zstd" and zstandard is None:
+        compression = "zlib"
+        compression_level = min(compression_level, 9)
+
+    try:
+        with _closure_source(object_id, source_transport) as (root, transport):
+            return _write_pack(
+                path, object_id, root, transport, compression, compression_level
+            )
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+def _write_pack(
+    path: str,
+    object_id: str,
+    root: str,
+    transport: AbstractTransport,
+    compression: Optional[str],
+    compression_level: int,
+) -> int:
+    # only the index is kept in memory, the objects are streamed to the file
+    children = sorted(get_json_codec().loads(root).get("__closure", {}))
+    compress = None
+    dictionary = b""
+    positions: Dict[bytes, Tuple[int, int]] = {}
+    with open(path, "wb") as f:
+        f.write(bytes(_HEADER.size))
+        for i in range(0, len(children), _EXPORT_BATCH_LENGTH):
+            batch = children[i : i + _EXPORT_BATCH_LENGTH]
+            objects = transport.get_objects(batch)
+            missing = [id for id in batch if objects.get(id) is None]
+            if missing:
+                raise SpeckleException(
+                    f"Could not export {object_id}, {len(missing)} of its children"
+                    f" are missing from {transport}, including {missing[0]}"
+                )
+            if compress is None:
+                compress, dictionary = _create_compressor(
+                    compression, compression_level, list(objects.values())
+                )
+            for id in batch:
+                frame = compress(objects[id])
+                positions[id.encode("ascii")] = (f.tell(), len(frame))
+                f.write(frame)
+
+        if compress is None:
+            compress, dictionary = _create_compressor(
+                compression, compression_level, [root]
+            )
+        frame = compress(root)
+        positions[object_id.encode("ascii")] = (f.tell(), len(frame))
+        f.write(frame)
+
+        dictionary_offset = f.tell()
+        f.write(dictionary)
+
+        metadata = json.dumps({"root": object_id}).encode()
+        metadata_offset = f.tell()
+        f.write(metadata)
+
+        index_offset = f.tell()
+        id_width = max(len(id) for id in positions)
+        f.write(
+            b"".join(
+                id.ljust(id_width, b"\0") + _INDEX_POSITION.pack(*positions[id])
+                for id in sorted(positions)
+            )
+        )
+        index_length = f.tell() - index_offset
+
+        f.seek(0)
+        f.write(
+            _HEADER.pack(
+                PACK_MAGIC,
+                PACK_VERSION,
+                _COMPRESSIONS[compression],
+                id_width,
+                len(positions),
+                dictionary_offset,
+                len(dictionary),
+                metadata_offset,
+                len(metadata),
+                index_offset,
+                index_length,
+            )
+        )
+
+    return len(positions)
+
+
+def import_pack(path: str, target_transport: AbstractTransport) -> str:
+    """
+    Copies all the objects of a pack file into a transport.
+
+    Returns:
+        str -- the id of the root object of the pack
+    """
+    with PackTransport(path) as pack:
+        pack.copy_object_and_children(pack.root_id, target_transport)
+        return pack.root_id
+
+
+@contextmanager
+def _closure_source(
+    object_id: str, transport: AbstractTransport
+) -> Iterator[Tuple[str, AbstractTransport]]:
+    """
+    The root object, and a transport its children can be read from in batches.
+    Transports that can only copy closures are copied into a temporary db first.
+    """
+    try:
+        root = transport.get_object(object_id)
+    except (SpeckleException, NotImplementedError):
+        root = None
+    if root is not None:
+        yield root, transport
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        local = SQLiteTransport(base_path=directory, name="PackExport")
+        try:
+            try:
+                root = transport.copy_object_and_children(object_id, local)
+            except NotImplementedError as ex:
+                raise SpeckleException(
+                    f"Could not find object {object_id} in {transport}"
+                ) from ex
+            yield root, local
+        finally:
+            local.close()
+
+
+def _create_compressor(compression: Optional[str], level: int, objects: List[str]):
+    if compression == "zlib":
+        return lambda obj: zlib.compress(obj.encode(), level), b""
+    if compression is None:
+        return str.encode, b""
+
+    compressor = ZstdObjectCompressor(level)
+    for obj in objects:
+        dictionary = compressor.collect_sample(obj.encode())
+        if dictionary is not None:
+            compressor.add_dictionary(dictionary)
+            return compressor.compress, dictionary
+    return compressor.compress, b""
+
+
+class _Index:
+    """The sorted ids of a pack's index, as a sequence for `bisect`"""
+
+    def __init__(self, buffer: mmap.mmap, offset: int, count: int, id_width: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+        self._id_width = id_width
+        self.record_size = id_width + _INDEX_POSITION.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> bytes:
+        start = self._offset + i * self.record_size
+        return self._buffer[start : start + self._id_width].rstrip(b"\0")
+
+    def find(self, id: str) -> Optional[Tuple[int, int]]:
+        try:
+            key = id.encode("ascii")
+        except UnicodeEncodeError:
+            return None
+        i = bisect_left(self, key)
+        if i == self._count or self[i] != key:
+            return None
+        return self.position(i)
+
+    def position(self, i: int) -> Tuple[int, int]:
+        start = self._offset + i * self.record_size + self._id_width
+        return _INDEX_POSITION.unpack_from(self._buffer, start)
+
+    def __iter__(self) -> Iterator[Tuple[str, int, int]]:
+        for i in range(self._count):
+            yield (self[i].decode("ascii"), *self.position(i))
+
+
+class PackTransport(AbstractTransport):
+    """
+    A read only transport over a pack file written by `export_pack`.
+
+    The file is memory mapped, ids are looked up by binary search over the index,
+    and copying the root object copies its closure in the order it was exported
+    with a single sequential pass over the file.
+    """
+
+    def __init__(self, path: str, name: str = "Pack") -> None:
+        super().__init__()
+        self._name = name
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as ex:
+            raise SpeckleException(f"Could not open the pack file {path}") from ex
+
+        (
+            magic,
+            version,
+            compression,
+            id_width,
+            object_count,
+            dictionary_offset,
+            dictionary_length,
+            metadata_offset,
+            metadata_length,
+            index_offset,
+            _,
+        ) = _HEADER.unpack_from(self._buffer)
+        if magic != PACK_MAGIC:
+            self.close()
+            raise SpeckleException(f"{path} is not a Speckle pack file")
+        if version > PACK_VERSION:
+            self.close()
+            raise SpeckleException(
+                f"{path} is a version {version} pack, this version of specklepy"
+                f" only reads packs up to version {PACK_VERSION}"
+            )
+
+        self.metadata = json.loads(
+            self._buffer[metadata_offset : metadata_offset + metadata_length]
+        )
+        self.root_id: str = self.metadata["root"]
+        self._index = _Index(self._buffer, index_offset, object_count, id_width)
+        self._decompress = self.__create_decompressor(
+            compression,
+            self._buffer[dictionary_offset : dictionary_offset + dictionary_length],
+        )
+
+    def __repr__(self) -> str:
+        return f"PackTransport(path: '{self.path}', objects: {len(self._index)})"
+
+    def __enter__(self) -> "PackTransport":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def begin_write(self) -> None:
+        pass
+
+    def end_write(self) -> None:
+        pass
+
+    def save_object(self, id: str, serialized_object: str) -> None:
+        raise SpeckleException("Cannot save objects to a read only PackTransport")
+
+    def save_object_from_transport(
+        self, id: str, source_transport: AbstractTransport
+    ) -> None:
+        raise SpeckleException("Cannot save objects to a read only PackTransport")
+
+    def get_object(self, id: str) -> Optional[str]:
+        position = self._index.find(id)
+        return self.__read(*position) if position else None
+
+    def get_objects(self, id_list: List[str]) -> Dict[str, Optional[str]]:
+        positions = {id: self._index.find(id) for id in id_list}
+        # read in file order
+        found = {
+            id: self.__read(*position)
+            for id, position in sorted(
+                ((id, p) for id, p in positions.items() if p), key=lambda x: x[1]
+            )
+        }
+        return {id: found.get(id) for id in id_list}
+
+    def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
+        return {id: self._index.find(id) is not None for id in id_list}
+
+    def copy_object_and_children(
+        self, id: str, target_transport: AbstractTransport
+    ) -> str:
+        root = self.get_object(id)
+        if root is None:
+            raise SpeckleException(f"Could not find object {id} in {self}")
+
+        if id == self.root_id:
+            positions = sorted(
+                (offset, length, child_id)
+                for child_id, offset, length in self._index
+                if child_id != id
+            )
+        else:
+            children = get_json_codec().loads(root).get("__closure", {})
+            positions = []
+            for child_id in children:
+                position = self._index.find(child_id)
+                if position is None:
+                    raise SpeckleException(
+                        f"Could not find object {child_id} in {self}"
+                    )
+                positions.append((*position, child_id))
+            positions.sort()
+
+        target_transport.begin_write()
+        for offset, length, child_id in positions:
+            target_transport.save_object(child_id, self.__read(offset, length))
+        target_transport.save_object(id, root)
+        target_transport.end_write()
+
+        return root
+
+    def close(self) -> None:
+        if not self._buffer.closed:
+            self._buffer.close()
+
+    def __read(self, offset: int, length: int) -> str:
+        return self._decompress(self._buffer[offset : offset + length])
+
+    @staticmethod
+    def __create_decompressor(compression: int, dictionary: bytes):
+        if compression == _COMPRESSION_NONE:
+            return bytes.decode
+        if compression == _COMPRESSION_ZLIB:
+            return lambda data: zlib.decompress(data).decode()
+        if compression == _COMPRESSION_ZSTD:
+            decompressor = ZstdObjectCompressor(train_dictionary=False)
+            if dictionary:
+                decompressor.add_dictionary(dictionary)
+            return decompressor.decompress
+        raise SpeckleException(f"Unknown pack compression {compression}")
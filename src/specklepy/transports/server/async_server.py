@@ -0,0 +1,391 @@
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from specklepy.core.api.client import SpeckleClient
+from specklepy.core.api.credentials import Account
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.server.batch_sender import _multipart_body, compress_batch
+from specklepy.transports.server.server import resolve_account
+from specklepy.transports.server.upload_controller import (
+    THROTTLING_STATUSES,
+    retry_after_seconds,
+)
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HTTP2_AVAILABLE = False
+
+LOG = logging.getLogger(__name__)
+
+# statuses retried with a back off, like `setup_session` does for `requests`
+_RETRY_STATUSES = (500, 502, 503, 504, 520, 408, 429)
+_RETRY_ATTEMPTS = 4
+_RETRY_BACKOFF_SECONDS = 0.5
+_WRITE_BATCH_LENGTH = 1000
+
+
+def _parse_object_line(line: bytes) -> Tuple[str, str]:
+    """Splits an `id<tab>object` line of the getobjects endpoint"""
+    id, obj = line.rstrip(b"\r").split(b"\t", 1)
+    return id.decode(), obj.decode()
+
+
+class BlockingWriter(AbstractTransport):
+    """
+    Lets blocking code, like the serializer running in a worker thread, write to an
+    `AsyncServerTransport` running on an event loop. Objects are handed to the
+    loop in batches.
+    """
+
+    def __init__(
+        self, transport: "AsyncServerTransport", loop: asyncio.AbstractEventLoop
+    ) -> None:
+        super().__init__()
+        self.transport = transport
+        self._loop = loop
+        self._batch: List[Tuple[str, str]] = []
+
+    @property
+    def name(self) -> str:
+        return self.transport.name
+
+    def begin_write(self) -> None:
+        self.__run(self.transport.begin_write())
+
+    def end_write(self) -> None:
+        self.__flush()
+        self.__run(self.transport.end_write())
+
+    def save_object(self, id: str, serialized_object: str) -> None:
+        self._batch.append((id, serialized_object))
+        if len(self._batch) >= _WRITE_BATCH_LENGTH:
+            self.__flush()
+
+    def save_object_from_transport(
+        self, id: str, source_transport: AbstractTransport
+    ) -> None:
+        self.save_object(id, source_transport.get_object(id))
+
+    def get_object(self, id: str) -> Optional[str]:
+        return self.__run(self.transport.get_object(id))
+
+    def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
+        return self.__run(self.transport.has_objects(id_list))
+
+    def copy_object_and_children(
+        self, id: str, target_transport: AbstractTransport
+    ) -> str:
+        return self.__run(self.transport.copy_object_and_children(id, target_transport))
+
+    def __flush(self) -> None:
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self.__run(self.transport.save_objects(batch))
+
+    def __run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+
+class AsyncServerTransport:
+    """
+    An asyncio counterpart of the `ServerTransport`, built on `httpx.AsyncClient`.
+
+    Uploads, diffs and downloads run concurrently on one connection pool (over
+    HTTP/2 when the `h2` package is installed), so many sends and receives can
+    share a process without a thread per request. Use it with
+    `operations.send_async()` and `operations.receive_async()`, and `aclose()` it
+    when done. Reads can run concurrently, but a transport handles one send at a
+    time.
+
+    ```py
+    transport = AsyncServerTransport(stream_id=project_id, client=client)
+    obj_id = await operations.send_async(block, [transport])
+    received = await operations.receive_async(obj_id, transport)
+    await transport.aclose()
+    ```
+    """
+
+    def __init__(
+        self,
+        stream_id: str,
+        client: Optional[SpeckleClient] = None,
+        account: Optional[Account] = None,
+        token: Optional[str] = None,
+        url: Optional[str] = None,
+        name: str = "AsyncRemoteTransport",
+        max_connections: int = 16,
+        max_concurrent_uploads: int = 8,
+        max_concurrent_downloads: int = 8,
+        max_batch_size_mb: float = 1.0,
+        max_batch_length: int = 20000,
+        download_chunk_size: int = 5000,
+        compression_level: int = 6,
+        timeout_seconds: float = 120.0,
+    ) -> None:
+        self._name = name
+        self.account, self.url = resolve_account(client, account, token, url)
+        self.stream_id = stream_id
+        self.max_concurrent_uploads = max_concurrent_uploads
+        self.max_concurrent_downloads = max_concurrent_downloads
+        self.max_batch_size = int(max_batch_size_mb * 1000 * 1000)
+        self.max_batch_length = max_batch_length
+        self.download_chunk_size = download_chunk_size
+        self.compression_level = compression_level
+        self.saved_obj_count = 0
+
+        headers = {"Accept": "text/plain"}
+        if self.account is not None and self.account.token:
+            headers["Authorization"] = f"Bearer {self.account.token}"
+        self.http = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            headers=headers,
+            limits=httpx.Limits(max_connections=max_connections),
+            timeout=timeout_seconds,
+        )
+
+        self._batch: List[Tuple[str, str]] = []
+        self._batch_size = 0
+        self._uploads: Set[asyncio.Task[None]] = set()
+        self._upload_slots: Optional[asyncio.Semaphore] = None
+        self._exception: Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        return f"AsyncServerTransport(url: '{self.url}', stream: {self.stream_id})"
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    async def __aenter__(self) -> "AsyncServerTransport":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.aclose()
+
+    async def begin_write(self) -> None:
+        self.saved_obj_count = 0
+        self._upload_slots = asyncio.Semaphore(self.max_concurrent_uploads)
+
+    async def save_objects(self, objects: List[Tuple[str, str]]) -> None:
+        """Queues objects for upload, waiting while too many uploads are pending."""
+        if self._upload_slots is None:
+            await self.begin_write()
+        for id, obj in objects:
+            if self._batch and (
+                self._batch_size + len(obj) >= self.max_batch_size
+                or len(self._batch) >= self.max_batch_length
+            ):
+                await self.__start_upload()
+            self._batch.append((id, obj))
+            self._batch_size += len(obj)
+            self.saved_obj_count += 1
+
+    async def save_object(self, id: str, serialized_object: str) -> None:
+        await self.save_objects([(id, serialized_object)])
+
+    async def end_write(self) -> None:
+        """Waits for every upload, raising the first error of any of them."""
+        if self._batch:
+            await self.__start_upload()
+        if self._uploads:
+            await asyncio.wait(self._uploads)
+        if self._exception is not None:
+            ex, self._exception = self._exception, None
+            raise ex
+
+    async def get_object(self, id: str) -> Optional[str]:
+        r = await self.__request(
+            "GET", f"{self.url}/objects/{self.stream_id}/{id}/single"
+        )
+        if r.status_code == 404:
+            return None
+        self.__check(r, 200, f"Can't get object {self.stream_id}/{id}")
+        return r.text
+
+    async def get_objects(self, id_list: List[str]) -> Dict[str, Optional[str]]:
+        found: Dict[str, str] = {}
+
+        async def download(chunk: List[str]) -> None:
+            async for id, obj in self.__iter_objects(chunk):
+                found[id] = obj
+
+        await self.__download_chunks(id_list, download)
+        return {id: found.get(id) for id in id_list}
+
+    async def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
+        found: Dict[str, bool] = {}
+        chunks = [
+            id_list[i : i + self.download_chunk_size]
+            for i in range(0, len(id_list), self.download_chunk_size)
+        ]
+        for result in await asyncio.gather(*(self.__diff(c) for c in chunks)):
+            found.update(result)
+        return {id: bool(found.get(id)) for id in id_list}
+
+    async def copy_object_and_children(
+        self, id: str, target_transport: AbstractTransport
+    ) -> str:
+        """
+        Downloads an object and its missing children into a (blocking) transport.
+
+        Children are downloaded in concurrent chunks and written to the target in
+        batches from a worker thread. Like the `ServerTransport`, the root is only
+        saved once every child is, so interrupted copies resume.
+        """
+        root = await self.get_object(id)
+        if root is None:
+            raise SpeckleException(f"Can't get object {self.stream_id}/{id}")
+        children = list(json.loads(root).get("__closure", {}))
+        found = await asyncio.to_thread(target_transport.has_objects, children)
+        missing = [child for child in children if not found.get(child)]
+
+        write_lock = threading.Lock()
+
+        def save(batch: List[Tuple[str, str]]) -> None:
+            with write_lock:
+                for child_id, child in batch:
+                    target_transport.save_object(child_id, child)
+
+        async def download(chunk: List[str]) -> None:
+            batch = []
+            async for obj in self.__iter_objects(chunk):
+                batch.append(obj)
+                if len(batch) >= _WRITE_BATCH_LENGTH:
+                    await asyncio.to_thread(save, batch)
+                    batch = []
+            await asyncio.to_thread(save, batch)
+
+        await asyncio.to_thread(target_transport.begin_write)
+        try:
+            await self.__download_chunks(missing, download)
+            await asyncio.to_thread(save, [(id, root)])
+        finally:
+            await asyncio.to_thread(target_transport.end_write)
+        return root
+
+    async def __start_upload(self) -> None:
+        batch, self._batch, self._batch_size = self._batch, [], 0
+        # backpressure: wait for a slot before queueing more
+        await self._upload_slots.acquire()
+        task = asyncio.create_task(self.__upload(batch))
+        self._uploads.add(task)
+        task.add_done_callback(self._uploads.discard)
+
+    async def __upload(self, batch: List[Tuple[str, str]]) -> None:
+        try:
+            if self._exception is not None:
+                return
+            server_has_object = await self.__diff([id for id, _ in batch])
+            new_objects = [obj for id, obj in batch if not server_has_object.get(id)]
+            if not new_objects:
+                return
+
+            chunks, _ = await asyncio.to_thread(
+                compress_batch, new_objects, self.compression_level
+            )
+            boundary = uuid.uuid4().hex
+            r = await self.__request(
+                "POST",
+                f"{self.url}/objects/{self.stream_id}",
+                content=_multipart_body(boundary, chunks),
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+            )
+            self.__check(r, 201, "Could not save the objects to the server")
+        except Exception as ex:
+            self._exception = self._exception or ex
+            LOG.error("Error sending batch of objects to server: %s", ex)
+        finally:
+            self._upload_slots.release()
+
+    async def __diff(self, ids: List[str]) -> Dict[str, bool]:
+        if not ids:
+            return {}
+        r = await self.__request(
+            "POST",
+            f"{self.url}/api/diff/{self.stream_id}",
+            data={"objects": json.dumps(ids)},
+        )
+        if r.status_code == 403:
+            raise SpeckleException(
+                f"Invalid credentials - cannot send objects to server {self.url}"
+            )
+        self.__check(r, 200, f"Can't check objects in {self.stream_id}")
+        return r.json()
+
+    async def __download_chunks(self, ids: List[str], download) -> None:
+        slots = asyncio.Semaphore(self.max_concurrent_downloads)
+
+        async def limited(chunk: List[str]) -> None:
+            async with slots:
+                await download(chunk)
+
+        await asyncio.gather(
+            *(
+                limited(ids[i : i + self.download_chunk_size])
+                for i in range(0, len(ids), self.download_chunk_size)
+            )
+        )
+
+    async def __iter_objects(self, ids: List[str]):
+        async with self.http.stream(
+            "POST",
+            f"{self.url}/api/getobjects/{self.stream_id}",
+            data={"objects": json.dumps(ids)},
+        ) as r:
+            if r.status_code != 200:
+                await r.aread()
+                self.__check(r, 200, f"Can't get objects from {self.stream_id}")
+            # only split on newlines: httpx's aiter_lines also splits on characters
+            # JSON strings may hold raw, like \u2028 or \x0c
+            pending = bytearray()
+            async for chunk in r.aiter_bytes():
+                # only the new bytes are scanned, a large object spanning many
+                # chunks isn't searched again for every chunk
+                scanned = len(pending)
+                pending += chunk
+                start = 0
+                end = pending.find(b"\n", scanned)
+                while end != -1:
+                    if end > start:
+                        yield _parse_object_line(bytes(pending[start:end]))
+                    start = end + 1
+                    end = pending.find(b"\n", start)
+                del pending[:start]
+            if pending:
+                yield _parse_object_line(bytes(pending))
+
+    async def __request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        delay = _RETRY_BACKOFF_SECONDS
+        for _ in range(_RETRY_ATTEMPTS - 1):
+            try:
+                r = await self.http.request(method, url, **kwargs)
+            except httpx.TransportError as ex:
+                LOG.debug("Retrying %s %s after %s", method, url, ex)
+            else:
+                if r.status_code not in _RETRY_STATUSES:
+                    return r
+                if r.status_code in THROTTLING_STATUSES:
+                    delay = max(delay, retry_after_seconds(r) or 0)
+            await asyncio.sleep(delay)
+            delay *= 2
+        return await self.http.request(method, url, **kwargs)
+
+    @staticmethod
+    def __check(r: httpx.Response, status: int, message: str) -> None:
+        if r.status_code != status:
+            raise SpeckleException(
+                f"{message}: HTTP error {r.status_code} ({r.text[:1000]})"
+            )
@@ -1,16 +1,87 @@
-import gzip
 import json
 import logging
 import queue
+import random
 import threading
+import time
+import uuid
+import zlib
+from typing import List, Optional, Tuple, Union
 
 import requests
 
+from specklepy.logging import tracing
 from specklepy.logging.exceptions import SpeckleException
+from specklepy.logging.report import OperationReport, current_report
+from specklepy.transports.server.known_objects import KnownObjectsCache
 from specklepy.transports.server.retry_policy import setup_session
+from specklepy.transports.server.upload_controller import (
+    THROTTLING_STATUSES,
+    AdaptiveUploadController,
+    UploadSettings,
+    retry_after_seconds,
+    was_throttled,
+)
+from specklepy.transports.server.upload_journal import UploadJournal
 
 LOG = logging.getLogger(__name__)
 
+_MIN_ADAPTIVE_BATCH_SIZE_MB = 0.25
+# attempts of a request the server keeps throttling, on top of the session retries
+_THROTTLED_ATTEMPTS = 5
+# known ids diffed with every batch, to detect a stale known objects cache
+_KNOWN_OBJECT_CANARIES = 3
+# objects are fed to the compressor in chunks of about this size, big enough for
+# zlib to release the GIL for a meaningful time
+_COMPRESS_CHUNK_SIZE = 64 * 1024
+# gzip output of zlib
+_GZIP_WBITS = 31
+
+
+def compress_batch(
+    objects: List[Union[str, bytes]], level: int = 6
+) -> Tuple[List[bytes], int]:
+    """
+    Gzips the json array of the given serialized objects, without ever holding
+    more than a chunk of it uncompressed.
+
+    Returns:
+        Tuple[List[bytes], int] -- the compressed chunks, and the size of the
+        uncompressed json
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    compressed = []
+    pending = [b"["]
+    pending_size = 1
+    size = 0
+    for i, obj in enumerate(objects):
+        if i:
+            pending.append(b",")
+            pending_size += 1
+        data = obj.encode() if isinstance(obj, str) else obj
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= _COMPRESS_CHUNK_SIZE:
+            compressed.append(compressor.compress(b"".join(pending)))
+            size += pending_size
+            pending = []
+            pending_size = 0
+    pending.append(b"]")
+    size += pending_size + 1
+    compressed.append(compressor.compress(b"".join(pending)))
+    compressed.append(compressor.flush())
+    return [chunk for chunk in compressed if chunk], size
+
+
+def _multipart_body(boundary: str, chunks: List[bytes]) -> bytes:
+    """The multipart form `files={"batch-1": ...}` would build, straight from chunks"""
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="batch-1"; filename="batch-1"\r\n'
+        "Content-Type: application/gzip\r\n\r\n"
+    )
+    return b"".join([head.encode(), *chunks, f"\r\n--{boundary}--\r\n".encode()])
+
 
 class BatchSender:
     def __init__(
@@ -22,17 +93,55 @@ class BatchSender:
         max_batch_length=20000,
         batch_buffer_length=10,
         thread_count=4,
+        adaptive=True,
+        max_batch_size_ceiling_mb=8,
+        max_thread_count=16,
+        known_objects: Optional[KnownObjectsCache] = None,
+        compression_level=6,
+        journal: Optional[UploadJournal] = None,
+        transport_name="RemoteTransport",
     ):
+        """
+        With `adaptive` set, `max_batch_size_mb` and `thread_count` are only the
+        starting point: an `AdaptiveUploadController` tunes them from the measured
+        round trip times and throttling, up to `max_batch_size_ceiling_mb` and
+        `max_thread_count`. Sending threads are only added as the controller lets
+        more batches in flight.
+
+        Objects in the `known_objects` cache are not diffed with the server.
+        Uploads are gzipped at `compression_level`.
+        Objects acknowledged in the `journal` of an interrupted send are skipped,
+        and every batch the server acknowledges is recorded in it.
+        """
         self.server_url = server_url
         self.stream_id = stream_id
         self._token = token
+        self.known_objects = known_objects
+        self.compression_level = compression_level
+        self.journal = journal
+        self.transport_name = transport_name
+        self._report: Optional[OperationReport] = None
 
         self.max_size = int(max_batch_size_mb * 1000 * 1000)
         self.max_batch_length = int(max_batch_length)
-        self._batches = queue.Queue(batch_buffer_length)
         self._crt_batch = []
         self._crt_batch_size = 0
 
+        self.controller: Optional[AdaptiveUploadController] = None
+        if adaptive:
+            self.controller = AdaptiveUploadController(
+                initial_batch_size_bytes=self.max_size,
+                min_batch_size_bytes=min(
+                    self.max_size, int(_MIN_ADAPTIVE_BATCH_SIZE_MB * 1000 * 1000)
+                ),
+                max_batch_size_bytes=int(max_batch_size_ceiling_mb * 1000 * 1000),
+                initial_concurrency=thread_count,
+                max_concurrency=max_thread_count,
+            )
+        self._batches = queue.Queue(
+            max(batch_buffer_length, max_thread_count if adaptive else thread_count)
+        )
+
         self.thread_count = thread_count
         self._send_threads = []
         self._exception = None
@@ -41,10 +150,13 @@ class BatchSender:
         if not self._send_threads:
             self._create_threads()
 
+        max_size = (
+            self.controller.batch_size_bytes if self.controller else self.max_size
+        )
         crt_obj_size = len(obj)
         crt_batch_length = len(self._crt_batch)
         if not self._crt_batch or (
-            self._crt_batch_size + crt_obj_size < self.max_size
+            self._crt_batch_size + crt_obj_size < max_size
             and crt_batch_length < self.max_batch_length
         ):
             self._crt_batch.append((id, obj))
@@ -54,6 +166,8 @@ class BatchSender:
         self._batches.put(self._crt_batch)
         self._crt_batch = [(id, obj)]
         self._crt_batch_size = crt_obj_size
+        if self.controller and len(self._send_threads) < self.controller.concurrency:
+            self._start_thread()
 
     def flush(self):
         # Add current non-complete batch
@@ -65,6 +179,8 @@ class BatchSender:
         self._batches.join()
         # End the sending threads
         self._delete_threads()
+        if self.controller is not None:
+            LOG.info("Adaptive upload settings: %s", self.controller.settings())
         # If there was any error, throw the first exception that occurred during upload
         if self._exception is not None:
             ex = self._exception
@@ -84,7 +200,14 @@ class BatchSender:
                     break
 
                 try:
-                    self._bg_send_batch(session, batch)
+                    if self.controller is not None:
+                        self.controller.acquire()
+                        try:
+                            self._bg_send_batch(session, batch)
+                        finally:
+                            self.controller.release()
+                    else:
+                        self._bg_send_batch(session, batch)
                 except Exception as ex:
                     self._exception = self._exception or ex
                     LOG.error("Error sending batch of objects to server: " + str(ex))
@@ -95,17 +218,53 @@ class BatchSender:
             LOG.error("ServerTransport sending thread error: " + str(ex))
 
     def _bg_send_batch(self, session: requests.Session, batch):
+        if self.journal is not None:
+            acknowledged = self.journal.acknowledged([obj[0] for obj in batch])
+            batch = [obj for obj in batch if obj[0] not in acknowledged]
+            if not batch:
+                return
         object_ids = [obj[0] for obj in batch]
-        response = session.post(
-            url=f"{self.server_url}/api/diff/{self.stream_id}",
-            data={"objects": json.dumps(object_ids)},
+        known = (
+            self.known_objects.known(object_ids)
+            if self.known_objects is not None
+            else set()
         )
-        if response.status_code == 403:
-            raise SpeckleException(
-                f"Invalid credentials - cannot send objects to server {self.server_url}"
+        # a few known ids are diffed anyway, to check the cache is still valid
+        canaries = random.sample(sorted(known), min(len(known), _KNOWN_OBJECT_CANARIES))
+        diff_ids = [id for id in object_ids if id not in known] + canaries
+
+        start = time.perf_counter()
+        server_has_object = self._diff(session, diff_ids)
+        if self._report is not None:
+            self._report.record_diff(
+                self.transport_name,
+                len(diff_ids),
+                sum(1 for found in server_has_object.values() if found),
             )
-        response.raise_for_status()
-        server_has_object = response.json()
+        if (
+            self.controller is not None
+            and not known
+            # the small last batches would skew the fastest round trip time
+            and sum(len(obj[1]) for obj in batch) * 2
+            >= self.controller.batch_size_bytes
+        ):
+            self.controller.record_rtt(time.perf_counter() - start, len(diff_ids))
+
+        if not all(server_has_object.get(id) for id in canaries):
+            LOG.warning(
+                "The server is missing objects it was known to have, clearing the"
+                " known objects cache of %s",
+                self.stream_id,
+            )
+            self.known_objects.clear()
+            known = set()
+            server_has_object = self._diff(session, object_ids)
+
+        if self.known_objects is not None:
+            self.known_objects.add(
+                id for id in diff_ids if server_has_object.get(id) and id not in known
+            )
+        server_has_object.update(dict.fromkeys(known, True))
 
         new_object_ids = [x for x in object_ids if not server_has_object[x]]
         new_object_ids = set(new_object_ids)
@@ -116,26 +275,59 @@ class BatchSender:
                 f"Uploading batch of {len(batch)} objects: all objects are already in"
                 " the server"
             )
+            if self.journal is not None:
+                self.journal.record(object_ids)
             return
 
-        upload_data = "[" + ",".join(new_objects) + "]"
-        upload_data_gzip = gzip.compress(upload_data.encode())
+        upload_chunks, upload_size = compress_batch(new_objects, self.compression_level)
+        boundary = uuid.uuid4().hex
+        upload_body = _multipart_body(boundary, upload_chunks)
+        upload_data_size = sum(len(chunk) for chunk in upload_chunks)
+        del upload_chunks
         LOG.info(
             "Uploading batch of {batch_size} objects {new_object_count}: "
             + "(size: {upload_size}, compressed size: {upload_data_size})",
             {
                 "batch_size": len(batch),
                 "new_object_count": len(new_objects),
-                "upload_size": len(upload_data),
-                "upload_data_size": len(upload_data_gzip),
+                "upload_size": upload_size,
+                "upload_data_size": upload_data_size,
             },
         )
 
         try:
-            r = session.post(
-                url=f"{self.server_url}/objects/{self.stream_id}",
-                files={"batch-1": ("batch-1", upload_data_gzip, "application/gzip")},
-            )
+            start = time.perf_counter()
+            with tracing.span(
+                "speckle.upload",
+                objects=len(new_objects),
+                bytes=upload_size,
+                compressed_bytes=upload_data_size,
+            ) as span:
+                r = self._post(
+                    session,
+                    url=f"{self.server_url}/objects/{self.stream_id}",
+                    data=upload_body,
+                    headers={
+                        "Content-Type": f"multipart/form-data; boundary={boundary}"
+                    },
+                )
+                span.set_attribute("http.status_code", r.status_code)
+            tracing.record("speckle.upload.bytes", upload_data_size)
+            if self.controller is not None and r.status_code == 201:
+                self.controller.record_upload(
+                    upload_data_size, time.perf_counter() - start
+                )
+            if self._report is not None:
+                self._report.record_batch(
+                    self.transport_name,
+                    time.perf_counter() - start,
+                    upload_size,
+                    upload_data_size,
+                )
+            if r.status_code == 201 and self.known_objects is not None:
+                self.known_objects.add(new_object_ids)
+            if r.status_code == 201 and self.journal is not None:
+                self.journal.record(object_ids)
             if r.status_code != 201:
                 LOG.warning("Upload server response: %s", r.text)
                 raise SpeckleException(
@@ -152,11 +344,58 @@ class BatchSender:
                 error,
             )
 
+    def _diff(self, session: requests.Session, object_ids):
+        if not object_ids:
+            return {}
+        with tracing.span("speckle.upload.diff", objects=len(object_ids)):
+            response = self._post(
+                session,
+                url=f"{self.server_url}/api/diff/{self.stream_id}",
+                data={"objects": json.dumps(object_ids)},
+            )
+        if response.status_code == 403:
+            raise SpeckleException(
+                f"Invalid credentials - cannot send objects to server {self.server_url}"
+            )
+        response.raise_for_status()
+        return response.json()
+
+    def _post(self, session: requests.Session, **kwargs) -> requests.Response:
+        """Posts, backing off when the server throttles the upload"""
+        response = session.post(**kwargs)
+        if self.controller is None:
+            return response
+
+        for _ in range(_THROTTLED_ATTEMPTS):
+            if not was_throttled(response):
+                break
+            self.controller.record_throttled(retry_after_seconds(response))
+            if response.status_code not in THROTTLING_STATUSES:
+                # the session's own retries got through
+                break
+            # wait in line again, behind any Retry-After pause
+            self.controller.release()
+            self.controller.acquire()
+            response = session.post(**kwargs)
+        return response
+
+    def upload_settings(self) -> Optional[UploadSettings]:
+        """The settings the adaptive controller converged on, if enabled"""
+        return self.controller.settings() if self.controller else None
+
     def _create_threads(self):
-        for _ in range(self.thread_count):
-            t = threading.Thread(target=self._sending_thread_main, daemon=True)
-            t.start()
-            self._send_threads.append(t)
+        # threads live for a single send, the one being recorded if any
+        self._report = current_report()
+        initial = self.controller.concurrency if self.controller else self.thread_count
+        for _ in range(initial):
+            self._start_thread()
+
+    def _start_thread(self):
+        t = threading.Thread(
+            target=tracing.propagate(self._sending_thread_main), daemon=True
+        )
+        t.start()
+        self._send_threads.append(t)
 
     def _delete_threads(self):
         for _ in range(len(self._send_threads)):
@@ -0,0 +1,57 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestCoalescer(Generic[T]):
+    """
+    Merges concurrent single lookups into batched requests.
+
+    The first caller becomes the leader and fetches every id that is pending,
+    while the ids requested in the meantime pile up for its next batch. A single
+    caller is therefore never delayed, and concurrent callers share requests.
+    Concurrent lookups of the same id share a single result.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Dict[str, Optional[T]]],
+        max_batch_size: int = 1000,
+    ) -> None:
+        self._fetch = fetch
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future[Optional[T]]] = {}
+        self._leading = False
+
+    def get(self, id: str) -> Optional[T]:
+        with self._lock:
+            future = self._pending.get(id)
+            if future is None:
+                future = self._pending[id] = Future()
+            lead = not self._leading
+            self._leading = True
+
+        if lead:
+            self.__drain()
+        return future.result()
+
+    def __drain(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._leading = False
+                    return
+                ids = list(self._pending)[: self.max_batch_size]
+                futures = {id: self._pending.pop(id) for id in ids}
+
+            try:
+                results = self._fetch(ids)
+            except BaseException as ex:
+                for future in futures.values():
+                    future.set_exception(ex)
+                continue
+            for id, future in futures.items():
+                future.set_result(results.get(id))
@@ -0,0 +1,131 @@
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import closing
+from typing import Iterable, List, Optional, Set
+
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.transports.sqlite import SQLiteTransport
+
+LOG = logging.getLogger(__name__)
+
+_MAX_QUERY_PARAMS = 999
+
+
+class KnownObjectsCache:
+    """
+    A persistent set of the ids a server confirmed it has, per (server, project).
+
+    Sending objects the server is known to have can skip diffing them with the
+    server. The cache is only ever a hint: `BatchSender` keeps diffing a few known
+    ids of every batch as canaries, and clears the cache of the project if the
+    server reports any of them missing (eg. the project was recreated).
+
+    Being a hint, the ids of the project are simply cleared once there are more
+    than `max_ids` of them.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        project_id: str,
+        base_path: Optional[str] = None,
+        busy_timeout_seconds: float = 30.0,
+        max_ids: int = 1_000_000,
+    ) -> None:
+        self.max_ids = max_ids
+        base_path = base_path or SQLiteTransport.get_base_path("Speckle")
+        self._root_path = os.path.join(base_path, "KnownObjects.db")
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(base_path, exist_ok=True)
+            self._connection = sqlite3.connect(
+                self._root_path,
+                timeout=busy_timeout_seconds,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            # the connection is closed even if `close` isn't called
+            self._close = weakref.finalize(self, self._connection.close)
+            self._scope_id = self.__initialise(
+                server_url.rstrip("/").lower(), project_id
+            )
+            self._count = self.__count()
+        except sqlite3.Error as ex:
+            raise SpeckleException(
+                f"Could not open the known objects cache at {self._root_path}"
+            ) from ex
+
+    def __repr__(self) -> str:
+        return f"KnownObjectsCache(path: '{self._root_path}', scope: {self._scope_id})"
+
+    def known(self, ids: List[str]) -> Set[str]:
+        """Returns the given ids the server is known to have."""
+        found = set()
+        with self._lock, closing(self._connection.cursor()) as c:
+            for i in range(0, len(ids), _MAX_QUERY_PARAMS - 1):
+                chunk = ids[i : i + _MAX_QUERY_PARAMS - 1]
+                c.execute(
+                    "SELECT id FROM known_objects WHERE scope_id = ? AND id IN"
+                    f" ({','.join('?' * len(chunk))})",
+                    (self._scope_id, *chunk),
+                )
+                found.update(row[0] for row in c.fetchall())
+        return found
+
+    def add(self, ids: Iterable[str]) -> None:
+        rows = [(self._scope_id, id) for id in ids]
+        if not rows:
+            return
+        with self._lock, closing(self._connection.cursor()) as c:
+            c.execute("BEGIN")
+            c.executemany(
+                "INSERT OR IGNORE INTO known_objects(scope_id, id) VALUES(?, ?)", rows
+            )
+            self._count += max(c.rowcount, 0)
+            c.execute("COMMIT")
+        if self._count > self.max_ids:
+            LOG.info("Clearing the %s known objects of %s", self._count, self)
+            self.clear()
+
+    def clear(self) -> None:
+        """Forgets every id known for this server and project."""
+        with self._lock, closing(self._connection.cursor()) as c:
+            c.execute("DELETE FROM known_objects WHERE scope_id = ?", (self._scope_id,))
+            self._count = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def __count(self) -> int:
+        with closing(self._connection.cursor()) as c:
+            c.execute(
+                "SELECT COUNT(*) FROM known_objects WHERE scope_id = ?",
+                (self._scope_id,),
+            )
+            return c.fetchone()[0]
+
+    def __initialise(self, server_url: str, project_id: str) -> int:
+        with closing(self._connection.cursor()) as c:
+            c.execute("PRAGMA journal_mode=WAL;")
+            c.execute("PRAGMA synchronous=NORMAL;")
+            c.execute(
+                "CREATE TABLE IF NOT EXISTS scopes(scope_id INTEGER PRIMARY KEY,"
+                " server TEXT NOT NULL, project TEXT NOT NULL, UNIQUE(server, project))"
+            )
+            c.execute(
+                "CREATE TABLE IF NOT EXISTS known_objects(scope_id INTEGER NOT NULL,"
+                " id TEXT NOT NULL, PRIMARY KEY(scope_id, id)) WITHOUT ROWID"
+            )
+            c.execute(
+                "INSERT OR IGNORE INTO scopes(server, project) VALUES(?, ?)",
+                (server_url, project_id),
+            )
+            c.execute(
+                "SELECT scope_id FROM scopes WHERE server = ? AND project = ?",
+                (server_url, project_id),
+            )
+            return c.fetchone()[0]
@@ -1,14 +1,61 @@
 import json
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from warnings import warn
 
+import requests
+
 from specklepy.core.api.client import SpeckleClient
 from specklepy.core.api.credentials import Account, get_account_from_token
+from specklepy.logging import tracing
 from specklepy.logging.exceptions import SpeckleException, SpeckleWarning
+from specklepy.logging.report import OperationReport, current_report
+from specklepy.progress.receive_progress import (
+    ReceiveProgressTracker,
+    current_receive_progress,
+)
 from specklepy.transports.abstract_transport import AbstractTransport
 from specklepy.transports.server.retry_policy import setup_session
 
 from .batch_sender import BatchSender
+from .coalescer import RequestCoalescer
+from .known_objects import KnownObjectsCache
+from .upload_controller import UploadSettings
+from .upload_journal import UploadJournal
+
+_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+_DOWNLOAD_WRITE_BATCH = 1000
+
+
+def resolve_account(
+    client: Optional[SpeckleClient],
+    account: Optional[Account],
+    token: Optional[str],
+    url: Optional[str],
+) -> Tuple[Optional[Account], str]:
+    """The account and server url a server transport authenticates with"""
+    if client is None and account is None and token is None and url is None:
+        raise SpeckleException(
+            "You must provide either a client or a token and url to construct a"
+            " ServerTransport."
+        )
+
+    if account:
+        return account, account.serverInfo.url
+    if client:
+        if not client.account.token:
+            warn(
+                SpeckleWarning(
+                    "Unauthenticated Speckle Client provided to Server Transport"
+                    f" for {client.url}. Receiving from private streams will fail."
+                ),
+                stacklevel=3,
+            )
+            return None, client.url
+        return client.account, client.url
+    return get_account_from_token(token, url), url
 
 
 class ServerTransport(AbstractTransport):
@@ -49,6 +96,14 @@ class ServerTransport(AbstractTransport):
     )
     version = client.version.create(input)
     ```
+
+    Long sends can be made resumable with a `journal_path`: the ids the server
+    acknowledged are recorded there, and sending the same object again after a
+    failure skips them. The journal is reset once `end_write` succeeds.
+
+    With `cache_known_objects`, the ids the server confirmed it has are kept in a
+    KnownObjects.db next to the local cache, so later sends don't diff them with
+    the server again. `close` releases it.
     """
 
     def __init__(
@@ -59,41 +114,44 @@ class ServerTransport(AbstractTransport):
         token: Optional[str] = None,
         url: Optional[str] = None,
         name: str = "RemoteTransport",
+        download_threads: int = 4,
+        download_chunk_size: int = 5000,
+        cache_known_objects: bool = False,
+        journal_path: Optional[str] = None,
     ) -> None:
         super().__init__()
-        if client is None and account is None and token is None and url is None:
-            raise SpeckleException(
-                "You must provide either a client or a token and url to construct a"
-                " ServerTransport."
-            )
-
         self._name = name
-        self.account = None
         self.saved_obj_count = 0
-        if account:
-            self.account = account
-            url = account.serverInfo.url
-        elif client:
-            url = client.url
-            if not client.account.token:
-                warn(
-                    SpeckleWarning(
-                        "Unauthenticated Speckle Client provided to Server Transport"
-                        f" for {url}. Receiving from private streams will fail."
-                    ),
-                    stacklevel=2,
-                )
-            else:
-                self.account = client.account
-        else:
-            self.account = get_account_from_token(token, url)
+        self.account, url = resolve_account(client, account, token, url)
 
         self.stream_id = stream_id
         self.url = url
+        self.download_threads = download_threads
+        self.download_chunk_size = download_chunk_size
+        self._sessions = threading.local()
+        self._coalescer = RequestCoalescer(
+            self._fetch_coalesced, max_batch_size=download_chunk_size
+        )
 
+        self._known_objects: Optional[KnownObjectsCache] = (
+            self.__open_known_objects()
+            if cache_known_objects and self.account is not None
+            else None
+        )
+        self.journal = (
+            UploadJournal(journal_path, self.url, self.stream_id)
+            if journal_path
+            else None
+        )
         if self.account is not None:
             self._batch_sender = BatchSender(
-                self.url, self.stream_id, self.account.token, max_batch_size_mb=1
+                self.url,
+                self.stream_id,
+                self.account.token,
+                max_batch_size_mb=1,
+                known_objects=self._known_objects,
+                journal=self.journal,
+                transport_name=name,
             )
         self.session = setup_session(
             self.account.token if self.account is not None else None
@@ -103,11 +161,27 @@ class ServerTransport(AbstractTransport):
     def name(self) -> str:
         return self._name
 
+    @property
+    def upload_settings(self) -> Optional[UploadSettings]:
+        """The batch size and concurrency adaptive uploads converged on"""
+        batch_sender = getattr(self, "_batch_sender", None)
+        return batch_sender.upload_settings() if batch_sender else None
+
     def begin_write(self) -> None:
         self.saved_obj_count = 0
 
     def end_write(self) -> None:
+        # raises if any batch failed, keeping the journal for the next attempt
         self._batch_sender.flush()
+        if self.journal is not None:
+            self.journal.complete()
+
+    def close(self) -> None:
+        """Closes the known objects cache and the journal, if any"""
+        if self._known_objects is not None:
+            self._known_objects.close()
+        if self.journal is not None:
+            self.journal.close()
 
     def save_object(self, id: str, serialized_object: str) -> None:
         self._batch_sender.send_object(id, serialized_object)
@@ -118,30 +192,46 @@ class ServerTransport(AbstractTransport):
         obj_string = source_transport.get_object(id=id)
         self.save_object(id=id, serialized_object=obj_string)
 
-    def get_object(self, id: str) -> str:
-        # endpoint = f"{self.url}/objects/{self.stream_id}/{id}/single"
-        # r = self.session.get(endpoint, stream=True)
+    def get_object(self, id: str) -> Optional[str]:
+        # concurrent gets are merged into bulk requests
+        return self._coalescer.get(id)
 
-        # _, obj = next(r.iter_lines().decode("utf-8")).split("\t")
-
-        # return obj
-
-        raise SpeckleException(
-            "Getting a single object using `ServerTransport.get_object()` is not"
-            " implemented.",
-            NotImplementedError(),
-        )
+    def get_objects(self, id_list: List[str]) -> Dict[str, Optional[str]]:
+        found = {}
+        for i in range(0, len(id_list), self.download_chunk_size):
+            found.update(self._iter_objects(id_list[i : i + self.download_chunk_size]))
+        return {id: found.get(id) for id in id_list}
 
     def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
-        return {id: False for id in id_list}
+        endpoint = f"{self.url}/api/diff/{self.stream_id}"
+        found = {}
+        for i in range(0, len(id_list), self.download_chunk_size):
+            chunk = id_list[i : i + self.download_chunk_size]
+            r = self._get_session().post(endpoint, data={"objects": json.dumps(chunk)})
+            if r.status_code == 403:
+                raise SpeckleException(
+                    f"Invalid credentials - cannot check objects on server {self.url}"
+                )
+            if r.status_code != 200:
+                raise SpeckleException(
+                    f"Can't check objects in {self.stream_id}: HTTP error"
+                    f" {r.status_code} ({r.text[:1000]})"
+                )
+            found.update(r.json())
+        return {id: bool(found.get(id)) for id in id_list}
 
     def copy_object_and_children(
         self, id: str, target_transport: AbstractTransport
     ) -> str:
-        endpoint = f"{self.url}/objects/{self.stream_id}/{id}/single"
-        r = self.session.get(endpoint)
-        r.encoding = "utf-8"
+        with tracing.span(
+            "speckle.server_transport.copy", object_id=id, target=target_transport.name
+        ) as span:
+            return self.__copy_object_and_children(id, target_transport, span)
 
+    def __copy_object_and_children(
+        self, id: str, target_transport: AbstractTransport, span: tracing.Span
+    ) -> str:
+        r = self.__get_single(id)
         if r.status_code != 200:
             raise SpeckleException(
                 f"Can't get object {self.stream_id}/{id}: HTTP error"
@@ -151,29 +241,166 @@ class ServerTransport(AbstractTransport):
         root_obj = json.loads(root_obj_serialized)
         closures = root_obj.get("__closure", {})
 
-        # Check which children are not already in the target transport
+        # Check which children are not already in the target transport. Children
+        # saved by an interrupted copy are skipped, so copies resume where they
+        # stopped; the root is only saved once all of them are there.
         children_ids = list(closures.keys())
         children_found_map = target_transport.has_objects(children_ids)
         new_children_ids = [
             id for id in children_found_map if not children_found_map[id]
         ]
+        span.set_attribute("children", len(children_ids))
+        span.set_attribute("new_children", len(new_children_ids))
+        report = current_report()
+        if report is not None:
+            report.record_diff(
+                target_transport.name,
+                len(children_ids),
+                len(children_ids) - len(new_children_ids),
+            )
+        progress = current_receive_progress()
+        if progress is not None:
+            progress.start("download", len(new_children_ids))
+
+        # Get the new children in chunks, over several connections
+        chunks = [
+            new_children_ids[i : i + self.download_chunk_size]
+            for i in range(0, len(new_children_ids), self.download_chunk_size)
+        ]
+        write_lock = threading.Lock()
+        target_transport.begin_write()
+        try:
+            if len(chunks) > 1 and self.download_threads > 1:
+                with ThreadPoolExecutor(
+                    min(self.download_threads, len(chunks)),
+                    thread_name_prefix="ServerTransportDownload",
+                ) as executor:
+                    futures = [
+                        executor.submit(
+                            tracing.propagate(self._download_children),
+                            chunk,
+                            target_transport,
+                            write_lock,
+                            report,
+                            progress,
+                        )
+                        for chunk in chunks
+                    ]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except BaseException:
+                        for future in futures:
+                            future.cancel()
+                        raise
+            else:
+                for chunk in chunks:
+                    self._download_children(
+                        chunk, target_transport, write_lock, report, progress
+                    )
+
+            target_transport.save_object(id, root_obj_serialized)
+            if progress is not None:
+                progress.finish()
+        finally:
+            # commits whatever was downloaded, for the next copy to resume from
+            target_transport.end_write()
 
-        # Get the new children
+        return root_obj_serialized
+
+    def _download_children(
+        self,
+        ids: List[str],
+        target_transport: AbstractTransport,
+        write_lock: threading.Lock,
+        report: Optional[OperationReport] = None,
+        progress: Optional[ReceiveProgressTracker] = None,
+    ) -> None:
+        start = time.perf_counter()
+        size = batch_size = 0
+        # save the returned objects in batches as we go
+        batch = []
+        with tracing.span("speckle.download", objects=len(ids)) as span:
+            for obj in self._iter_objects(ids):
+                batch.append(obj)
+                batch_size += len(obj[1])
+                if len(batch) >= _DOWNLOAD_WRITE_BATCH:
+                    self.__save_downloaded(batch, target_transport, write_lock)
+                    if progress is not None:
+                        progress.advance(len(batch), batch_size)
+                    size += batch_size
+                    batch, batch_size = [], 0
+            self.__save_downloaded(batch, target_transport, write_lock)
+            if progress is not None and batch:
+                progress.advance(len(batch), batch_size)
+            size += batch_size
+            span.set_attribute("bytes", size)
+        tracing.record("speckle.download.bytes", size)
+        if report is not None:
+            report.record_batch(self.name, time.perf_counter() - start, size)
+
+    def _iter_objects(self, ids: List[str]) -> Iterator[Tuple[str, str]]:
+        """Streams the (id, object) pairs the server has of the given ids"""
         endpoint = f"{self.url}/api/getobjects/{self.stream_id}"
-        r = self.session.post(
-            endpoint, data={"objects": json.dumps(new_children_ids)}, stream=True
+        r = self._get_session().post(
+            endpoint, data={"objects": json.dumps(ids)}, stream=True
         )
-        r.encoding = "utf-8"
-        lines = r.iter_lines(decode_unicode=True)
+        if r.status_code != 200:
+            raise SpeckleException(
+                f"Can't get objects from {self.stream_id}: HTTP error"
+                f" {r.status_code} ({r.text[:1000]})"
+            )
 
-        # iter through returned objects saving them as we go
-        target_transport.begin_write()
-        for line in lines:
+        for line in r.iter_lines(chunk_size=_DOWNLOAD_CHUNK_BYTES):
             if line:
-                hash, obj = line.split("\t")
-                target_transport.save_object(hash, obj)
+                hash, obj = line.split(b"\t", 1)
+                yield hash.decode(), obj.decode()
 
-        target_transport.save_object(id, root_obj_serialized)
-        target_transport.end_write()
+    def _fetch_coalesced(self, ids: List[str]) -> Dict[str, Optional[str]]:
+        if len(ids) > 1:
+            return self.get_objects(ids)
 
-        return root_obj_serialized
+        r = self.__get_single(ids[0])
+        if r.status_code == 404:
+            return {}
+        if r.status_code != 200:
+            raise SpeckleException(
+                f"Can't get object {self.stream_id}/{ids[0]}: HTTP error"
+                f" {r.status_code} ({r.text[:1000]})"
+            )
+        return {ids[0]: r.text}
+
+    def _get_session(self):
+        """A session per thread, as `requests` sessions aren't thread safe"""
+        if threading.current_thread() is threading.main_thread():
+            return self.session
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            session = self._sessions.session = setup_session(
+                self.account.token if self.account is not None else None
+            )
+        return session
+
+    def __open_known_objects(self) -> Optional[KnownObjectsCache]:
+        try:
+            return KnownObjectsCache(self.url, self.stream_id)
+        except SpeckleException as ex:
+            # sending still works, just without skipping the known objects
+            warn(SpeckleWarning(str(ex)), stacklevel=3)
+            return None
+
+    def __get_single(self, id: str) -> requests.Response:
+        endpoint = f"{self.url}/objects/{self.stream_id}/{id}/single"
+        r = self._get_session().get(endpoint)
+        r.encoding = "utf-8"
+        return r
+
+    @staticmethod
+    def __save_downloaded(
+        batch: List[tuple],
+        target_transport: AbstractTransport,
+        write_lock: threading.Lock,
+    ) -> None:
+        with write_lock:
+            for hash, obj in batch:
+                target_transport.save_object(hash, obj)
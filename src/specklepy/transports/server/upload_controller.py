@@ -0,0 +1,168 @@
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+# statuses the server answers with when it is overloaded
+THROTTLING_STATUSES = (429, 503)
+
+
+@dataclass
+class UploadSettings:
+    """The upload settings an `AdaptiveUploadController` converged on."""
+
+    batch_size_bytes: int
+    concurrency: int
+    # per object diffed
+    min_rtt_seconds: Optional[float]
+    throughput_bytes_per_second: float
+    throttled_count: int
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parses the `Retry-After` header, in seconds or as an http date"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def was_throttled(response: requests.Response) -> bool:
+    """Whether the server throttled the request, including retried attempts"""
+    if response.status_code in THROTTLING_STATUSES:
+        return True
+    retries = getattr(response.raw, "retries", None)
+    history = getattr(retries, "history", None) or ()
+    return any(attempt.status in THROTTLING_STATUSES for attempt in history)
+
+
+class AdaptiveUploadController:
+    """
+    Tunes the size of upload batches and the number of batches in flight.
+
+    Batch sizes are scaled so each upload takes about `target_batch_seconds`,
+    amortising the round trip latency over more data on slow links. The number of
+    batches in flight grows additively while the round trip time stays close to
+    the fastest one seen, and shrinks when requests queue up (the round trip time
+    inflates) or the server throttles. Throttling halves it, and a `Retry-After`
+    pauses all uploads.
+
+    Round trip times are compared per object diffed, as the diffs grow with the
+    batches. The fastest one is forgotten whenever the batches shrink, since the
+    latency of a smaller diff is amortised over fewer objects.
+    """
+
+    def __init__(
+        self,
+        initial_batch_size_bytes: int,
+        min_batch_size_bytes: int,
+        max_batch_size_bytes: int,
+        initial_concurrency: int,
+        max_concurrency: int,
+        target_batch_seconds: float = 2.0,
+        rtt_inflation_threshold: float = 2.0,
+    ) -> None:
+        self.min_batch_size_bytes = min_batch_size_bytes
+        self.max_batch_size_bytes = max(max_batch_size_bytes, min_batch_size_bytes)
+        self.max_concurrency = max(1, max_concurrency)
+        self.target_batch_seconds = target_batch_seconds
+        self.rtt_inflation_threshold = rtt_inflation_threshold
+
+        self.batch_size_bytes = self.__clamp_batch_size(initial_batch_size_bytes)
+        self.concurrency = min(max(1, initial_concurrency), self.max_concurrency)
+        self.min_rtt: Optional[float] = None
+        self.throttled_count = 0
+
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._uploaded_bytes = 0
+        self._first_upload_start: Optional[float] = None
+        self._last_upload_end = 0.0
+
+    def acquire(self) -> None:
+        """Waits for a free upload slot, and for any `Retry-After` pause to pass."""
+        with self._condition:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._condition.wait(pause)
+                elif self._in_flight >= self.concurrency:
+                    self._condition.wait()
+                else:
+                    self._in_flight += 1
+                    return
+
+    def release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def record_rtt(self, seconds: float, object_count: int = 1) -> None:
+        """Records the round trip time of a small request, like a diff."""
+        rtt = seconds / max(1, object_count)
+        with self._condition:
+            if self.min_rtt is None or rtt < self.min_rtt:
+                self.min_rtt = rtt
+            if rtt > self.min_rtt * self.rtt_inflation_threshold:
+                # requests are queueing up somewhere between here and the server
+                self.concurrency = max(1, self.concurrency - 1)
+            else:
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+            self._condition.notify_all()
+
+    def record_upload(self, size_bytes: int, seconds: float) -> None:
+        with self._condition:
+            now = time.monotonic()
+            if self._first_upload_start is None:
+                self._first_upload_start = now - seconds
+            self._last_upload_end = now
+            self._uploaded_bytes += size_bytes
+            if seconds > 0:
+                scale = min(2.0, max(0.5, self.target_batch_seconds / seconds))
+                batch_size_bytes = self.__clamp_batch_size(
+                    self.batch_size_bytes * scale
+                )
+                if batch_size_bytes < self.batch_size_bytes:
+                    self.min_rtt = None
+                self.batch_size_bytes = batch_size_bytes
+
+    def record_throttled(self, retry_after: Optional[float] = None) -> None:
+        with self._condition:
+            self.throttled_count += 1
+            self.concurrency = max(1, self.concurrency // 2)
+            if retry_after:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + retry_after
+                )
+            self._condition.notify_all()
+
+    def settings(self) -> UploadSettings:
+        with self._condition:
+            elapsed = (
+                self._last_upload_end - self._first_upload_start
+                if self._first_upload_start is not None
+                else 0.0
+            )
+            return UploadSettings(
+                batch_size_bytes=self.batch_size_bytes,
+                concurrency=self.concurrency,
+                min_rtt_seconds=self.min_rtt,
+                throughput_bytes_per_second=(
+                    self._uploaded_bytes / elapsed if elapsed > 0 else 0.0
+                ),
+                throttled_count=self.throttled_count,
+            )
+
+    def __clamp_batch_size(self, size: float) -> int:
+        return int(min(self.max_batch_size_bytes, max(self.min_batch_size_bytes, size)))
@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+from typing import Iterable, List, Set
+
+from specklepy.logging.exceptions import SpeckleException
+
+
+class UploadJournal:
+    """
+    An append-only file of the object ids a server acknowledged during a send.
+
+    Every batch the server confirmed (or already had) is appended as one line, and
+    synced to disk before the next one is recorded. If the send dies half way,
+    sending again with the same journal skips every acknowledged object, without
+    diffing or uploading it. Once a send completes the journal is reset, so it
+    only ever covers a single interrupted send.
+
+    A line cut short by a crash is ignored, those objects are just sent again.
+    """
+
+    def __init__(self, path: str, server_url: str, project_id: str) -> None:
+        self.path = path
+        self._header = {"server": server_url.rstrip("/").lower(), "project": project_id}
+        self._lock = threading.Lock()
+        self._acknowledged: Set[str] = set()
+        try:
+            if os.path.isfile(path):
+                self.__load()
+            else:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(json.dumps(self._header) + "\n")
+            self._file = open(path, "a", encoding="utf-8")  # noqa: SIM115
+        except OSError as ex:
+            raise SpeckleException(
+                f"Could not open the upload journal at {path}", ex
+            ) from ex
+
+    def __repr__(self) -> str:
+        return (
+            f"UploadJournal(path: '{self.path}', acknowledged:"
+            f" {len(self._acknowledged)})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._acknowledged)
+
+    def acknowledged(self, ids: List[str]) -> Set[str]:
+        """Returns the given ids the server acknowledged in a previous attempt."""
+        with self._lock:
+            return self._acknowledged.intersection(ids)
+
+    def record(self, ids: Iterable[str]) -> None:
+        """Durably records a batch of ids the server acknowledged."""
+        with self._lock:
+            ids = [id for id in ids if id not in self._acknowledged]
+            if not ids:
+                return
+            self._file.write(" ".join(ids) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._acknowledged.update(ids)
+
+    def complete(self) -> None:
+        """The send finished, a following send starts from scratch."""
+        with self._lock:
+            self._acknowledged.clear()
+            self._file.close()
+            self._file = open(self.path, "w", encoding="utf-8")  # noqa: SIM115
+            self._file.write(json.dumps(self._header) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            header = None
+        if header != self._header:
+            raise SpeckleException(
+                f"The upload journal at {self.path} belongs to another server or"
+                f" project: {lines[0][:200]}"
+            )
+        # the last element is whatever followed the last newline: complete lines
+        # only, a partial line was never synced as a whole
+        for line in lines[1:-1]:
+            self._acknowledged.update(line.split())
@@ -1,14 +1,160 @@
+import logging
 import os
+import queue
 import sqlite3
+import threading
+import time
+import weakref
 from contextlib import closing
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
 from specklepy.core.helpers import speckle_path_provider
 from specklepy.logging.exceptions import SpeckleException
+from specklepy.logging.report import OperationReport, current_report
 from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.object_compression import (
+    UnknownDictionaryError,
+    ZstdObjectCompressor,
+)
+
+LOG = logging.getLogger(__name__)
+
+# statements are kept as constants so sqlite3's per connection statement cache
+# always hits and they only get prepared once
+_INSERT_UNTRACKED_OBJECTS = "INSERT OR IGNORE INTO objects(hash, content) VALUES(?,?)"
+_INSERT_OBJECTS = (
+    "INSERT OR IGNORE INTO objects(hash, content, size, last_access) VALUES(?,?,?,?)"
+)
+# with a cache budget, saving an object that is already cached counts as an access
+_UPSERT_OBJECTS = (
+    "INSERT INTO objects(hash, content, size, last_access) VALUES(?,?,?,?)"
+    " ON CONFLICT(hash) DO UPDATE SET"
+    " last_access = MAX(objects.last_access, excluded.last_access)"
+)
+_TOUCH_OBJECTS = "UPDATE objects SET last_access = ? WHERE hash = ? AND last_access < ?"
+_SELECT_OBJECT = "SELECT content FROM objects WHERE hash = ? LIMIT 1"
+_SELECT_CACHE_SIZE = "SELECT bytes FROM cache_size"
+
+# the size of an object, for the rows written without one by older versions
+_ROW_SIZE = "COALESCE({row}.size, length(CAST({row}.content AS BLOB)))"
+# size tracking is only set up once a cache budget is used with the db. From then
+# on, the total size of the objects is kept up to date by triggers, for every
+# writer of the db, so that enforcing the budget doesn't scan the whole table
+_SIZE_TRACKING_SCHEMA = (
+    "CREATE INDEX IF NOT EXISTS objects_last_access ON objects(last_access, size)",
+    "CREATE TABLE cache_size(bytes INTEGER NOT NULL)",
+    "INSERT INTO cache_size SELECT COALESCE(SUM(size), 0) FROM objects",
+    "CREATE TRIGGER objects_size_insert AFTER INSERT ON objects BEGIN"
+    f" UPDATE cache_size SET bytes = bytes + {_ROW_SIZE.format(row='NEW')}; END",
+    "CREATE TRIGGER objects_size_delete AFTER DELETE ON objects BEGIN"
+    f" UPDATE cache_size SET bytes = bytes - {_ROW_SIZE.format(row='OLD')}; END",
+    "CREATE TRIGGER objects_size_update AFTER UPDATE OF content, size ON objects"
+    " BEGIN UPDATE cache_size SET bytes = bytes"
+    f" + {_ROW_SIZE.format(row='NEW')} - {_ROW_SIZE.format(row='OLD')}; END",
+)
+
+# the lowest `SQLITE_MAX_VARIABLE_NUMBER` of the sqlite versions python ships with
+_MAX_QUERY_PARAMS = 999
+
+# on top of sqlite's busy timeout, writes that still find the db locked (eg. by a
+# long running writer in another process) are retried with a linear back off
+_WRITE_ATTEMPTS = 5
+_WRITE_RETRY_DELAY_SECONDS = 0.5
+
+# access times of read objects are buffered and written in batches of this size
+_TOUCH_FLUSH_SIZE = 10000
+# once over budget, objects are evicted until the cache is down to this fraction of
+# the budget, so that eviction doesn't have to run on every write
+_EVICTION_LOW_WATERMARK = 0.9
+# the max number of free pages released by a single maintenance run
+_INCREMENTAL_VACUUM_PAGES = 10000
+# the max number of uncompressed objects waiting to be compressed in place
+_RECOMPRESS_QUEUE_LENGTH = 10000
+
+
+@dataclass
+class CacheStats:
+    """Counters of a transport used as a size bounded cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evicted_objects: int = 0
+    evicted_bytes: int = 0
+    # the size of all the cached objects, as of the last maintenance run
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _ThreadConnection:
+    """
+    The connection of a thread, only referenced by the thread's local storage, so
+    it is closed once the thread ends.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.close = weakref.finalize(self, connection.close)
+
+
+def _maintenance_thread_main(
+    transport_ref: "weakref.ref[SQLiteTransport]",
+    stop: threading.Event,
+    interval: float,
+) -> None:
+    # only holds a weak reference, so the thread doesn't keep the transport alive
+    while not stop.wait(interval):
+        transport = transport_ref()
+        if transport is None:
+            return
+        try:
+            transport.run_maintenance()
+        except Exception as ex:
+            LOG.warning("SQLiteTransport cache maintenance failed: %s", ex)
+        del transport
+
+
+def _select_objects_query(columns: str, id_count: int) -> str:
+    placeholders = ",".join("?" * id_count)
+    return f"SELECT {columns} FROM objects WHERE hash IN ({placeholders})"
 
 
 class SQLiteTransport(AbstractTransport):
+    """
+    A transport to a local SQLite database, used by default as the local object cache.
+
+    With `background_writer=True`, batches are committed by a dedicated writer
+    thread fed through a bounded queue, so `save_object` only blocks when
+    `write_queue_length` batches are already waiting to be written.
+    Any error raised while writing is re-raised from `end_write`.
+
+    The transport can be shared between threads: every thread reads through its own
+    connection, and batches are written in `BEGIN IMMEDIATE` transactions that wait
+    up to `busy_timeout_seconds` for other writers, including other processes
+    using the same db file.
+
+    With `max_cache_size_mb`, the transport behaves as a size bounded cache: the
+    size and last access time of every object is tracked from then on (dbs never
+    used with a budget don't pay for it), and a background thread
+    evicts the least recently used objects whenever the db grows over budget, then
+    returns the freed pages to the file system. Objects are evicted in whole groups
+    of equal access time, and every object written between `begin_write` and
+    `end_write` shares the same access time, so a version is never partially
+    evicted before anything accessed after it.
+
+    With `compression="zstd"` (requires `specklepy[zstd]`), objects are stored as
+    zstd compressed blobs, using a dictionary trained on the first objects written
+    to the db. Objects are compressed by the thread writing the batch (the
+    background writer if enabled), and uncompressed objects of existing dbs are
+    compressed in place by the maintenance thread as they are read. Compressed
+    objects can be read without enabling compression, but not by older versions
+    of specklepy.
+    """
+
     def __init__(
         self,
         base_path: Optional[str] = None,
@@ -16,6 +162,15 @@ class SQLiteTransport(AbstractTransport):
         scope: Optional[str] = None,
         max_batch_size_mb: float = 10.0,
         name: str = "SQLite",
+        background_writer: bool = False,
+        write_queue_length: int = 4,
+        cache_size_mb: int = 64,
+        mmap_size_mb: int = 256,
+        busy_timeout_seconds: float = 30.0,
+        max_cache_size_mb: Optional[float] = None,
+        maintenance_interval_seconds: float = 60.0,
+        compression: Optional[str] = None,
+        compression_level: int = 3,
     ) -> None:
         super().__init__()
         self._name = name
@@ -24,8 +179,48 @@ class SQLiteTransport(AbstractTransport):
         self._base_path = base_path or self.get_base_path(self.app_name)
         self.max_size = int(max_batch_size_mb * 1000 * 1000)
         self.saved_obj_count = 0
-        self._current_batch: List[Tuple[str, str]] = []
+        self._current_batch: List[Tuple[str, str, int, float]] = []
         self._current_batch_size = 0
+        self._batch_lock = threading.Lock()
+
+        self.max_cache_size = (
+            int(max_cache_size_mb * 1000 * 1000) if max_cache_size_mb else None
+        )
+        self.stats = CacheStats()
+        self._write_stamp = time.time()
+        self._touched: List[Tuple[float, str, float]] = []
+        self._touched_lock = threading.Lock()
+        self._maintenance_stop = threading.Event()
+        self._maintenance_thread: Optional[threading.Thread] = None
+
+        if compression not in (None, "zstd"):
+            raise SpeckleException(
+                f"Unsupported SQLiteTransport compression '{compression}',"
+                " expected 'zstd' or None."
+            )
+        self._compressor = (
+            ZstdObjectCompressor(compression_level) if compression else None
+        )
+        self._decompressor: Optional[ZstdObjectCompressor] = None
+        self._recompress: Dict[str, str] = {}
+        self._recompress_lock = threading.Lock()
+
+        self._cache_size_kb = int(cache_size_mb * 1024)
+        self._mmap_size = int(mmap_size_mb * 1024 * 1024)
+        self._busy_timeout = busy_timeout_seconds
+        self._local = threading.local()
+        self._connections: weakref.WeakSet[_ThreadConnection] = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+
+        self.background_writer = background_writer
+        self._write_queue: queue.Queue[Optional[List[Tuple[str, str, int, float]]]] = (
+            queue.Queue(write_queue_length)
+        )
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._writer_exception: Optional[Exception] = None
+        # only set while a write is recorded into an `OperationReport`
+        self._report: Optional[OperationReport] = None
 
         try:
             os.makedirs(self._base_path, exist_ok=True)
@@ -41,6 +236,18 @@ class SQLiteTransport(AbstractTransport):
                 " alternative transport.",
             ) from ex
 
+        if self.max_cache_size is not None or self._compressor:
+            self._maintenance_thread = threading.Thread(
+                target=_maintenance_thread_main,
+                args=(
+                    weakref.ref(self),
+                    self._maintenance_stop,
+                    maintenance_interval_seconds,
+                ),
+                daemon=True,
+            )
+            self._maintenance_thread.start()
+
     def __repr__(self) -> str:
         return f"SQLiteTransport(app: '{self.app_name}', scope: '{self.scope}')"
 
@@ -78,28 +285,42 @@ class SQLiteTransport(AbstractTransport):
             serialized_object {str} -- the full string representation of the object
         """
         obj_size = len(serialized_object)
-        if (
-            not self._current_batch
-            or self._current_batch_size + obj_size < self.max_size
-        ):
-            self._current_batch.append((id, serialized_object))
-            self._current_batch_size += obj_size
-            return
+        row = (id, serialized_object, obj_size, self._write_stamp)
+        with self._batch_lock:
+            if (
+                not self._current_batch
+                or self._current_batch_size + obj_size < self.max_size
+            ):
+                self._current_batch.append(row)
+                self._current_batch_size += obj_size
+                return
 
-        self.save_current_batch()
-        self._current_batch = [(id, serialized_object)]
-        self._current_batch_size = obj_size
+            full_batch = self._current_batch
+            self._current_batch = [row]
+            self._current_batch_size = obj_size
+
+        self.__save_batch(full_batch)
 
     def save_current_batch(self) -> None:
-        """Save the current batch of objects to the local db"""
-        self.__check_connection()
+        """
+        Save the current batch of objects to the local db,
+        or hand it over to the writer thread when using a background writer
+        """
+        with self._batch_lock:
+            batch = self._current_batch
+            self._current_batch = []
+            self._current_batch_size = 0
+
+        if batch:
+            self.__save_batch(batch)
+
+    def __save_batch(self, batch: List[Tuple[str, str, int, float]]) -> None:
+        if self.background_writer:
+            self.__enqueue_batch(batch)
+            return
+
         try:
-            with closing(self.__connection.cursor()) as c:
-                c.executemany(
-                    "INSERT OR IGNORE INTO objects(hash, content) VALUES(?,?)",
-                    self._current_batch,
-                )
-                self.__connection.commit()
+            self.__write_batch(self.__get_connection(), batch)
         except Exception as ex:
             raise SpeckleException(
                 "Could not save the batch of objects to the local db. Inner exception:"
@@ -107,33 +328,46 @@ class SQLiteTransport(AbstractTransport):
             ) from ex
 
     def get_object(self, id: str) -> str | None:
-        self.__check_connection()
-        with closing(self.__connection.cursor()) as c:
-            row = c.execute(
-                "SELECT * FROM objects WHERE hash = ? LIMIT 1", (id,)
-            ).fetchone()
-        return row[1] if row else None
+        with closing(self.__get_connection().cursor()) as c:
+            row = c.execute(_SELECT_OBJECT, (id,)).fetchone()
+        if not row:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        self.__touch([id])
+        return self.__decode(id, row[0])
+
+    def get_objects(self, id_list: List[str]) -> Dict[str, Optional[str]]:
+        found = {
+            id: self.__decode(id, content)
+            for id, content in self.__select_many("hash, content", id_list)
+        }
+        self.stats.hits += len(found)
+        self.stats.misses += len(id_list) - len(found)
+        self.__touch(found)
+        return {id: found.get(id) for id in id_list}
 
     def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
-        ret = {}
-        self.__check_connection()
-        with closing(self.__connection.cursor()) as c:
-            for id in id_list:
-                row = c.execute(
-                    "SELECT 1 FROM objects WHERE hash = ? LIMIT 1", (id,)
-                ).fetchone()
-                ret[id] = bool(row)
-        return ret
+        found = {row[0] for row in self.__select_many("hash", id_list)}
+        self.__touch(found)
+        return {id: id in found for id in id_list}
 
     def begin_write(self):
         self._object_cache = []
         self.saved_obj_count = 0
+        self._write_stamp = time.time()
+        self._report = current_report()
 
     def end_write(self):
-        if self._current_batch:
-            self.save_current_batch()
-        self._current_batch = []
-        self._current_batch_size = 0
+        self.save_current_batch()
+
+        # the writer thread only lives for the duration of a write
+        try:
+            self.__stop_writer()
+            self.__raise_writer_exception()
+        finally:
+            self._report = None
 
     def copy_object_and_children(
         self, id: str, target_transport: AbstractTransport
@@ -145,20 +379,60 @@ class SQLiteTransport(AbstractTransport):
         Returns all the objects in the store.
         NOTE: do not use for large collections!
         """
-        self.__check_connection()
-        with closing(self.__connection.cursor()) as c:
-            rows = c.execute("SELECT * FROM objects").fetchall()
-        return rows
+        with closing(self.__get_connection().cursor()) as c:
+            rows = c.execute("SELECT hash, content FROM objects").fetchall()
+        return [(id, self.__decode(id, content)) for id, content in rows]
+
+    def run_maintenance(self) -> None:
+        """
+        Persists the buffered access times, compresses objects read uncompressed,
+        evicts the least recently used objects if the cache is over budget, and
+        releases free pages back to the file system. This runs periodically in the
+        background when `max_cache_size_mb` or `compression` is set.
+        """
+        self.__flush_touches()
+        self.__flush_recompression()
+        if self.max_cache_size is not None:
+            self.__enforce_budget()
+
+        # unlike `execute`, `executescript` steps the pragma until every page is freed
+        connection = self.__get_connection()
+        connection.executescript(
+            f"PRAGMA incremental_vacuum({_INCREMENTAL_VACUUM_PAGES});"
+            "PRAGMA wal_checkpoint(PASSIVE);"
+        )
+
+    def vacuum(self) -> None:
+        """
+        Rebuilds the whole db file, converting dbs created by older versions of
+        specklepy to incremental vacuuming. This blocks all other writers,
+        prefer `run_maintenance` for routine compaction.
+        """
+        self.__flush_touches()
+        connection = self.__get_connection()
+        connection.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+        connection.execute("VACUUM;")
 
     def close(self):
         """Close the connection to the database"""
-        if self.__connection:
-            self.__connection.close()
-            self.__connection = None
+        self._maintenance_stop.set()
+        maintenance_thread = self._maintenance_thread
+        if maintenance_thread and maintenance_thread is not threading.current_thread():
+            maintenance_thread.join()
+        self.__flush_touches()
+        self.__stop_writer()
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections = weakref.WeakSet()
+            self._local = threading.local()
+        for connection in connections:
+            connection.close()
 
     def __initialise(self) -> None:
-        self.__connection = sqlite3.connect(self._root_path)
-        with closing(self.__connection.cursor()) as c:
+        connection = self.__get_connection()
+        with closing(connection.cursor()) as c:
+            # only takes effect on a new db, see `vacuum` for existing ones
+            c.execute("PRAGMA auto_vacuum=INCREMENTAL;")
             c.execute(
                 """ CREATE TABLE IF NOT EXISTS objects(
                       hash TEXT PRIMARY KEY,
@@ -166,13 +440,327 @@ class SQLiteTransport(AbstractTransport):
                     ) WITHOUT ROWID;"""
             )
             c.execute("PRAGMA journal_mode='wal';")
+            c.execute(
+                """ CREATE TABLE IF NOT EXISTS compression_dictionaries(
+                      dict_id INTEGER PRIMARY KEY,
+                      data BLOB NOT NULL,
+                      created REAL NOT NULL
+                    );"""
+            )
+
+        self._tracks_size = self.__has_size_tracking(connection)
+        if self.max_cache_size is not None and not self._tracks_size:
+            self.__add_size_tracking(connection)
+            self._tracks_size = True
+
+        if self._compressor:
+            self.__load_dictionaries(self._compressor)
+
+    @staticmethod
+    def __has_size_tracking(connection: sqlite3.Connection) -> bool:
+        with closing(connection.cursor()) as c:
+            return (
+                c.execute(
+                    "SELECT 1 FROM sqlite_master"
+                    " WHERE type = 'table' AND name = 'cache_size'"
+                ).fetchone()
+                is not None
+            )
+
+    def __add_size_tracking(self, connection: sqlite3.Connection) -> None:
+        """
+        Adds the size and access time columns to the objects table, and keeps their
+        total size in `cache_size`. Objects of dbs created by older versions of
+        specklepy or without a budget have no access time, so they are the first
+        to be evicted.
+        """
+        with closing(connection.cursor()) as c:
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                # another process may have migrated the db in the meantime
+                if self.__has_size_tracking(connection):
+                    c.execute("COMMIT")
+                    return
+                columns = {row[1] for row in c.execute("PRAGMA table_info(objects)")}
+                if "size" not in columns:
+                    c.execute("ALTER TABLE objects ADD COLUMN size INTEGER")
+                if "last_access" not in columns:
+                    c.execute(
+                        "ALTER TABLE objects"
+                        " ADD COLUMN last_access REAL NOT NULL DEFAULT 0"
+                    )
+                c.execute(
+                    "UPDATE objects SET size = length(CAST(content AS BLOB))"
+                    " WHERE size IS NULL"
+                )
+                for statement in _SIZE_TRACKING_SCHEMA:
+                    c.execute(statement)
+                c.execute("COMMIT")
+            except BaseException:
+                connection.rollback()
+                raise
+
+    def __connect(self) -> sqlite3.Connection:
+        # transactions are managed explicitly, see `__write_batch`. Connections are
+        # only ever used by the thread that created them, but may be closed by any
+        connection = sqlite3.connect(
+            self._root_path,
+            timeout=self._busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        with closing(connection.cursor()) as c:
             c.execute("PRAGMA count_changes=OFF;")
             c.execute("PRAGMA temp_store=MEMORY;")
-            self.__connection.commit()
+            # in wal mode, NORMAL can only lose the latest transactions on power
+            # loss, and never corrupts the db
+            c.execute("PRAGMA synchronous=NORMAL;")
+            c.execute(f"PRAGMA cache_size=-{self._cache_size_kb};")
+            c.execute(f"PRAGMA mmap_size={self._mmap_size};")
+        return connection
+
+    def __get_connection(self) -> sqlite3.Connection:
+        # threads come and go (eg. the download workers of every receive), so their
+        # connections are released with them rather than piling up until `close`
+        thread_connection = getattr(self._local, "connection", None)
+        if thread_connection is None:
+            thread_connection = _ThreadConnection(self.__connect())
+            with self._connections_lock:
+                self._connections.add(thread_connection)
+                self._local.connection = thread_connection
+        return thread_connection.connection
+
+    def __select_many(self, columns: str, id_list: List[str]) -> List[tuple]:
+        rows = []
+        with closing(self.__get_connection().cursor()) as c:
+            for i in range(0, len(id_list), _MAX_QUERY_PARAMS):
+                chunk = id_list[i : i + _MAX_QUERY_PARAMS]
+                rows.extend(
+                    c.execute(_select_objects_query(columns, len(chunk)), chunk)
+                )
+        return rows
+
+    def __write_batch(
+        self, connection: sqlite3.Connection, batch: List[Tuple[str, str, int, float]]
+    ) -> None:
+        report = self._report
+        start = time.perf_counter()
+        if report is not None:
+            raw_size = sum(row[2] for row in batch)
+        if self._compressor:
+            batch = self.__compress_batch(connection, batch)
+        if self.max_cache_size is not None:
+            self.__execute_write(connection, _UPSERT_OBJECTS, batch)
+        elif self._tracks_size:
+            self.__execute_write(connection, _INSERT_OBJECTS, batch)
+        else:
+            self.__execute_write(
+                connection, _INSERT_UNTRACKED_OBJECTS, [row[:2] for row in batch]
+            )
+        if report is not None:
+            report.record_batch(
+                self.name,
+                time.perf_counter() - start,
+                raw_size,
+                sum(row[2] for row in batch),
+            )
+
+    def __compress_batch(
+        self, connection: sqlite3.Connection, batch: List[Tuple[str, str, int, float]]
+    ) -> List[Tuple[str, bytes, int, float]]:
+        compressor = self._compressor
+        compressed_batch = []
+        for id, content, _, stamp in batch:
+            dictionary = compressor.collect_sample(content.encode())
+            if dictionary:
+                dict_id = compressor.add_dictionary(dictionary)
+                self.__save_dictionary(connection, dict_id, dictionary)
+            compressed = compressor.compress(content)
+            compressed_batch.append((id, compressed, len(compressed), stamp))
+        return compressed_batch
+
+    def __save_dictionary(
+        self, connection: sqlite3.Connection, dict_id: int, data: bytes
+    ) -> None:
+        self.__execute_write(
+            connection,
+            "INSERT OR IGNORE INTO compression_dictionaries(dict_id, data, created)"
+            " VALUES(?,?,?)",
+            [(dict_id, data, time.time())],
+        )
+
+    def __load_dictionaries(self, compressor: ZstdObjectCompressor) -> None:
+        with closing(self.__get_connection().cursor()) as c:
+            for (data,) in c.execute(
+                "SELECT data FROM compression_dictionaries ORDER BY created"
+            ):
+                compressor.add_dictionary(data)
+
+    def __decode(self, id: str, content) -> str:
+        if isinstance(content, str):
+            if self._compressor:
+                self.__queue_recompression(id, content)
+            return content
+
+        decompressor = self._compressor or self._decompressor
+        if decompressor is None:
+            decompressor = self._decompressor = ZstdObjectCompressor(
+                train_dictionary=False
+            )
+            self.__load_dictionaries(decompressor)
+        try:
+            return decompressor.decompress(content)
+        except UnknownDictionaryError:
+            # trained by another process sharing the db
+            self.__load_dictionaries(decompressor)
+            return decompressor.decompress(content)
+
+    def __queue_recompression(self, id: str, content: str) -> None:
+        with self._recompress_lock:
+            if len(self._recompress) < _RECOMPRESS_QUEUE_LENGTH:
+                self._recompress[id] = content
+
+    def __flush_recompression(self) -> None:
+        with self._recompress_lock:
+            pending = self._recompress
+            self._recompress = {}
+        if not pending:
+            return
+
+        compressed = {id: self._compressor.compress(c) for id, c in pending.items()}
+        if self._tracks_size:
+            sql = "UPDATE objects SET content = ?, size = ?"
+            rows = [(c, len(c), id) for id, c in compressed.items()]
+        else:
+            sql = "UPDATE objects SET content = ?"
+            rows = [(c, id) for id, c in compressed.items()]
+        self.__execute_write(
+            self.__get_connection(),
+            f"{sql} WHERE hash = ? AND typeof(content) = 'text'",
+            rows,
+        )
+
+    @staticmethod
+    def __execute_write(
+        connection: sqlite3.Connection, sql: str, rows: List[tuple]
+    ) -> int:
+        for attempt in range(1, _WRITE_ATTEMPTS + 1):
+            try:
+                with closing(connection.cursor()) as c:
+                    # take the write lock up front, a deferred transaction that
+                    # needs to upgrade its lock can't wait for busy writers
+                    c.execute("BEGIN IMMEDIATE")
+                    c.executemany(sql, rows)
+                    row_count = c.rowcount
+                    c.execute("COMMIT")
+                return row_count
+            except sqlite3.OperationalError as ex:
+                if connection.in_transaction:
+                    connection.rollback()
+                if "locked" not in str(ex) or attempt == _WRITE_ATTEMPTS:
+                    raise
+                LOG.warning("The local db is locked, retrying the write: %s", ex)
+                time.sleep(attempt * _WRITE_RETRY_DELAY_SECONDS)
+
+    def __touch(self, ids) -> None:
+        if self.max_cache_size is None or not ids:
+            return
+        stamp = time.time()
+        with self._touched_lock:
+            self._touched.extend((stamp, id, stamp) for id in ids)
+            should_flush = len(self._touched) >= _TOUCH_FLUSH_SIZE
+        if should_flush:
+            self.__flush_touches()
+
+    def __flush_touches(self) -> None:
+        with self._touched_lock:
+            touched = self._touched
+            self._touched = []
+        if touched:
+            self.__execute_write(self.__get_connection(), _TOUCH_OBJECTS, touched)
+
+    def __enforce_budget(self) -> None:
+        connection = self.__get_connection()
+        with closing(connection.cursor()) as c:
+            total = c.execute(_SELECT_CACHE_SIZE).fetchone()[0]
+            self.stats.size_bytes = total
+            if total <= self.max_cache_size:
+                return
+
+            # walks the least recently used objects until enough space is freed,
+            # evicting every object accessed at the same time together
+            to_free = total - int(self.max_cache_size * _EVICTION_LOW_WATERMARK)
+            freed = 0
+            cutoff = None
+            for last_access, size in c.execute(
+                f"SELECT last_access, {_ROW_SIZE.format(row='objects')} FROM objects"
+                " ORDER BY last_access"
+            ):
+                if freed >= to_free and last_access != cutoff:
+                    break
+                freed += size
+                cutoff = last_access
+
+        evicted = self.__execute_write(
+            connection, "DELETE FROM objects WHERE last_access <= ?", [(cutoff,)]
+        )
+        self.stats.evicted_objects += evicted
+        self.stats.evicted_bytes += freed
+        with closing(connection.cursor()) as c:
+            self.stats.size_bytes = c.execute(_SELECT_CACHE_SIZE).fetchone()[0]
+        LOG.info("Evicted %s objects (%s bytes) from the local cache", evicted, freed)
+
+    def __enqueue_batch(self, batch: List[Tuple[str, str, int, float]]) -> None:
+        self.__raise_writer_exception()
+        # concurrent saves must not start a writer each, as only one is ever stopped
+        with self._writer_lock:
+            if not self._writer_thread:
+                self._writer_thread = threading.Thread(
+                    target=self.__writer_thread_main,
+                    name="SQLiteTransportWriter",
+                    daemon=True,
+                )
+                self._writer_thread.start()
+        self._write_queue.put(batch)
+
+    def __writer_thread_main(self) -> None:
+        connection = None
+        while True:
+            batch = self._write_queue.get()
+            # None is a sentinel value, meaning the thread should exit gracefully
+            if batch is None:
+                self._write_queue.task_done()
+                break
+
+            try:
+                connection = connection or self.__connect()
+                self.__write_batch(connection, batch)
+            except Exception as ex:
+                self._writer_exception = self._writer_exception or ex
+                LOG.error("Error saving a batch of objects to the local db: %s", ex)
+
+            self._write_queue.task_done()
+
+        if connection:
+            connection.close()
+
+    def __raise_writer_exception(self) -> None:
+        if self._writer_exception is None:
+            return
+        ex = self._writer_exception
+        self._writer_exception = None
+        raise SpeckleException(
+            "Could not save the batch of objects to the local db. Inner exception:"
+            f" {ex}",
+        ) from ex
 
-    def __check_connection(self):
-        if not self.__connection:
-            self.__connection = sqlite3.connect(self._root_path)
+    def __stop_writer(self) -> None:
+        with self._writer_lock:
+            if not self._writer_thread:
+                return
+            self._write_queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
 
     def __del__(self):
         self.close()
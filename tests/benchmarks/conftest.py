@@ -0,0 +1,52 @@
+"""
+Benchmarks of serialization, sending and receiving, on the synthetic models of
+`generators`. They need pytest-benchmark, and are skipped without it.
+
+The benchmarks are marked `perf`, which the test runs deselect, so they only run
+when asked for (`mise run benchmark`):
+
+    pytest tests/benchmarks -m perf
+    # compare with the latest stored baseline, failing on regressions
+    pytest tests/benchmarks -m perf --benchmark-storage=tests/benchmarks/baselines \\
+        --benchmark-compare --benchmark-compare-fail=mean:25%
+    # store a new baseline, from a clean tree
+    pytest tests/benchmarks -m perf --benchmark-storage=tests/benchmarks/baselines \\
+        --benchmark-save=baseline
+
+`SPECKLE_BENCHMARK_SCALE` multiplies the size of the models (default 1).
+
+The committed baseline was recorded on CPython 3.11 on Linux, not on the 3.13
+interpreter mise pins. Its numbers are for reference only: pytest-benchmark only
+compares runs of the same machine and interpreter, so `--benchmark-compare` is
+meant for baselines saved on your own machine, before and after a change.
+"""
+
+import os
+import tracemalloc
+from typing import Any, Callable
+
+import pytest
+
+from specklepy.objects.base import Base
+
+from .generators import MODELS
+
+SCALE = int(os.environ.get("SPECKLE_BENCHMARK_SCALE", "1"))
+
+
+@pytest.fixture(scope="session", params=list(MODELS))
+def model(request) -> Base:
+    return MODELS[request.param](SCALE)
+
+
+def record_peak_memory(benchmark, fn: Callable[[], Any]) -> None:
+    """Runs `fn` once more under tracemalloc, to store its peak memory use."""
+    if benchmark.disabled:
+        return
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_memory_mb"] = round(peak / 1e6, 2)
@@ -0,0 +1,135 @@
+"""
+Deterministic synthetic models, shaped like the ones connectors send.
+
+Every generator takes a `scale`, multiplying the size of the model, so the same
+shapes can be benchmarked quickly in CI and at realistic sizes locally.
+"""
+
+import random
+from typing import Callable, Dict, List
+
+from specklepy.objects.base import Base
+from specklepy.objects.data_objects import DataObject
+from specklepy.objects.geometry import Mesh
+from specklepy.objects.models.collections.collection import Collection
+from specklepy.objects.proxies import InstanceDefinitionProxy, InstanceProxy
+
+
+def _mesh(rng: random.Random, vertex_count: int) -> Mesh:
+    vertices = [round(rng.uniform(-100, 100), 6) for _ in range(vertex_count * 3)]
+    faces: List[int] = []
+    for i in range(vertex_count - 2):
+        faces.extend((3, i, i + 1, i + 2))
+    return Mesh(vertices=vertices, faces=faces, units="m")
+
+
+def _properties(rng: random.Random, count: int) -> Dict[str, object]:
+    return {
+        "Parameters": {
+            f"Group {g}": {
+                f"Parameter {i}": {
+                    "name": f"Parameter {i}",
+                    "value": rng.choice([rng.random(), rng.randint(0, 1000), "text"]),
+                    "units": rng.choice(["m", "mm", None]),
+                }
+                for i in range(count // 10)
+            }
+            for g in range(10)
+        },
+        "category": rng.choice(["Walls", "Floors", "Doors", "Windows"]),
+        "level": f"Level {rng.randint(0, 20)}",
+    }
+
+
+def _element(rng: random.Random, i: int, vertex_count: int, property_count: int):
+    return DataObject(
+        name=f"Element {i}",
+        properties=_properties(rng, property_count),
+        displayValue=[_mesh(rng, vertex_count)],
+        applicationId=f"element-{i}",
+    )
+
+
+def deep_collections(scale: int = 1) -> Base:
+    """Nested collections, 6 levels deep, with a few elements in every leaf."""
+    rng = random.Random(1)
+    count = 0
+
+    def level(depth: int) -> Collection:
+        nonlocal count
+        if depth == 0:
+            elements = []
+            for _ in range(2 * scale):
+                elements.append(_element(rng, count, 8, 10))
+                count += 1
+            return Collection(name=f"Leaf {count}", elements=elements)
+        return Collection(
+            name=f"Level {depth}", elements=[level(depth - 1) for _ in range(3)]
+        )
+
+    return level(6)
+
+
+def wide_elements(scale: int = 1) -> Base:
+    """A single collection holding many small elements."""
+    rng = random.Random(2)
+    return Collection(
+        name="Wide",
+        elements=[_element(rng, i, 4, 10) for i in range(2000 * scale)],
+    )
+
+
+def dense_meshes(scale: int = 1) -> Base:
+    """A few meshes, big enough for their vertices and faces to be chunked."""
+    rng = random.Random(3)
+    return Collection(
+        name="Dense",
+        elements=[_mesh(rng, 50000 * scale) for _ in range(3)],
+    )
+
+
+def heavy_properties(scale: int = 1) -> Base:
+    """Elements with large `DataObject.properties` dicts and little geometry."""
+    rng = random.Random(4)
+    return Collection(
+        name="Properties",
+        elements=[_element(rng, i, 3, 400) for i in range(200 * scale)],
+    )
+
+
+def instanced_geometry(scale: int = 1) -> Base:
+    """Many instances sharing a few definitions, like furniture or fixtures."""
+    rng = random.Random(5)
+    definitions = [_mesh(rng, 500) for _ in range(20)]
+    for i, mesh in enumerate(definitions):
+        mesh.applicationId = f"definition-geometry-{i}"
+    instances = [
+        InstanceProxy(
+            definitionId=f"definition-{i % len(definitions)}",
+            transform=[rng.random() for _ in range(16)],
+            maxDepth=0,
+            units="m",
+            applicationId=f"instance-{i}",
+        )
+        for i in range(3000 * scale)
+    ]
+    root = Collection(name="Instances", elements=[*definitions, *instances])
+    root["instanceDefinitionProxies"] = [
+        InstanceDefinitionProxy(
+            objects=[mesh.applicationId],
+            maxDepth=0,
+            name=f"definition-{i}",
+            applicationId=f"definition-{i}",
+        )
+        for i, mesh in enumerate(definitions)
+    ]
+    return root
+
+
+MODELS: Dict[str, Callable[[int], Base]] = {
+    "deep_collections": deep_collections,
+    "wide_elements": wide_elements,
+    "dense_meshes": dense_meshes,
+    "heavy_properties": heavy_properties,
+    "instanced_geometry": instanced_geometry,
+}
@@ -0,0 +1,62 @@
+import pytest
+
+from specklepy.core.api import operations
+from specklepy.objects.base import Base
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.sqlite import SQLiteTransport
+
+from .conftest import record_peak_memory
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.perf
+
+
+def test_get_id(benchmark, model: Base):
+    benchmark(model.get_id)
+    record_peak_memory(benchmark, model.get_id)
+
+
+def test_serialize(benchmark, model: Base):
+    benchmark(operations.serialize, model)
+    record_peak_memory(benchmark, lambda: operations.serialize(model))
+
+
+def test_send_to_memory(benchmark, model: Base):
+    def send():
+        return operations.send(model, [MemoryTransport()], use_default_cache=False)
+
+    benchmark(send)
+    record_peak_memory(benchmark, send)
+
+
+def test_send_to_sqlite(benchmark, model: Base, tmp_path):
+    runs = iter(range(1_000_000))
+
+    def send():
+        # a fresh db per run, so every run writes every object
+        transport = SQLiteTransport(base_path=str(tmp_path / str(next(runs))))
+        try:
+            return operations.send(model, [transport], use_default_cache=False)
+        finally:
+            transport.close()
+
+    benchmark(send)
+    record_peak_memory(benchmark, send)
+
+
+def test_deserialize(benchmark, model: Base):
+    serialized = operations.serialize(model)
+    benchmark(operations.deserialize, serialized)
+    record_peak_memory(benchmark, lambda: operations.deserialize(serialized))
+
+
+def test_receive_from_memory(benchmark, model: Base):
+    transport = MemoryTransport()
+    obj_id = operations.send(model, [transport], use_default_cache=False)
+
+    def receive():
+        return operations.receive(obj_id, local_transport=transport)
+
+    benchmark(receive)
+    record_peak_memory(benchmark, receive)
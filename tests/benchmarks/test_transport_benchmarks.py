@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from specklepy.bundle.upload import ArtifactPipeline
+from specklepy.core.api import operations
+from specklepy.core.api.credentials import Account
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.server import ServerTransport
+from tests.fake_server import BROADBAND, FLAKY, LAN, FakeSpeckleServer
+
+from .conftest import SCALE
+from .generators import wide_elements
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.perf
+
+PROFILES = {"lan": LAN, "broadband": BROADBAND, "flaky": FLAKY}
+
+
+@pytest.fixture(params=list(PROFILES))
+def server(request):
+    with FakeSpeckleServer(PROFILES[request.param]) as server:
+        yield server
+
+
+@pytest.fixture(scope="module")
+def model():
+    return wide_elements(SCALE)
+
+
+def transport(server: FakeSpeckleServer) -> ServerTransport:
+    return ServerTransport(
+        server.project_id, token="token", url=server.url, cache_known_objects=False
+    )
+
+
+def record_throughput(benchmark, server: FakeSpeckleServer) -> None:
+    stats = benchmark.stats.stats if benchmark.stats else None
+    if stats is None or not stats.mean:
+        return
+    rounds = stats.rounds
+    benchmark.extra_info["mb_per_second"] = round(
+        (server.stats.bytes_received + server.stats.bytes_sent)
+        / rounds
+        / stats.mean
+        / 1e6,
+        2,
+    )
+    benchmark.extra_info["errors"] = server.stats.errors
+    benchmark.extra_info["throttled"] = server.stats.throttled
+
+
+def test_send(benchmark, server: FakeSpeckleServer, model):
+    remote = transport(server)
+
+    def send():
+        return operations.send(model, [remote], use_default_cache=False)
+
+    # the server starts empty every round, so every object is uploaded
+    benchmark.pedantic(send, setup=server.objects.clear, rounds=3)
+    record_throughput(benchmark, server)
+
+
+def test_receive(benchmark, server: FakeSpeckleServer, model):
+    remote = transport(server)
+    obj_id = operations.send(model, [remote], use_default_cache=False)
+    server.stats.bytes_received = server.stats.bytes_sent = 0
+
+    def receive():
+        return remote.copy_object_and_children(obj_id, MemoryTransport())
+
+    benchmark.pedantic(receive, rounds=3)
+    record_throughput(benchmark, server)
+
+
+def test_artifact_upload(benchmark, server: FakeSpeckleServer, tmp_path):
+    for i in range(4):
+        (tmp_path / f"bundle.{i}.parquet").write_bytes(os.urandom(4_000_000 * SCALE))
+    account = Account.from_token("token", server.url)
+
+    def upload():
+        with ArtifactPipeline(
+            server.project_id, "ingestion", server.version_id, account, str(tmp_path)
+        ) as pipeline:
+            return pipeline.upload_dir("bundle", "root", 0)
+
+    benchmark.pedantic(upload, rounds=3)
+    record_throughput(benchmark, server)
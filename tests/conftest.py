@@ -21,3 +21,11 @@ def base() -> Base:
         "SpecialRevitFamily", applicationId="secret tho"
     )
     return base
+
+
+@pytest.fixture
+def fake_server():
+    from tests.fake_server import FakeSpeckleServer
+
+    with FakeSpeckleServer() as server:
+        yield server
@@ -0,0 +1,247 @@
+"""
+An in-process stand-in for a Speckle server, to test and benchmark the data path
+without a live server.
+
+It serves the object endpoints `ServerTransport` and `BatchSender` use, the v2
+artifact sign / complete endpoints of `ArtifactPipeline`, and an S3 stand-in for
+their presigned PUTs. A `NetworkProfile` adds latency, limits the bandwidth and
+injects errors and throttling into every response.
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+
+@dataclass
+class NetworkProfile:
+    """How the link to the fake server behaves."""
+
+    #: added to every request
+    latency_seconds: float = 0.0
+    #: shared by all requests, None for unlimited
+    bandwidth_bytes_per_second: Optional[float] = None
+    #: fraction of requests failing with a 500
+    error_rate: float = 0.0
+    #: fraction of requests throttled with a 429
+    throttle_rate: float = 0.0
+    #: whole seconds, as urllib3 only parses those
+    retry_after_seconds: int = 0
+    seed: int = 0
+
+
+LAN = NetworkProfile(latency_seconds=0.001)
+BROADBAND = NetworkProfile(latency_seconds=0.02, bandwidth_bytes_per_second=50e6)
+FLAKY = NetworkProfile(latency_seconds=0.02, error_rate=0.05, throttle_rate=0.05)
+
+
+@dataclass
+class FakeServerStats:
+    requests: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    throttled: int = 0
+    bytes_received: int = 0
+    bytes_sent: int = 0
+
+
+_DECODER = json.JSONDecoder()
+
+
+def _split_json_array(text: str) -> Iterator[Tuple[dict, str]]:
+    """
+    Yields the items of a JSON array with their text as sent, so objects are
+    served back byte for byte rather than re-encoded.
+    """
+    index = text.index("[") + 1
+    while True:
+        while text[index] in " \t\r\n,":
+            index += 1
+        if text[index] == "]":
+            return
+        obj, end = _DECODER.raw_decode(text, index)
+        yield obj, text[index:end]
+        index = end
+
+
+class FakeSpeckleServer:
+    """
+    Serves `project_id`'s objects from memory, over a threaded `HTTPServer`.
+
+    ```py
+    with FakeSpeckleServer(profile=BROADBAND) as server:
+        transport = ServerTransport(server.project_id, token="token", url=server.url)
+    ```
+    """
+
+    def __init__(
+        self,
+        profile: Optional[NetworkProfile] = None,
+        project_id: str = "project",
+        version_id: str = "version",
+    ) -> None:
+        self.profile = profile or NetworkProfile()
+        self.project_id = project_id
+        self.version_id = version_id
+        self.objects: Dict[str, str] = {}
+        self.artifacts: Dict[str, bytes] = {}
+        self.completed: List[dict] = []
+        self.stats = FakeServerStats()
+        self._rng = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        # the time the shared link is busy until, to simulate its bandwidth
+        self._link_free_at = 0.0
+        self._server = HTTPServer(threaded=True)
+
+    @property
+    def url(self) -> str:
+        return self._server.url_for("").rstrip("/")
+
+    def start(self) -> "FakeSpeckleServer":
+        self._server.start()
+        self.__route()
+        return self
+
+    def stop(self) -> None:
+        self._server.clear()
+        if self._server.is_running():
+            self._server.stop()
+
+    def __enter__(self) -> "FakeSpeckleServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def add_objects(self, objects: Dict[str, str]) -> None:
+        with self._lock:
+            self.objects.update(objects)
+
+    def __route(self) -> None:
+        project = re.escape(self.project_id)
+        routes = [
+            (f"/api/diff/{project}", "POST", self.__diff),
+            (f"/objects/{project}", "POST", self.__upload),
+            (re.compile(f"/objects/{project}/[^/]+/single"), "GET", self.__single),
+            (f"/api/getobjects/{project}", "POST", self.__get_objects),
+            (
+                re.compile(
+                    f"/api/v2/projects/{project}/modelingestion/[^/]+/uploads/sign"
+                ),
+                "POST",
+                self.__sign,
+            ),
+            (
+                re.compile(
+                    f"/api/v2/projects/{project}/modelingestion/[^/]+/uploads/complete"
+                ),
+                "POST",
+                self.__complete,
+            ),
+            (re.compile("/s3/.+"), "PUT", self.__put_artifact),
+        ]
+        for uri, method, handler in routes:
+            self._server.expect_request(uri, method=method).respond_with_handler(
+                self.__on_network(handler)
+            )
+
+    def __on_network(self, handler):
+        def respond(request: Request) -> Response:
+            name = handler.__name__.split("__")[-1]
+            body = request.get_data()
+            with self._lock:
+                self.stats.requests[name] = self.stats.requests.get(name, 0) + 1
+                self.stats.bytes_received += len(body)
+                roll = self._rng.random()
+            time.sleep(self.profile.latency_seconds)
+            self.__transfer(len(body))
+
+            if roll < self.profile.throttle_rate:
+                with self._lock:
+                    self.stats.throttled += 1
+                return Response(
+                    "slow down",
+                    429,
+                    headers={"Retry-After": str(self.profile.retry_after_seconds)},
+                )
+            if roll < self.profile.throttle_rate + self.profile.error_rate:
+                with self._lock:
+                    self.stats.errors += 1
+                return Response("injected error", 500)
+
+            response = handler(request)
+            size = len(response.get_data())
+            with self._lock:
+                self.stats.bytes_sent += size
+            self.__transfer(size)
+            return response
+
+        return respond
+
+    def __transfer(self, size: int) -> None:
+        """Waits for `size` bytes to go through the shared link."""
+        bandwidth = self.profile.bandwidth_bytes_per_second
+        if not bandwidth or not size:
+            return
+        with self._lock:
+            start = max(time.monotonic(), self._link_free_at)
+            self._link_free_at = start + size / bandwidth
+            done = self._link_free_at
+        time.sleep(max(0.0, done - time.monotonic()))
+
+    def __diff(self, request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        with self._lock:
+            return Response(json.dumps({id: id in self.objects for id in ids}))
+
+    def __upload(self, request: Request) -> Response:
+        new_objects = {}
+        for batch in request.files.values():
+            for obj, text in _split_json_array(gzip.decompress(batch.read()).decode()):
+                new_objects[obj["id"]] = text
+        self.add_objects(new_objects)
+        return Response("", 201)
+
+    def __single(self, request: Request) -> Response:
+        id = request.path.split("/")[-2]
+        with self._lock:
+            obj = self.objects.get(id)
+        return Response(obj, 200) if obj is not None else Response("", 404)
+
+    def __get_objects(self, request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        with self._lock:
+            lines = [f"{id}\t{self.objects[id]}\n" for id in ids if id in self.objects]
+        return Response("".join(lines))
+
+    def __sign(self, request: Request) -> Response:
+        files = request.get_json()["files"]
+        uploads = {
+            name: {"url": f"{self.url}/s3/{self.version_id}/{name}"} for name in files
+        }
+        return Response(json.dumps({"uploads": uploads}))
+
+    def __put_artifact(self, request: Request) -> Response:
+        content = request.get_data()
+        with self._lock:
+            self.artifacts[request.path.split("/")[-1]] = content
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        return Response("", 200, headers={"ETag": etag})
+
+    def __complete(self, request: Request) -> Response:
+        body = request.get_json()
+        with self._lock:
+            for name, etag in body["etags"].items():
+                content = self.artifacts.get(name)
+                if content is None or etag != f'"{hashlib.md5(content).hexdigest()}"':
+                    return Response(f"Etag mismatch for {name}", 400)
+            self.completed.append(body)
+        return Response(json.dumps({"versionId": self.version_id}))
@@ -0,0 +1,124 @@
+import gzip
+import json
+import re
+from typing import Dict
+
+import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from specklepy.core.api import operations
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects.base import Base
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.server import AsyncServerTransport
+
+PROJECT = "project"
+
+
+@pytest.fixture
+def server_objects(httpserver: HTTPServer) -> Dict[str, str]:
+    objects: Dict[str, str] = {}
+
+    def diff(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        return Response(json.dumps({id: id in objects for id in ids}))
+
+    def upload(request: Request) -> Response:
+        batch = gzip.decompress(request.files["batch-1"].read())
+        for obj in json.loads(batch):
+            objects[obj["id"]] = json.dumps(obj)
+        return Response("", 201)
+
+    def get_single(request: Request) -> Response:
+        id = request.path.split("/")[-2]
+        return Response(objects[id]) if id in objects else Response("", 404)
+
+    def get_objects(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        return Response(
+            "".join(f"{id}\t{objects[id]}\n" for id in ids if id in objects)
+        )
+
+    httpserver.expect_request(f"/api/diff/{PROJECT}").respond_with_handler(diff)
+    httpserver.expect_request(f"/objects/{PROJECT}").respond_with_handler(upload)
+    httpserver.expect_request(
+        re.compile(f"/objects/{PROJECT}/.*/single")
+    ).respond_with_handler(get_single)
+    httpserver.expect_request(f"/api/getobjects/{PROJECT}").respond_with_handler(
+        get_objects
+    )
+    return objects
+
+
+def transport(httpserver: HTTPServer, **kwargs) -> AsyncServerTransport:
+    return AsyncServerTransport(
+        PROJECT, token="token", url=httpserver.url_for("").rstrip("/"), **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_and_receive(httpserver: HTTPServer, server_objects, base: Base):
+    async with transport(
+        httpserver, max_batch_length=5, download_chunk_size=5
+    ) as remote:
+        local = MemoryTransport()
+        obj_id = await operations.send_async(
+            base, [remote, local], use_default_cache=False
+        )
+        assert server_objects.keys() == local.objects.keys()
+
+        target = MemoryTransport()
+        received = await operations.receive_async(obj_id, remote, target)
+        assert received.get_id() == base.get_id()
+        assert target.objects.keys() == server_objects.keys()
+
+        ids = list(server_objects)
+        assert await remote.get_object("missing") is None
+        assert (await remote.get_objects(ids)).keys() == set(ids)
+        assert await remote.has_objects(["missing", ids[0]]) == {
+            "missing": False,
+            ids[0]: True,
+        }
+
+
+@pytest.mark.asyncio
+async def test_objects_are_only_split_on_newlines(
+    httpserver: HTTPServer, server_objects
+):
+    # JSON strings may hold these raw, but httpx's line splitting breaks on them
+    value = "line \u2028 paragraph \u2029 next line \x85 end"
+    server_objects["id"] = json.dumps({"id": "id", "value": value}, ensure_ascii=False)
+    server_objects["other"] = json.dumps({"id": "other"})
+
+    async with transport(httpserver) as remote:
+        objects = await remote.get_objects(["id", "other"])
+
+    assert json.loads(objects["id"])["value"] == value
+    assert objects["other"] == server_objects["other"]
+
+
+@pytest.mark.asyncio
+async def test_objects_spanning_many_chunks(httpserver: HTTPServer, server_objects):
+    server_objects["large"] = json.dumps({"id": "large", "value": "x" * 5_000_000})
+    server_objects["small"] = json.dumps({"id": "small"})
+
+    async with transport(httpserver) as remote:
+        objects = await remote.get_objects(["small", "large", "small"])
+
+    assert objects == {
+        "large": server_objects["large"],
+        "small": server_objects["small"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_upload_errors_raise_on_end_write(httpserver: HTTPServer):
+    httpserver.expect_request(f"/api/diff/{PROJECT}").respond_with_data("{}")
+    httpserver.expect_request(f"/objects/{PROJECT}").respond_with_data("no", 400)
+
+    async with transport(httpserver) as remote:
+        await remote.begin_write()
+        await remote.save_object("id", '{"id":"id"}')
+        with pytest.raises(SpeckleException):
+            await remote.end_write()
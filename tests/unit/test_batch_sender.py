@@ -0,0 +1,265 @@
+import gzip
+import json
+
+import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.transports.server.batch_sender import BatchSender, compress_batch
+from specklepy.transports.server.known_objects import KnownObjectsCache
+from specklepy.transports.server.upload_controller import AdaptiveUploadController
+from specklepy.transports.server.upload_journal import UploadJournal
+
+PROJECT = "project"
+MB = 1000 * 1000
+
+
+def controller(**kwargs) -> AdaptiveUploadController:
+    settings = {
+        "initial_batch_size_bytes": 1 * MB,
+        "min_batch_size_bytes": MB // 4,
+        "max_batch_size_bytes": 8 * MB,
+        "initial_concurrency": 4,
+        "max_concurrency": 16,
+    }
+    return AdaptiveUploadController(**{**settings, **kwargs})
+
+
+def test_concurrency_grows_until_rtt_inflates():
+    c = controller()
+    for _ in range(20):
+        c.record_rtt(0.1)
+    assert c.concurrency == 16
+
+    c.record_rtt(0.5)
+    assert c.concurrency == 15
+
+
+def test_rtt_is_compared_per_object_diffed():
+    c = controller()
+    c.record_rtt(0.1, 100)
+    # twice the objects in a bigger batch, without queueing
+    c.record_rtt(0.2, 200)
+    assert c.concurrency == 6
+    assert c.min_rtt == pytest.approx(0.001)
+
+    # smaller batches amortise the latency over fewer objects
+    c.record_upload(MB, 10)
+    assert c.min_rtt is None
+    c.record_rtt(0.1, 50)
+    assert c.concurrency == 7
+
+
+def test_threads_grow_with_concurrency(httpserver: HTTPServer):
+    def diff(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        return Response(json.dumps({id: False for id in ids}))
+
+    httpserver.expect_request(f"/api/diff/{PROJECT}").respond_with_handler(diff)
+    httpserver.expect_request(f"/objects/{PROJECT}").respond_with_data("", 201)
+
+    sender = BatchSender(
+        httpserver.url_for("").rstrip("/"),
+        PROJECT,
+        "token",
+        max_batch_length=10,
+        thread_count=2,
+        max_thread_count=16,
+    )
+    sender.send_object(f"{0:032x}", "{}")
+    assert len(sender._send_threads) == 2
+
+    sender.controller.concurrency = 4
+    for i in range(1, 100):
+        sender.send_object(f"{i:032x}", "{}")
+    assert len(sender._send_threads) == 4
+    sender.flush()
+
+
+def test_throttling_halves_concurrency_and_pauses():
+    c = controller()
+    c.record_throttled(retry_after=60)
+    assert c.concurrency == 2
+    assert c.settings().throttled_count == 1
+    assert c._paused_until > 0
+
+
+def test_batch_size_targets_upload_duration():
+    c = controller(target_batch_seconds=2.0)
+    c.record_upload(MB, 0.5)
+    assert c.batch_size_bytes == 2 * MB
+    for _ in range(5):
+        c.record_upload(MB, 0.1)
+    assert c.batch_size_bytes == 8 * MB
+
+    c.record_upload(8 * MB, 10)
+    assert c.batch_size_bytes == 4 * MB
+    assert c.settings().throughput_bytes_per_second > 0
+
+
+def test_upload_backs_off_when_throttled(httpserver: HTTPServer):
+    uploaded = []
+    throttled = []
+
+    def diff(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        return Response(json.dumps({id: False for id in ids}))
+
+    def upload(request: Request) -> Response:
+        if not throttled:
+            throttled.append(True)
+            return Response("slow down", 429, headers={"Retry-After": "0"})
+        uploaded.append(request.files["batch-1"].read())
+        return Response("", 201)
+
+    httpserver.expect_request(f"/api/diff/{PROJECT}").respond_with_handler(diff)
+    httpserver.expect_request(f"/objects/{PROJECT}").respond_with_handler(upload)
+
+    sender = BatchSender(
+        httpserver.url_for("").rstrip("/"), PROJECT, "token", max_batch_length=10
+    )
+    for i in range(100):
+        sender.send_object(f"{i:032x}", f'{{"value":{i}}}')
+    sender.flush()
+
+    assert len(uploaded) == 10
+    settings = sender.upload_settings()
+    assert settings.throttled_count == 1
+    assert 1 <= settings.concurrency <= 16
+
+
+def test_known_objects_skip_diffs(httpserver: HTTPServer, tmp_path):
+    server_objects = set()
+    diffed = []
+
+    def diff(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        diffed.extend(ids)
+        return Response(json.dumps({id: id in server_objects for id in ids}))
+
+    def upload(request: Request) -> Response:
+        objects = json.loads(gzip.decompress(request.files["batch-1"].read()))
+        server_objects.update(obj["id"] for obj in objects)
+        return Response("", 201)
+
+    httpserver.expect_request(f"/api/diff/{PROJECT}").respond_with_handler(diff)
+    httpserver.expect_request(f"/objects/{PROJECT}").respond_with_handler(upload)
+    url = httpserver.url_for("").rstrip("/")
+
+    def send(ids):
+        diffed.clear()
+        known_objects = KnownObjectsCache(url, PROJECT, base_path=str(tmp_path))
+        sender = BatchSender(
+            url, PROJECT, "token", max_batch_length=50, known_objects=known_objects
+        )
+        for id in ids:
+            sender.send_object(id, json.dumps({"id": id}))
+        sender.flush()
+        known_objects.close()
+
+    ids = [f"{i:032x}" for i in range(100)]
+    send(ids)
+    assert sorted(diffed) == ids
+
+    new_ids = [f"{i:032x}" for i in range(100, 110)]
+    send(ids + new_ids)
+    # only the new objects, and a few canaries per batch
+    assert set(new_ids) <= set(diffed)
+    assert len(diffed) <= len(new_ids) + 3 * 3
+    assert server_objects == set(ids + new_ids)
+
+    # the project got reset, the canaries invalidate the cache
+    server_objects.clear()
+    send(ids)
+    assert server_objects == set(ids)
+
+
+def test_known_objects_are_bounded(tmp_path):
+    known_objects = KnownObjectsCache(
+        "https://server", PROJECT, base_path=str(tmp_path), max_ids=10
+    )
+    known_objects.add(f"{i:032x}" for i in range(8))
+    known_objects.add(f"{i:032x}" for i in range(8))
+    assert len(known_objects.known([f"{i:032x}" for i in range(8)])) == 8
+
+    known_objects.add(f"{i:032x}" for i in range(8, 12))
+    assert not known_objects.known([f"{i:032x}" for i in range(12)])
+    known_objects.close()
+
+
+def test_compress_batch():
+    objects = [json.dumps({"id": i, "data": "x" * (i % 500)}) for i in range(2000)]
+    objects[1] = objects[1].encode()
+
+    chunks, size = compress_batch(objects, level=1)
+
+    data = gzip.decompress(b"".join(chunks))
+    assert len(data) == size
+    assert json.loads(data) == [json.loads(obj) for obj in objects]
+
+
+def test_journal_resumes_interrupted_send(httpserver: HTTPServer, tmp_path):
+    server_objects = set()
+    diffed = []
+    failing = {f"{55:032x}"}
+
+    def diff(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        diffed.extend(ids)
+        return Response(json.dumps({id: id in server_objects for id in ids}))
+
+    def upload(request: Request) -> Response:
+        objects = json.loads(gzip.decompress(request.files["batch-1"].read()))
+        ids = {obj["id"] for obj in objects}
+        if ids & failing:
+            return Response("gone", 400)
+        server_objects.update(ids)
+        return Response("", 201)
+
+    httpserver.expect_request(f"/api/diff/{PROJECT}").respond_with_handler(diff)
+    httpserver.expect_request(f"/objects/{PROJECT}").respond_with_handler(upload)
+    url = httpserver.url_for("").rstrip("/")
+    path = str(tmp_path / "send.journal")
+    ids = [f"{i:032x}" for i in range(100)]
+
+    def send():
+        diffed.clear()
+        journal = UploadJournal(path, url, PROJECT)
+        sender = BatchSender(
+            url, PROJECT, "token", max_batch_length=10, journal=journal
+        )
+        try:
+            for id in ids:
+                sender.send_object(id, json.dumps({"id": id}))
+            sender.flush()
+        finally:
+            journal.close()
+
+    with pytest.raises(SpeckleException):
+        send()
+    assert len(server_objects) == 90
+
+    failing.clear()
+    send()
+    # only the batch that failed is diffed again
+    assert sorted(diffed) == ids[50:60]
+    assert server_objects == set(ids)
+
+
+def test_journal_ignores_partial_lines(tmp_path):
+    path = str(tmp_path / "send.journal")
+    journal = UploadJournal(path, "http://server/", PROJECT)
+    journal.record(["a", "b"])
+    journal.close()
+    with open(path, "a") as f:
+        f.write("c d")
+
+    journal = UploadJournal(path, "http://SERVER", PROJECT)
+    assert journal.acknowledged(["a", "b", "c", "d"]) == {"a", "b"}
+    journal.complete()
+    assert len(journal) == 0
+    journal.close()
+
+    with pytest.raises(SpeckleException):
+        UploadJournal(path, "http://server", "other project")
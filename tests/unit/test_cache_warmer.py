@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from specklepy.core.api import operations
+from specklepy.core.api.cache_warmer import (
+    ALREADY_CACHED,
+    OVER_BUDGET,
+    WARMED,
+    CacheWarmer,
+)
+from specklepy.core.api.models.subscription_messages import (
+    ProjectVersionsUpdatedMessage,
+)
+from specklepy.objects.base import Base
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.server import ServerTransport
+from tests.fake_server import FakeSpeckleServer
+
+
+class WriteTrackingTransport(MemoryTransport):
+    """Records the most writes it went through at once"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writing = 0
+        self.most_writing = 0
+        self._lock = threading.Lock()
+
+    def begin_write(self) -> None:
+        with self._lock:
+            self.writing += 1
+            self.most_writing = max(self.most_writing, self.writing)
+        # leaves the other copies time to start writing
+        time.sleep(0.05)
+        super().begin_write()
+
+    def end_write(self) -> None:
+        super().end_write()
+        with self._lock:
+            self.writing -= 1
+
+
+@pytest.fixture()
+def remote(fake_server: FakeSpeckleServer) -> ServerTransport:
+    return ServerTransport(
+        fake_server.project_id,
+        token="token",
+        url=fake_server.url,
+        cache_known_objects=False,
+    )
+
+
+def message(object_id: str, type: str = "CREATED", model_id: str = "model"):
+    return ProjectVersionsUpdatedMessage.model_validate(
+        {
+            "id": "version",
+            "type": type,
+            "modelId": model_id,
+            "version": {
+                "id": "version",
+                "authorUser": None,
+                "createdAt": datetime.now(timezone.utc).isoformat(),
+                "message": None,
+                "previewUrl": "",
+                "referencedObject": object_id,
+                "sourceApplication": None,
+            },
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_warms_new_versions(
+    fake_server: FakeSpeckleServer, remote: ServerTransport, base: Base
+):
+    obj_id = operations.send(base, [remote], use_default_cache=False)
+    fake_server.stats.requests.clear()
+    local = MemoryTransport()
+    warmer = CacheWarmer(None, fake_server.project_id, ["model"], remote, local)
+
+    warmer.on_versions_updated(message(obj_id))
+    warmer.on_versions_updated(message(obj_id, type="DELETED"))
+    warmer.on_versions_updated(message(obj_id, model_id="another model"))
+    await warmer.wait_idle()
+
+    assert warmer.stats.versions_seen == 1
+    assert warmer.stats.versions_warmed == 1
+    assert warmer.stats.objects_downloaded == len(fake_server.objects)
+    assert warmer.stats.bytes_downloaded == sum(
+        len(obj) for obj in fake_server.objects.values()
+    )
+    # the root is only downloaded once, along with its missing children
+    assert fake_server.stats.requests == {"single": 1, "get_objects": 1}
+    assert set(local.objects) == set(fake_server.objects)
+    received = operations.receive(obj_id, local_transport=local)
+    assert received.get_id() == base.get_id()
+
+
+@pytest.mark.asyncio
+async def test_skips_cached_versions(
+    fake_server: FakeSpeckleServer, remote: ServerTransport, base: Base
+):
+    obj_id = operations.send(base, [remote], use_default_cache=False)
+    warmer = CacheWarmer(None, fake_server.project_id, None, remote, MemoryTransport())
+
+    assert await warmer.warm(obj_id) == WARMED
+    requests = dict(fake_server.stats.requests)
+    assert await warmer.warm(obj_id) == ALREADY_CACHED
+    assert fake_server.stats.requests == requests
+
+
+@pytest.mark.asyncio
+async def test_skips_versions_over_budget(
+    fake_server: FakeSpeckleServer, remote: ServerTransport, base: Base
+):
+    obj_id = operations.send(base, [remote], use_default_cache=False)
+    local = MemoryTransport()
+    warmer = CacheWarmer(
+        None, fake_server.project_id, None, remote, local, cache_budget_bytes=10
+    )
+
+    assert await warmer.warm(obj_id) == OVER_BUDGET
+    assert not local.objects
+
+
+@pytest.mark.asyncio
+async def test_failures_dont_stop_the_warmer(
+    fake_server: FakeSpeckleServer, remote: ServerTransport
+):
+    warmer = CacheWarmer(None, fake_server.project_id, None, remote, MemoryTransport())
+
+    assert await warmer.warm("missing") is None
+    assert warmer.stats.versions_failed == 1
+
+
+@pytest.mark.asyncio
+async def test_copies_into_a_shared_transport_one_at_a_time(
+    fake_server: FakeSpeckleServer, remote: ServerTransport
+):
+    obj_ids = []
+    for i in range(3):
+        obj = Base()
+        obj["value"] = i
+        obj["@child"] = Base()
+        obj["@child"]["value"] = f"child {i}"
+        obj_ids.append(operations.send(obj, [remote], use_default_cache=False))
+    local = WriteTrackingTransport()
+    warmer = CacheWarmer(
+        None, fake_server.project_id, None, remote, local, max_concurrent=3
+    )
+
+    outcomes = await asyncio.gather(*(warmer.warm(obj_id) for obj_id in obj_ids))
+
+    assert outcomes == [WARMED] * 3
+    assert local.most_writing == 1
+    assert set(local.objects) == set(fake_server.objects)
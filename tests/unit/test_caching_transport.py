@@ -0,0 +1,177 @@
+import json
+from typing import Optional
+
+import pytest
+
+from specklepy.core.api import operations
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects.base import Base
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.caching import CachingTransport
+from specklepy.transports.memory import MemoryTransport
+
+
+class RemoteTransport(MemoryTransport):
+    """A stand in for a remote that can only copy whole closures"""
+
+    def __init__(self) -> None:
+        super().__init__(name="Remote")
+        self.copies = 0
+
+    def get_object(self, id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def get_objects(self, id_list):
+        raise NotImplementedError
+
+    def copy_object_and_children(
+        self, id: str, target_transport: AbstractTransport
+    ) -> str:
+        self.copies += 1
+        root = self.objects.get(id)
+        if root is None:
+            raise SpeckleException(f"{id} not found")
+        target_transport.begin_write()
+        for child_id, child in self.objects.items():
+            if child_id != id:
+                target_transport.save_object(child_id, child)
+        target_transport.save_object(id, root)
+        target_transport.end_write()
+        return root
+
+
+def test_reads_back_fill_upper_tiers():
+    local, lower = MemoryTransport(), MemoryTransport()
+    lower.objects = {f"{i}": f'{{"value":{i}}}' for i in range(10)}
+    caching = CachingTransport([local, lower])
+
+    objects = caching.get_objects(["missing", *lower.objects])
+
+    assert objects == {"missing": None, **lower.objects}
+    assert local.objects == lower.objects
+    lower.objects = {}
+    assert caching.get_objects(list(local.objects)) == local.objects
+    assert caching.stats.hits == 10
+
+
+def test_receive_through_remote_tier(base: Base):
+    remote = RemoteTransport()
+    obj_id = operations.send(base, [remote], use_default_cache=False)
+    local = MemoryTransport()
+    caching = CachingTransport([local, remote])
+
+    received = operations.receive(obj_id, local_transport=caching)
+    assert received.get_id() == base.get_id()
+    assert local.objects == remote.objects
+
+    # served from memory from now on
+    local.objects = {}
+    received = operations.receive(obj_id, local_transport=caching)
+    assert received.get_id() == base.get_id()
+    assert remote.copies == 1
+
+
+class FailingTransport(MemoryTransport):
+    def get_objects(self, id_list):
+        raise SpeckleException("HTTP error 503")
+
+
+def test_tier_errors_propagate():
+    caching = CachingTransport([MemoryTransport(), FailingTransport()])
+
+    with pytest.raises(SpeckleException, match="503"):
+        caching.get_object("id")
+
+
+def test_memory_is_byte_bounded():
+    lower = MemoryTransport()
+    lower.objects = {f"{i}": "x" * 1000 for i in range(10)}
+    caching = CachingTransport([lower], max_memory_mb=0.005)
+
+    caching.get_objects(list(lower.objects))
+
+    assert caching.stats.size_bytes == 5000
+    assert caching.stats.evicted_objects == 5
+    assert caching.stats.evicted_bytes == 5000
+    assert caching.get_object("9") == "x" * 1000
+    assert caching.stats.hits == 1
+
+
+class CountingTransport(MemoryTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+        self.bulk_reads = 0
+
+    def begin_write(self) -> None:
+        self.writes += 1
+
+    def get_objects(self, id_list):
+        self.bulk_reads += 1
+        return super().get_objects(id_list)
+
+
+def test_single_reads_are_back_filled_in_batches():
+    local, lower = CountingTransport(), MemoryTransport()
+    lower.objects = {f"{i}": f'{{"value":{i}}}' for i in range(10)}
+    caching = CachingTransport([local, lower])
+
+    for id in lower.objects:
+        assert caching.get_object(id) == lower.objects[id]
+    assert local.writes == 0
+
+    caching.flush()
+    assert local.writes == 1
+    assert local.objects == lower.objects
+
+
+def test_only_roots_are_prefetched():
+    lower = CountingTransport()
+    children = {f"child{i}": json.dumps({"__closure": {"leaf": 2}}) for i in range(5)}
+    lower.objects = {
+        "root": json.dumps({"__closure": {**dict.fromkeys(children, 1), "leaf": 2}}),
+        **children,
+        "leaf": "{}",
+    }
+    caching = CachingTransport([lower], max_memory_mb=0.00004)
+
+    caching.get_object("root")
+    assert lower.bulk_reads == 2
+    # the children were evicted from the small memory cache, but are part of the
+    # closure prefetched already
+    for id in children:
+        caching.get_object(id)
+    assert lower.bulk_reads == 2 + len(children)
+
+
+def test_write_back_flushes_over_budget():
+    lower = MemoryTransport()
+    caching = CachingTransport([lower], max_memory_mb=0.005, write_policy="write-back")
+
+    caching.begin_write()
+    for i in range(10):
+        caching.save_object(f"{i}", "x" * 1000)
+    assert len(lower.objects) == 6
+    caching.end_write()
+
+    assert len(lower.objects) == 10
+
+
+@pytest.mark.parametrize("write_policy", ["write-through", "write-back"])
+def test_write_policies(write_policy):
+    local, lower = MemoryTransport(), MemoryTransport()
+    caching = CachingTransport([local, lower], write_policy=write_policy)
+
+    caching.begin_write()
+    caching.save_object("a", "{}")
+    written_before_end = "a" in lower.objects
+    assert caching.has_objects(["a", "b"]) == {"a": True, "b": False}
+    caching.end_write()
+
+    assert written_before_end == (write_policy == "write-through")
+    assert local.objects == lower.objects == {"a": "{}"}
+
+
+def test_rejects_unknown_write_policy():
+    with pytest.raises(SpeckleException):
+        CachingTransport([], write_policy="write-around")
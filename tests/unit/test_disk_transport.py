@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from specklepy.core.api import operations
+from specklepy.objects.base import Base
+from specklepy.transports.disk import DiskTransport
+from specklepy.transports.memory import MemoryTransport
+
+
+@pytest.fixture
+def transport(tmp_path) -> DiskTransport:
+    transport = DiskTransport(base_path=str(tmp_path))
+    yield transport
+    transport.close()
+
+
+def test_save_and_get_objects(transport: DiskTransport):
+    ids = [f"{i:032x}" for i in range(2500)]
+    transport.begin_write()
+    for id in ids:
+        transport.save_object(id, f'{{"id":"{id}","name":"ü"}}')
+    transport.end_write()
+
+    assert transport.get_object(ids[0]) == f'{{"id":"{ids[0]}","name":"ü"}}'
+    assert transport.get_object("missing") is None
+
+    objects = transport.get_objects([*ids, "missing"])
+    assert objects["missing"] is None
+    assert all(objects[id] == f'{{"id":"{id}","name":"ü"}}' for id in ids)
+
+    found = transport.has_objects(["missing", *ids])
+    assert not found["missing"]
+    assert sum(found.values()) == len(ids)
+
+
+def test_reads_unflushed_writes(transport: DiskTransport):
+    transport.begin_write()
+    transport.save_object("a", "{}")
+    assert transport.get_object("a") == "{}"
+    transport.save_object("b", "[]")
+    assert transport.get_objects(["a", "b"]) == {"a": "{}", "b": "[]"}
+    transport.end_write()
+
+
+def test_segments_roll_over(tmp_path):
+    transport = DiskTransport(base_path=str(tmp_path), max_segment_size_mb=0.01)
+    transport.begin_write()
+    for i in range(100):
+        transport.save_object(f"{i:032x}", "x" * 1000)
+    transport.end_write()
+    transport.close()
+
+    packs = [f for f in os.listdir(tmp_path / "DiskObjects") if f.endswith(".pack")]
+    assert len(packs) == 10
+
+    reader = DiskTransport(base_path=str(tmp_path))
+    ids = [f"{i:032x}" for i in range(100)]
+    assert reader.get_objects(ids) == {id: "x" * 1000 for id in ids}
+    reader.close()
+
+
+def test_send_and_receive(transport: DiskTransport, base: Base):
+    obj_id = operations.send(base, [transport], use_default_cache=False)
+    received = operations.receive(obj_id, local_transport=transport)
+    assert received.get_id() == base.get_id()
+
+    memory = MemoryTransport()
+    transport.copy_object_and_children(obj_id, memory)
+    received = operations.receive(obj_id, local_transport=memory)
+    assert received.get_id() == base.get_id()
+
+
+def test_ignores_partial_index_records(tmp_path):
+    writer = DiskTransport(base_path=str(tmp_path))
+    writer.save_object("a", "{}")
+    writer.save_object("b", "[]")
+    writer.close()
+
+    (index,) = (tmp_path / "DiskObjects").glob("*.idx")
+    index.write_bytes(index.read_bytes()[:-1])
+
+    reader = DiskTransport(base_path=str(tmp_path))
+    assert reader.has_objects(["a", "b"]) == {"a": True, "b": False}
+    reader.close()
+
+
+def _write_objects(base_path: str, prefix: str, count: int) -> None:
+    transport = DiskTransport(base_path=base_path)
+    transport.begin_write()
+    for i in range(count):
+        transport.save_object(f"{prefix}{i:030x}", f'{{"value":{i}}}')
+    transport.end_write()
+    transport.close()
+
+
+def test_concurrent_writers(tmp_path):
+    reader = DiskTransport(base_path=str(tmp_path), refresh_interval_seconds=0)
+    with ProcessPoolExecutor(4) as pool:
+        futures = [
+            pool.submit(_write_objects, str(tmp_path), f"{p:02x}", 500)
+            for p in range(4)
+        ]
+        for future in futures:
+            future.result()
+
+    ids = [f"{p:02x}{i:030x}" for p in range(4) for i in range(500)]
+    # segments written by other processes are picked up on misses
+    assert all(reader.has_objects(ids).values())
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(reader.get_object, ids))
+    assert results == [f'{{"value":{i}}}' for _ in range(4) for i in range(500)]
+    reader.close()
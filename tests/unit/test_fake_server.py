@@ -0,0 +1,69 @@
+import os
+
+from specklepy.bundle.upload import ArtifactPipeline
+from specklepy.core.api import operations
+from specklepy.core.api.credentials import Account
+from specklepy.objects.base import Base
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.server import ServerTransport
+from tests.fake_server import FakeSpeckleServer, NetworkProfile
+
+
+def test_send_and_receive(fake_server: FakeSpeckleServer, base: Base):
+    transport = ServerTransport(
+        fake_server.project_id,
+        token="token",
+        url=fake_server.url,
+        cache_known_objects=False,
+    )
+    obj_id = operations.send(base, [transport], use_default_cache=False)
+    assert obj_id in fake_server.objects
+
+    received = operations.receive(obj_id, transport, MemoryTransport())
+    assert received.get_id() == base.get_id()
+    assert {"diff", "upload", "single", "get_objects"} <= set(
+        fake_server.stats.requests
+    )
+
+
+def test_keeps_the_uploaded_serialization(fake_server: FakeSpeckleServer, base: Base):
+    transport = ServerTransport(
+        fake_server.project_id,
+        token="token",
+        url=fake_server.url,
+        cache_known_objects=False,
+    )
+    local = MemoryTransport()
+    operations.send(base, [transport, local], use_default_cache=False)
+
+    assert fake_server.objects == local.objects
+
+
+def test_retries_through_errors_and_throttling(base: Base):
+    profile = NetworkProfile(error_rate=0.2, throttle_rate=0.2, seed=3)
+    with FakeSpeckleServer(profile) as server:
+        transport = ServerTransport(
+            server.project_id, token="token", url=server.url, cache_known_objects=False
+        )
+        obj_id = operations.send(base, [transport], use_default_cache=False)
+        received = operations.receive(obj_id, transport, MemoryTransport())
+
+    assert received.get_id() == base.get_id()
+    assert server.stats.errors + server.stats.throttled > 0
+
+
+def test_artifact_upload(fake_server: FakeSpeckleServer, tmp_path):
+    for name in ("bundle.geometries.parquet", "bundle.eav.parquet"):
+        (tmp_path / name).write_bytes(os.urandom(1000))
+    account = Account.from_token("token", fake_server.url)
+
+    with ArtifactPipeline(
+        fake_server.project_id, "ingestion", "version", account, str(tmp_path)
+    ) as pipeline:
+        assert pipeline.upload_dir("bundle", "root", 10) == "version"
+
+    assert set(fake_server.artifacts) == {
+        "bundle.geometries.parquet",
+        "bundle.eav.parquet",
+    }
+    assert fake_server.completed[0]["rootId"] == "root"
@@ -0,0 +1,84 @@
+import threading
+from typing import List
+
+import pytest
+
+from specklepy.core.api import operations
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects.base import Base
+from specklepy.transports.fan_out import QueuedWriter, fan_out
+from specklepy.transports.memory import MemoryTransport
+
+
+class RecordingTransport(MemoryTransport):
+    def __init__(self, fail_on: str = None) -> None:
+        super().__init__()
+        self.order: List[str] = []
+        self.threads = set()
+        self.fail_on = fail_on
+        self.ended = False
+
+    def save_object(self, id: str, serialized_object: str) -> None:
+        if id == self.fail_on:
+            raise ValueError(f"can't save {id}")
+        self.order.append(id)
+        self.threads.add(threading.current_thread())
+        super().save_object(id, serialized_object)
+
+    def end_write(self) -> None:
+        self.ended = True
+
+
+def test_writes_in_order_on_worker_threads():
+    transports = [RecordingTransport(), RecordingTransport()]
+    writers = fan_out(transports, queue_length=2)
+    ids = [f"{i:032x}" for i in range(1000)]
+
+    for writer in writers:
+        writer.begin_write()
+    for id in ids:
+        for writer in writers:
+            writer.save_object(id, "{}")
+    for writer in writers:
+        writer.end_write()
+
+    for transport in transports:
+        assert transport.order == ids
+        assert threading.current_thread() not in transport.threads
+        assert transport.ended
+    assert not any(writer._thread for writer in writers)
+
+
+def test_reads_see_queued_writes():
+    writer = QueuedWriter(MemoryTransport())
+    writer.begin_write()
+    writer.save_object("id", "{}")
+    assert writer.get_object("id") == "{}"
+    assert writer.has_objects(["id"]) == {"id": True}
+    writer.end_write()
+
+
+def test_errors_raise_on_end_write():
+    transport = RecordingTransport(fail_on=f"{10:032x}")
+    writer = QueuedWriter(transport, queue_length=1)
+    writer.begin_write()
+    for i in range(2000):
+        writer.save_object(f"{i:032x}", "{}")
+
+    with pytest.raises(SpeckleException):
+        writer.end_write()
+    assert transport.ended
+    assert len(transport.order) == 10
+
+
+def test_send_with_concurrent_writes(base: Base):
+    sequential, concurrent = MemoryTransport(), MemoryTransport()
+    obj_id = operations.send(base, [sequential], use_default_cache=False)
+
+    assert (
+        operations.send(
+            base, [concurrent], use_default_cache=False, concurrent_writes=True
+        )
+        == obj_id
+    )
+    assert concurrent.objects == sequential.objects
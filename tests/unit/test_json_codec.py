@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from specklepy.objects.base import Base
+from specklepy.objects.geometry import Mesh
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.serialization.json_codec import (
+    OrjsonCodec,
+    UjsonCodec,
+    get_json_codec,
+    set_json_codec,
+)
+from specklepy.transports.memory import MemoryTransport
+
+
+def _float_corpus() -> list:
+    rng = random.Random(42)
+    floats = [0.0, -0.0, 1.0, 0.1, 0.5, 1.5e16, 5e-324, 1.7976931348623157e308]
+    for exponent in range(-30, 30):
+        floats.append(10.0**exponent)
+        floats.append(-(10.0**exponent))
+        floats.append(rng.uniform(1, 10) * 10.0**exponent)
+    floats.extend(rng.uniform(-1e6, 1e6) for _ in range(500))
+    return floats
+
+
+CORPUS = [
+    None,
+    True,
+    False,
+    0,
+    -1,
+    2**63 - 1,
+    -(2**63),
+    2**64,
+    -(2**70),
+    "",
+    "plain",
+    "forward/slash",
+    'quote " and backslash \\',
+    "\n\t\b\f\r\x00\x1f\x7f",
+    "unicode é ü ß 中文 🐛",
+    "line separator    ",
+    "looks like a number 1e16 0.00001",
+    {"nested": {"list": [1, 2.5, "three", None], "empty": {}}},
+    {"b": 1, "a": 2, "c": 3},
+    {1: "int key"},
+    [[], [[]], {}],
+    *_float_corpus(),
+    # last, as they don't compare equal after a round trip
+    float("nan"),
+    float("inf"),
+    -float("inf"),
+    {"nan": float("nan"), "none": None},
+    [1.0, float("inf"), None],
+]
+
+
+@pytest.fixture
+def orjson_codec() -> OrjsonCodec:
+    pytest.importorskip("orjson")
+    return OrjsonCodec()
+
+
+@pytest.mark.parametrize("value", CORPUS)
+def test_orjson_canonical_output_matches_ujson(value, orjson_codec: OrjsonCodec):
+    assert orjson_codec.dumpb(value) == UjsonCodec().dumpb(value)
+
+
+def test_orjson_canonical_output_matches_ujson_for_whole_corpus(
+    orjson_codec: OrjsonCodec,
+):
+    assert orjson_codec.dumpb(CORPUS) == UjsonCodec().dumpb(CORPUS)
+
+
+def test_orjson_keeps_non_finite_floats(orjson_codec: OrjsonCodec):
+    values = orjson_codec.loads(orjson_codec.dumpb([float("inf"), -float("inf")]))
+
+    assert values == [float("inf"), -float("inf")]
+
+
+@pytest.mark.parametrize("codec_type", [UjsonCodec, OrjsonCodec])
+def test_round_trip(codec_type):
+    if codec_type is OrjsonCodec:
+        pytest.importorskip("orjson")
+    codec = codec_type()
+    data = {"values": CORPUS[:-100], "big": 2**100}
+
+    assert codec.loads(codec.dumpb(data)) == codec.loads(codec.dumps(data))
+    assert codec.loads(codec.dumpb(data))["big"] == 2**100
+
+
+def _model() -> Base:
+    rng = random.Random(7)
+    model = Base(applicationId="root/é")
+    model["@elements"] = [
+        Mesh(
+            vertices=[rng.uniform(-1e5, 1e5) for _ in range(300)],
+            faces=[3, 0, 1, 2] * 25,
+            units="m",
+            applicationId=f"mesh/{i}",
+        )
+        for i in range(5)
+    ]
+    model.tiny = 1e-9
+    model.huge = 1e22
+    return model
+
+
+def test_object_ids_match_across_codecs(orjson_codec: OrjsonCodec):
+    results = []
+    for codec in (UjsonCodec(), orjson_codec):
+        transport = MemoryTransport()
+        serializer = BaseObjectSerializer([transport], json_codec=codec)
+        results.append((serializer.write_json(_model()), transport.objects))
+
+    (ujson_id, ujson_root), ujson_objects = results[0]
+    (orjson_id, orjson_root), orjson_objects = results[1]
+    assert ujson_id == orjson_id
+    assert ujson_root == orjson_root
+    assert ujson_objects == orjson_objects
+
+
+def test_set_json_codec():
+    try:
+        assert set_json_codec("ujson").name == "ujson"
+        assert isinstance(get_json_codec(), UjsonCodec)
+    finally:
+        set_json_codec(None)
@@ -0,0 +1,58 @@
+import os
+
+from specklepy.core.api import operations
+from specklepy.objects.base import Base
+from specklepy.transports.memory import MemoryTransport
+
+
+def test_spills_over_budget(tmp_path):
+    transport = MemoryTransport(max_memory_mb=0.01, spill_dir=str(tmp_path))
+    objects = {f"{i:032x}": f'{{"value":"{"x" * 100}{i}"}}' for i in range(1000)}
+    for id, obj in objects.items():
+        transport.save_object(id, obj)
+
+    assert transport.stats.size_bytes <= 10000
+    assert len(transport.objects) + len(transport.spilled_ids()) == len(objects)
+    assert transport.stats.evicted_objects == len(transport.spilled_ids())
+    # the oldest objects are the ones spilled
+    assert f"{0:032x}" not in transport.objects
+
+    ids = list(objects) + ["missing"]
+    assert transport.get_objects(ids) == {**objects, "missing": None}
+    assert transport.get_object(f"{0:032x}") == objects[f"{0:032x}"]
+    assert transport.has_objects(ids) == {
+        **dict.fromkeys(objects, True),
+        "missing": False,
+    }
+
+    transport.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_receive_with_budget(base: Base, tmp_path):
+    transport = MemoryTransport(max_memory_mb=0.0005, spill_dir=str(tmp_path))
+    obj_id = operations.send(base, [transport], use_default_cache=False)
+    assert transport.spilled_ids()
+
+    received = operations.receive(obj_id, local_transport=transport)
+    assert received.get_id() == base.get_id()
+
+
+def test_budget_counts_utf8_bytes(tmp_path):
+    transport = MemoryTransport(max_memory_mb=0.01, spill_dir=str(tmp_path))
+    transport.save_object("a", '{"name":"Wänd"}')
+
+    assert transport.stats.size_bytes == len('{"name":"Wänd"}'.encode())
+    transport.close()
+
+
+def test_spilled_objects_are_counted_once(tmp_path):
+    transport = MemoryTransport(max_memory_mb=0.001, spill_dir=str(tmp_path))
+    objects = {f"{i:032x}": "x" * 100 for i in range(30)}
+    for _ in range(2):
+        for id, obj in objects.items():
+            transport.save_object(id, obj)
+
+    assert transport._spill.count == len(transport.spilled_ids())
+    assert "spilled: " + str(len(transport.spilled_ids())) in repr(transport)
+    transport.close()
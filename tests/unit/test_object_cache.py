@@ -0,0 +1,116 @@
+import pytest
+
+from specklepy.core.api import operations
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects.base import Base
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.serialization.object_cache import (
+    DeserializedObjectCache,
+    get_object_cache,
+    set_object_cache,
+)
+from specklepy.transports.memory import MemoryTransport
+
+
+class CountingTransport(MemoryTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    def get_object(self, id: str):
+        self.reads += 1
+        return super().get_object(id)
+
+
+def version(name: str) -> Base:
+    material = Base(applicationId="material")
+    material.values = [1.0, 2.0, 3.0]
+    root = Base(applicationId=name)
+    root["@material"] = material
+    root["@same_material"] = material
+    root["@geometry"] = [Base(applicationId=f"geometry {i}") for i in range(3)]
+    return root
+
+
+@pytest.fixture()
+def transport():
+    return CountingTransport()
+
+
+def read(transport, obj_id, cache) -> Base:
+    serializer = BaseObjectSerializer(read_transport=transport, object_cache=cache)
+    return serializer.read_json(transport.get_object(obj_id))
+
+
+def test_reuses_objects_across_reads(transport: CountingTransport):
+    first_id = operations.send(version("first"), [transport], use_default_cache=False)
+    second_id = operations.send(version("second"), [transport], use_default_cache=False)
+    cache = DeserializedObjectCache(max_objects=100)
+
+    first = read(transport, first_id, cache)
+    transport.reads = 0
+    second = read(transport, second_id, cache)
+
+    # only the root changed
+    assert transport.reads == 1
+    assert cache.stats.hits == 4
+    assert second.get_id() == version("second").get_id()
+    assert second["@material"] is second["@same_material"]
+    assert second["@material"] is not first["@material"]
+
+
+def test_received_objects_dont_change_the_cache(transport: CountingTransport):
+    obj_id = operations.send(version("first"), [transport], use_default_cache=False)
+    cache = DeserializedObjectCache(max_objects=100)
+
+    first = read(transport, obj_id, cache)
+    first["@material"].values.append(4.0)
+    first["@material"].applicationId = "changed"
+    second = read(transport, obj_id, cache)
+
+    assert second["@material"].values == [1.0, 2.0, 3.0]
+    assert second["@material"].applicationId == "material"
+
+
+def test_evicts_the_least_recently_used(transport: CountingTransport):
+    obj_id = operations.send(version("first"), [transport], use_default_cache=False)
+    cache = DeserializedObjectCache(max_objects=2)
+
+    received = read(transport, obj_id, cache)
+
+    children = [received["@material"], *received["@geometry"]]
+    assert cache.stats.evicted_objects == 2
+    assert sum(child.id in cache for child in children) == 2
+
+
+def test_bounded_by_bytes():
+    cache = DeserializedObjectCache(max_bytes=100)
+
+    cache.put("a", Base(), 60)
+    cache.put("b", Base(), 60)
+    cache.put("too big", Base(), 101)
+
+    assert "a" not in cache
+    assert "b" in cache
+    assert "too big" not in cache
+    assert cache.stats.size_bytes == 60
+    assert cache.stats.evicted_bytes == 60
+
+
+def test_needs_a_bound():
+    with pytest.raises(SpeckleException):
+        DeserializedObjectCache()
+
+
+def test_shared_by_receives(transport: CountingTransport):
+    obj_id = operations.send(version("first"), [transport], use_default_cache=False)
+    cache = set_object_cache(DeserializedObjectCache(max_objects=100))
+    try:
+        operations.receive(obj_id, local_transport=transport)
+        operations.receive(obj_id, local_transport=transport)
+    finally:
+        set_object_cache(None)
+
+    assert get_object_cache() is None
+    assert cache.stats.hits > 0
+    assert cache.stats.hit_rate > 0
@@ -0,0 +1,85 @@
+import json
+
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from specklepy.core.api import operations
+from specklepy.logging.report import LatencyHistogram, OperationReport, recording
+from specklepy.objects.base import Base
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.server.batch_sender import BatchSender
+from specklepy.transports.sqlite import SQLiteTransport
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    for _ in range(99):
+        histogram.record(0.002)
+    histogram.record(3.0)
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) == 0.0025
+    assert histogram.percentile(100) == 3.0
+    assert histogram.max_seconds == 3.0
+
+
+def test_send_and_receive_reports(base: Base, tmp_path):
+    reports = []
+    local = SQLiteTransport(base_path=str(tmp_path), compression="zstd")
+    memory = MemoryTransport()
+    obj_id = operations.send(
+        base, [local, memory], use_default_cache=False, on_report=reports.append
+    )
+
+    send_report: OperationReport = reports[0]
+    assert send_report.operation == "send"
+    assert send_report.object_id == obj_id
+    assert send_report.object_count == len(memory.objects)
+    assert set(send_report.phases) == {
+        "traversal",
+        "hashing",
+        "encoding",
+        "enqueue",
+        "flush",
+    }
+    assert send_report.total_seconds >= sum(send_report.phases.values())
+    sqlite_report = send_report.transports[local.name]
+    assert sqlite_report.enqueue.count == send_report.object_count
+    assert sqlite_report.batch_count >= 1
+    assert sqlite_report.bytes_raw == send_report.bytes_raw
+    assert sqlite_report.bytes_compressed > 0
+    assert obj_id in send_report.summary()
+
+    received = operations.receive(
+        obj_id, local_transport=local, on_report=reports.append
+    )
+    receive_report = reports[1]
+    assert received.get_id() == base.get_id()
+    assert receive_report.operation == "receive"
+    assert receive_report.object_count >= send_report.object_count
+    assert set(receive_report.phases) == {"local_lookup", "deserialization"}
+
+
+def test_upload_report(httpserver: HTTPServer):
+    def diff(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        return Response(json.dumps({id: int(id, 16) % 10 == 0 for id in ids}))
+
+    httpserver.expect_request("/api/diff/project").respond_with_handler(diff)
+    httpserver.expect_request("/objects/project").respond_with_data("", 201)
+
+    sender = BatchSender(
+        httpserver.url_for("").rstrip("/"), "project", "token", max_batch_length=10
+    )
+    with recording(OperationReport("send")) as report:
+        for i in range(100):
+            sender.send_object(f"{i:032x}", f'{{"value":{i}}}')
+        sender.flush()
+
+    upload = report.transports["RemoteTransport"]
+    assert upload.objects_diffed == 100
+    assert upload.diff_hit_ratio == 0.1
+    assert upload.batch_count == 10
+    assert upload.bytes_compressed > 0
+    assert upload.bytes_raw > 90 * len('{"value":1}')
+    assert report.total_seconds > 0
@@ -0,0 +1,135 @@
+import os
+from typing import Optional
+
+import pytest
+
+from specklepy.core.api import operations
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects.base import Base
+from specklepy.transports import pack as pack_module
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.pack import PackTransport, export_pack, import_pack
+
+
+class BatchRecordingTransport(MemoryTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches = []
+
+    def get_objects(self, id_list):
+        self.batches.append(list(id_list))
+        return super().get_objects(id_list)
+
+
+class CopyOnlyTransport(MemoryTransport):
+    def get_object(self, id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def copy_object_and_children(
+        self, id: str, target_transport: AbstractTransport
+    ) -> str:
+        target_transport.begin_write()
+        for child_id, child in self.objects.items():
+            target_transport.save_object(child_id, child)
+        target_transport.end_write()
+        return self.objects[id]
+
+
+@pytest.fixture
+def sent(base: Base):
+    memory = MemoryTransport()
+    obj_id = operations.send(base, [memory], use_default_cache=False)
+    return obj_id, memory
+
+
+@pytest.mark.parametrize("compression", ["zstd", "zlib", None])
+def test_export_and_receive(sent, base: Base, tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    obj_id, memory = sent
+    path = str(tmp_path / "version.pack")
+
+    count = export_pack(obj_id, memory, path, compression=compression)
+    assert count == len(memory.objects)
+
+    with PackTransport(path) as pack:
+        assert pack.root_id == obj_id
+        assert pack.get_objects(list(memory.objects)) == memory.objects
+        assert pack.get_object("missing") is None
+        assert pack.has_objects([obj_id, "missing", "ü"]) == {
+            obj_id: True,
+            "missing": False,
+            "ü": False,
+        }
+
+        target = MemoryTransport()
+        received = operations.receive(obj_id, pack, target)
+        assert received.get_id() == base.get_id()
+        assert target.objects == memory.objects
+
+
+def test_import_pack(sent, tmp_path):
+    obj_id, memory = sent
+    path = str(tmp_path / "version.pack")
+    export_pack(obj_id, memory, path)
+
+    target = MemoryTransport()
+    assert import_pack(path, target) == obj_id
+    assert target.objects == memory.objects
+
+
+def test_copy_child_closure(sent, base: Base, tmp_path):
+    obj_id, memory = sent
+    path = str(tmp_path / "version.pack")
+    export_pack(obj_id, memory, path)
+
+    child_id = base["@detach"].get_id()
+    target = MemoryTransport()
+    with PackTransport(path) as pack:
+        pack.copy_object_and_children(child_id, target)
+    assert child_id in target.objects
+    assert obj_id not in target.objects
+
+
+def test_export_streams_batches(sent, tmp_path, monkeypatch):
+    monkeypatch.setattr(pack_module, "_EXPORT_BATCH_LENGTH", 3)
+    obj_id, memory = sent
+    source = BatchRecordingTransport()
+    source.objects = memory.objects
+    path = str(tmp_path / "version.pack")
+
+    export_pack(obj_id, source, path, compression="zlib")
+
+    assert all(len(batch) <= 3 for batch in source.batches)
+    children = [id for batch in source.batches for id in batch]
+    assert children == sorted(id for id in memory.objects if id != obj_id)
+    with PackTransport(path) as pack:
+        assert pack.get_objects(list(memory.objects)) == memory.objects
+
+
+def test_export_from_copy_only_transport(sent, tmp_path):
+    obj_id, memory = sent
+    source = CopyOnlyTransport()
+    source.objects = memory.objects
+    path = str(tmp_path / "version.pack")
+
+    assert export_pack(obj_id, source, path) == len(memory.objects)
+    with PackTransport(path) as pack:
+        assert pack.get_objects(list(memory.objects)) == memory.objects
+
+
+def test_export_missing_children(sent, tmp_path):
+    obj_id, memory = sent
+    del memory.objects[next(id for id in memory.objects if id != obj_id)]
+    path = tmp_path / "version.pack"
+    with pytest.raises(SpeckleException):
+        export_pack(obj_id, memory, str(path))
+    assert not os.path.exists(path)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.pack"
+    path.write_bytes(b"x" * 200)
+    with pytest.raises(SpeckleException):
+        PackTransport(str(path))
@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from specklepy.core.api import operations
+from specklepy.logging import profiling
+from specklepy.objects.base import Base
+from specklepy.transports.memory import MemoryTransport
+
+
+def busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_disabled_without_a_directory(monkeypatch):
+    monkeypatch.delenv("SPECKLE_PROFILE_DIR", raising=False)
+    with profiling.profile("send") as run:
+        assert run is None
+
+
+@pytest.mark.parametrize("format", profiling.FORMATS)
+def test_profile_samples_threads(tmp_path, format):
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    with profiling.profile(
+        "test", str(tmp_path), format=format, interval_seconds=0.001, trace_memory=True
+    ) as run:
+        worker.start()
+        with profiling.profile("phase"):
+            while run.profiler.sample_count < 20:
+                stop.wait(0.01)
+        stop.set()
+        worker.join()
+
+    assert profiling.active_profile() is None
+    assert not tracemalloc.is_tracing()
+    written = sorted(os.listdir(tmp_path))
+    assert sum(name.endswith(".tracemalloc") for name in written) == 4
+    assert set(profiling.recent_profiles()) >= set(run.paths)
+
+    output = run.paths[-1]
+    with open(output) as f:
+        content = f.read()
+    if format == "collapsed":
+        assert any(
+            line.startswith("busy;") and "busy_loop" in line
+            for line in content.splitlines()
+        )
+    else:
+        profile = json.loads(content)
+        assert "busy" in {p["name"] for p in profile["profiles"]}
+        frames = profile["shared"]["frames"]
+        assert "busy_loop" in {frame["name"] for frame in frames}
+
+
+def test_send_is_profiled_with_env_var(tmp_path, monkeypatch, base: Base):
+    monkeypatch.setenv("SPECKLE_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("SPECKLE_PROFILE_FORMAT", "collapsed")
+    monkeypatch.setenv("SPECKLE_PROFILE_MEMORY", "0")
+    operations.send(base, [MemoryTransport()], use_default_cache=False)
+
+    written = os.listdir(tmp_path)
+    assert len(written) == 1
+    assert written[0].startswith("send-")
+    assert written[0].endswith(".collapsed")
+
+
+def test_memory_isnt_traced_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("SPECKLE_PROFILE_MEMORY", raising=False)
+    with profiling.profile("test", str(tmp_path)) as run:
+        assert not tracemalloc.is_tracing()
+
+    assert not any(path.endswith(".tracemalloc") for path in run.paths)
+
+
+def test_concurrent_profiles_are_separate(tmp_path):
+    started = threading.Barrier(2)
+
+    def profiled(name: str) -> profiling.ProfileRun:
+        with profiling.profile(name, str(tmp_path), trace_memory=True) as run:
+            started.wait()
+            assert profiling.active_profile() is run
+            started.wait()
+        return run
+
+    with ThreadPoolExecutor(2) as pool:
+        runs = list(pool.map(profiled, ["first", "second"]))
+
+    assert runs[0] is not runs[1]
+    assert [run.name for run in runs] == ["first", "second"]
+    assert all(len(run.paths) == 3 for run in runs)
+    assert not tracemalloc.is_tracing()
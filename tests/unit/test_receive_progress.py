@@ -0,0 +1,71 @@
+from typing import List
+
+from specklepy.core.api import operations
+from specklepy.objects.base import Base
+from specklepy.progress.receive_progress import (
+    ReceiveProgress,
+    ReceiveProgressTracker,
+)
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.server import ServerTransport
+from tests.fake_server import FakeSpeckleServer
+
+
+def test_tracker_throttles_updates_but_reports_the_end():
+    updates: List[ReceiveProgress] = []
+    tracker = ReceiveProgressTracker(updates.append, update_interval_seconds=3600)
+
+    with tracker.stage_of("download", total_objects=2000):
+        for _ in range(2000):
+            tracker.advance(size=10)
+
+    assert len(updates) == 1
+    assert updates[0].done
+    assert updates[0].objects == 2000
+    assert updates[0].bytes == 20000
+    assert updates[0].fraction == 1.0
+    assert updates[0].eta_seconds == 0
+
+
+def test_progress_estimates():
+    progress = ReceiveProgress(
+        "download", objects=25, total_objects=100, bytes=500, elapsed_seconds=5
+    )
+
+    assert progress.fraction == 0.25
+    assert progress.objects_per_second == 5
+    assert progress.bytes_per_second == 100
+    assert progress.eta_seconds == 15
+    assert ReceiveProgress("download", 1, None, 0, 1).eta_seconds is None
+
+
+def test_receive_reports_download_and_deserialization(
+    fake_server: FakeSpeckleServer, base: Base
+):
+    transport = ServerTransport(
+        fake_server.project_id,
+        token="token",
+        url=fake_server.url,
+        cache_known_objects=False,
+    )
+    obj_id = operations.send(base, [transport], use_default_cache=False)
+    children = len(fake_server.objects) - 1
+    assert children > 0
+
+    updates: List[ReceiveProgress] = []
+    received = operations.receive(
+        obj_id,
+        transport,
+        MemoryTransport(),
+        on_progress=updates.append,
+        progress_interval_seconds=0,
+    )
+
+    assert received.get_id() == base.get_id()
+    done = {update.stage: update for update in updates if update.done}
+    assert set(done) == {"download", "deserialization"}
+    assert done["download"].objects == done["download"].total_objects == children
+    assert done["download"].bytes > 0
+    assert done["deserialization"].total_objects == children + 1
+    assert done["deserialization"].objects >= children + 1
+    assert [update.stage for update in updates][-1] == "deserialization"
@@ -0,0 +1,185 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.server import ServerTransport
+from specklepy.transports.server.coalescer import RequestCoalescer
+
+PROJECT = "project"
+ROOT = "root"
+
+
+@pytest.fixture
+def objects() -> Dict[str, str]:
+    children = {f"{i:032x}": f'{{"id":"{i:032x}","name":"\\t{i}"}}' for i in range(95)}
+    root = json.dumps({"id": ROOT, "__closure": {id: 1 for id in children}})
+    return {ROOT: root, **children}
+
+
+def serve_objects(httpserver: HTTPServer, objects: Dict[str, str], requests: list):
+    def get_objects(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        requests.append(ids)
+        return Response("".join(f"{id}\t{objects[id]}\n" for id in ids))
+
+    httpserver.expect_request(f"/objects/{PROJECT}/{ROOT}/single").respond_with_data(
+        objects[ROOT]
+    )
+    httpserver.expect_request(
+        f"/api/getobjects/{PROJECT}", method="POST"
+    ).respond_with_handler(get_objects)
+
+
+@pytest.mark.parametrize("download_threads", [1, 4])
+def test_copy_object_and_children(httpserver: HTTPServer, objects, download_threads):
+    requests = []
+    serve_objects(httpserver, objects, requests)
+    transport = ServerTransport(
+        PROJECT,
+        token="token",
+        url=httpserver.url_for("/").rstrip("/"),
+        download_threads=download_threads,
+        download_chunk_size=10,
+    )
+    target = MemoryTransport()
+
+    assert transport.copy_object_and_children(ROOT, target) == objects[ROOT]
+
+    assert target.objects == objects
+    assert len(requests) == 10
+    assert all(len(ids) <= 10 for ids in requests)
+
+
+def test_copy_resumes_from_target(httpserver: HTTPServer, objects):
+    requests = []
+    serve_objects(httpserver, objects, requests)
+    transport = ServerTransport(
+        PROJECT, token="token", url=httpserver.url_for("/").rstrip("/")
+    )
+    target = MemoryTransport()
+    already_copied = list(objects)[1:51]
+    for id in already_copied:
+        target.save_object(id, objects[id])
+
+    transport.copy_object_and_children(ROOT, target)
+
+    assert target.objects == objects
+    assert sorted(sum(requests, [])) == sorted(list(objects)[51:])
+
+
+def test_failed_copy_keeps_downloaded_children(httpserver: HTTPServer, objects):
+    failed = []
+
+    def get_objects(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        if not failed:
+            failed.append(ids)
+            return Response("unavailable", 400)
+        return Response("".join(f"{id}\t{objects[id]}\n" for id in ids))
+
+    httpserver.expect_request(f"/objects/{PROJECT}/{ROOT}/single").respond_with_data(
+        objects[ROOT]
+    )
+    httpserver.expect_request(
+        f"/api/getobjects/{PROJECT}", method="POST"
+    ).respond_with_handler(get_objects)
+    transport = ServerTransport(
+        PROJECT,
+        token="token",
+        url=httpserver.url_for("/").rstrip("/"),
+        download_threads=1,
+        download_chunk_size=10,
+    )
+    target = MemoryTransport()
+
+    with pytest.raises(SpeckleException):
+        transport.copy_object_and_children(ROOT, target)
+    assert ROOT not in target.objects
+
+    transport.copy_object_and_children(ROOT, target)
+    assert target.objects == objects
+
+
+def serve_reads(httpserver: HTTPServer, objects: Dict[str, str], requests: list):
+    def get_single(request: Request) -> Response:
+        id = request.path.split("/")[-2]
+        requests.append([id])
+        if id not in objects:
+            return Response("not found", 404)
+        return Response(objects[id])
+
+    def get_objects(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        requests.append(ids)
+        return Response(
+            "".join(f"{id}\t{objects[id]}\n" for id in ids if id in objects)
+        )
+
+    def diff(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        return Response(json.dumps({id: id in objects for id in ids}))
+
+    httpserver.expect_request(
+        re.compile(f"/objects/{PROJECT}/.*/single")
+    ).respond_with_handler(get_single)
+    httpserver.expect_request(
+        f"/api/getobjects/{PROJECT}", method="POST"
+    ).respond_with_handler(get_objects)
+    httpserver.expect_request(
+        f"/api/diff/{PROJECT}", method="POST"
+    ).respond_with_handler(diff)
+
+
+def test_reads(httpserver: HTTPServer, objects):
+    requests = []
+    serve_reads(httpserver, objects, requests)
+    transport = ServerTransport(
+        PROJECT,
+        token="token",
+        url=httpserver.url_for("/").rstrip("/"),
+        download_chunk_size=40,
+    )
+    ids = list(objects)
+
+    assert transport.get_object(ids[1]) == objects[ids[1]]
+    assert transport.get_object("missing") is None
+    assert transport.get_objects([*ids, "missing"]) == {**objects, "missing": None}
+    assert transport.has_objects(["missing", *ids]) == {
+        "missing": False,
+        **{id: True for id in ids},
+    }
+
+
+def test_concurrent_gets_are_coalesced(httpserver: HTTPServer, objects):
+    requests = []
+    serve_reads(httpserver, objects, requests)
+    transport = ServerTransport(
+        PROJECT, token="token", url=httpserver.url_for("/").rstrip("/")
+    )
+    ids = list(objects)
+
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(transport.get_object, ids))
+
+    assert results == list(objects.values())
+    assert sorted(sum(requests, [])) == sorted(ids)
+    assert len(requests) < len(ids)
+
+
+def test_coalescer_propagates_errors():
+    def fetch(ids):
+        raise SpeckleException("unavailable")
+
+    coalescer = RequestCoalescer(fetch)
+    with pytest.raises(SpeckleException):
+        coalescer.get("id")
+    # a failed batch doesn't block the following ones
+    with pytest.raises(SpeckleException):
+        coalescer.get("id")
@@ -0,0 +1,300 @@
+import gc
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from typing import Any, Dict, List
+
+import pytest
+
+from specklepy.api import operations
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects.base import Base
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.transports.disk import DiskTransport
+from specklepy.transports.sqlite import SQLiteTransport
+
+
+@pytest.fixture(params=[False, True], ids=["foreground", "background_writer"])
+def transport(request, tmp_path) -> SQLiteTransport:
+    transport = SQLiteTransport(
+        base_path=str(tmp_path),
+        max_batch_size_mb=0.001,
+        background_writer=request.param,
+    )
+    yield transport
+    transport.close()
+
+
+def test_save_and_get_objects(transport: SQLiteTransport):
+    ids = [f"{i:032x}" for i in range(2500)]
+    transport.begin_write()
+    for id in ids:
+        transport.save_object(id, f'{{"id":"{id}"}}')
+    transport.end_write()
+
+    assert transport.get_object(ids[0]) == f'{{"id":"{ids[0]}"}}'
+    assert transport.get_object("missing") is None
+
+    objects = transport.get_objects([*ids, "missing"])
+    assert objects["missing"] is None
+    assert all(objects[id] == f'{{"id":"{id}"}}' for id in ids)
+
+    found = transport.has_objects(["missing", *ids])
+    assert not found["missing"]
+    assert sum(found.values()) == len(ids)
+
+
+def test_send_and_receive(transport: SQLiteTransport, base: Base):
+    obj_id = operations.send(base, [transport], use_default_cache=False)
+    received = operations.receive(obj_id, local_transport=transport)
+
+    assert received.get_id() == base.get_id()
+
+
+def test_background_writer_errors_raise_on_end_write(tmp_path):
+    transport = SQLiteTransport(base_path=str(tmp_path), background_writer=True)
+    transport.begin_write()
+    transport.save_object("id", ["not", "a", "string"])
+    with pytest.raises(SpeckleException):
+        transport.end_write()
+    transport.close()
+
+
+def _write_objects(base_path: str, prefix: str, count: int) -> None:
+    transport = SQLiteTransport(base_path=base_path, max_batch_size_mb=0.01)
+    transport.begin_write()
+    for i in range(count):
+        transport.save_object(f"{prefix}{i:030x}", f'{{"value":{i}}}')
+    transport.end_write()
+    transport.close()
+
+
+def test_concurrent_threads(tmp_path):
+    transport = SQLiteTransport(base_path=str(tmp_path), max_batch_size_mb=0.01)
+    ids = [f"{i:032x}" for i in range(2000)]
+    transport.begin_write()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda id: transport.save_object(id, "{}"), ids))
+    transport.end_write()
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(transport.get_object, ids))
+        found = list(pool.map(transport.has_objects, [ids[i::8] for i in range(8)]))
+
+    assert results == ["{}"] * len(ids)
+    assert all(all(f.values()) for f in found)
+    transport.close()
+
+
+def test_connections_are_closed_with_their_thread(tmp_path):
+    transport = SQLiteTransport(base_path=str(tmp_path))
+    for _ in range(20):
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(transport.get_object, ["a", "b", "c", "d"]))
+    gc.collect()
+
+    # only the connection of the main thread is left
+    assert len(transport._connections) == 1
+    transport.close()
+
+
+def test_concurrent_saves_start_a_single_writer(tmp_path):
+    transport = SQLiteTransport(
+        base_path=str(tmp_path), max_batch_size_mb=0.0001, background_writer=True
+    )
+    ids = [f"{i:032x}" for i in range(2000)]
+    transport.begin_write()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda id: transport.save_object(id, "{}"), ids))
+    writers = [t for t in threading.enumerate() if t.name == "SQLiteTransportWriter"]
+    transport.end_write()
+
+    assert len(writers) == 1
+    assert all(transport.has_objects(ids).values())
+    transport.close()
+
+
+def test_concurrent_processes(tmp_path):
+    with ProcessPoolExecutor(4) as pool:
+        futures = [
+            pool.submit(_write_objects, str(tmp_path), f"{p:02x}", 500)
+            for p in range(4)
+        ]
+        for future in futures:
+            future.result()
+
+    transport = SQLiteTransport(base_path=str(tmp_path))
+    assert len(transport.get_all_objects()) == 2000
+    transport.close()
+
+
+class CountingSQLiteTransport(SQLiteTransport):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.has_objects_calls = 0
+
+    def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
+        self.has_objects_calls += 1
+        return super().has_objects(id_list)
+
+
+@pytest.mark.parametrize("max_cache_size_mb", [None, 100])
+def test_receive_only_checks_children_of_bounded_caches(
+    tmp_path, base: Base, max_cache_size_mb
+):
+    remote = DiskTransport(base_path=str(tmp_path / "remote"))
+    local = CountingSQLiteTransport(
+        base_path=str(tmp_path / "local"), max_cache_size_mb=max_cache_size_mb
+    )
+    obj_id = operations.send(base, [remote, local], use_default_cache=False)
+
+    received = operations.receive(obj_id, remote, local)
+
+    assert received.get_id() == base.get_id()
+    assert local.has_objects_calls == (1 if max_cache_size_mb else 0)
+    local.close()
+    remote.close()
+
+
+def _write_session(transport: SQLiteTransport, prefix: str, count: int) -> List[str]:
+    ids = [f"{prefix}{i:030x}" for i in range(count)]
+    transport.begin_write()
+    for id in ids:
+        transport.save_object(id, "x" * 1000)
+    transport.end_write()
+    time.sleep(0.01)
+    return ids
+
+
+def test_cache_budget_evicts_least_recently_used(tmp_path):
+    transport = SQLiteTransport(base_path=str(tmp_path), max_cache_size_mb=0.15)
+    first = _write_session(transport, "aa", 100)
+    second = _write_session(transport, "bb", 100)
+    # reading the first session makes the second one the least recently used
+    transport.get_objects(first)
+
+    transport.run_maintenance()
+
+    assert all(transport.has_objects(first).values())
+    assert not any(transport.has_objects(second).values())
+    assert transport.stats.evicted_objects == 100
+    assert transport.stats.evicted_bytes == 100 * 1000
+    assert transport.stats.hits == 100
+    assert transport.stats.hit_rate == 1.0
+    transport.close()
+
+
+def test_cache_budget_migrates_legacy_db(tmp_path):
+    with closing(sqlite3.connect(tmp_path / "Objects.db")) as connection:
+        connection.execute(
+            "CREATE TABLE objects(hash TEXT PRIMARY KEY, content TEXT) WITHOUT ROWID"
+        )
+        connection.execute("INSERT INTO objects VALUES('legacy', ?)", ("x" * 20000,))
+        connection.commit()
+
+    transport = SQLiteTransport(base_path=str(tmp_path), max_cache_size_mb=0.1)
+    assert transport.get_object("legacy") == "x" * 20000
+    new = _write_session(transport, "cc", 90)
+
+    transport.run_maintenance()
+
+    # the legacy object was last read before the new objects were written
+    assert transport.get_object("legacy") is None
+    assert all(transport.has_objects(new).values())
+    transport.close()
+
+
+def _columns(path) -> List[str]:
+    with closing(sqlite3.connect(path / "Objects.db")) as connection:
+        return [row[1] for row in connection.execute("PRAGMA table_info(objects)")]
+
+
+def test_unbounded_cache_keeps_the_legacy_schema(tmp_path):
+    transport = SQLiteTransport(base_path=str(tmp_path))
+    _write_session(transport, "aa", 10)
+    transport.close()
+
+    assert _columns(tmp_path) == ["hash", "content"]
+
+
+def test_cache_budget_tracks_the_total_size(tmp_path):
+    transport = SQLiteTransport(base_path=str(tmp_path), max_cache_size_mb=0.15)
+    _write_session(transport, "aa", 100)
+    # writers without a budget keep the size up to date once it's tracked
+    unbounded = SQLiteTransport(base_path=str(tmp_path))
+    _write_session(unbounded, "bb", 100)
+    unbounded.close()
+
+    transport.run_maintenance()
+
+    assert _columns(tmp_path) == ["hash", "content", "size", "last_access"]
+    assert transport.stats.evicted_objects == 100
+    with closing(sqlite3.connect(tmp_path / "Objects.db")) as connection:
+        assert (
+            connection.execute("SELECT bytes FROM cache_size").fetchone()[0]
+            == (connection.execute("SELECT SUM(size) FROM objects").fetchone()[0])
+        )
+    assert transport.stats.size_bytes == 100 * 1000
+    transport.close()
+
+
+def _speckle_like_objects(count: int) -> Dict[str, str]:
+    objects = {}
+    for i in range(count):
+        obj = Base(applicationId=f"element-{i}")
+        obj.name = f"Wall {i % 50}"
+        obj.properties = {"Material": "Concrete", "Width": 200 + i % 7, "Level": i % 3}
+        obj.vertices = [float(v % 13) for v in range(i % 40)]
+        obj_id, serialized = BaseObjectSerializer().write_json(obj)
+        objects[obj_id] = serialized
+    return objects
+
+
+def test_zstd_compression(tmp_path):
+    pytest.importorskip("zstandard")
+    objects = _speckle_like_objects(3000)
+    transport = SQLiteTransport(base_path=str(tmp_path), compression="zstd")
+    transport.begin_write()
+    for id, obj in objects.items():
+        transport.save_object(id, obj)
+    transport.end_write()
+
+    assert transport.get_objects(list(objects)) == objects
+    rows = _raw_rows(tmp_path)
+    assert all(isinstance(content, bytes) for content in rows.values())
+    # the objects written after the dictionary got trained on the first ones
+    trained = list(objects)[-1000:]
+    stored = sum(len(rows[id]) for id in trained)
+    assert stored * 4 < sum(len(objects[id]) for id in trained)
+    transport.close()
+
+    # compressed objects stay readable without enabling compression
+    reader = SQLiteTransport(base_path=str(tmp_path))
+    assert reader.get_objects(list(objects)) == objects
+    reader.close()
+
+
+def test_zstd_compression_migrates_uncompressed_objects(tmp_path):
+    pytest.importorskip("zstandard")
+    objects = _speckle_like_objects(10)
+    writer = SQLiteTransport(base_path=str(tmp_path))
+    writer.begin_write()
+    for id, obj in objects.items():
+        writer.save_object(id, obj)
+    writer.end_write()
+    writer.close()
+
+    transport = SQLiteTransport(base_path=str(tmp_path), compression="zstd")
+    assert transport.get_objects(list(objects)) == objects
+    transport.run_maintenance()
+
+    assert all(isinstance(content, bytes) for content in _raw_rows(tmp_path).values())
+    assert transport.get_objects(list(objects)) == objects
+    transport.close()
+
+
+def _raw_rows(path) -> Dict[str, Any]:
+    with closing(sqlite3.connect(path / "Objects.db")) as connection:
+        return dict(connection.execute("SELECT hash, content FROM objects"))
@@ -0,0 +1,92 @@
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from specklepy.core.api import operations
+from specklepy.logging import tracing
+from specklepy.objects.base import Base
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.server import ServerTransport
+
+PROJECT = "project"
+
+
+class RecordingTracer(tracing.Tracer):
+    def __init__(self):
+        self.spans = []
+        self.metrics = []
+        self._parent = ContextVar("parent", default=None)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, attributes):
+        span = {"name": name, "parent": self._parent.get(), **attributes}
+        with self._lock:
+            self.spans.append(span)
+        token = self._parent.set(name)
+        try:
+            yield tracing.Span()
+        finally:
+            self._parent.reset(token)
+
+    def record(self, name, value, attributes):
+        self.metrics.append((name, value))
+
+
+@pytest.fixture
+def tracer():
+    tracer = RecordingTracer()
+    tracing.set_tracer(tracer)
+    yield tracer
+    tracing.set_tracer(None)
+
+
+def test_no_op_by_default():
+    assert type(tracing.get_tracer()) is tracing.Tracer
+    with tracing.span("anything", key="value") as span:
+        span.set_attribute("other", 1)
+
+
+def test_send_spans_propagate_to_upload_threads(
+    httpserver: HTTPServer, tracer: RecordingTracer, base: Base
+):
+    def diff(request: Request) -> Response:
+        ids = json.loads(request.form["objects"])
+        return Response(json.dumps(dict.fromkeys(ids, False)))
+
+    httpserver.expect_request(f"/api/diff/{PROJECT}").respond_with_handler(diff)
+    httpserver.expect_request(f"/objects/{PROJECT}").respond_with_data("", 201)
+    transport = ServerTransport(
+        PROJECT,
+        token="token",
+        url=httpserver.url_for("").rstrip("/"),
+        cache_known_objects=False,
+    )
+
+    operations.send(base, [transport, MemoryTransport()], use_default_cache=False)
+
+    names = [span["name"] for span in tracer.spans]
+    assert names[:2] == ["speckle.serialize", "speckle.serialize.traverse"]
+    flushes = [s for s in tracer.spans if s["name"] == "speckle.serialize.flush"]
+    assert [s["transport"] for s in flushes] == ["RemoteTransport", "Memory"]
+    # uploads run in the sender's threads, within the send's span
+    uploads = [s for s in tracer.spans if s["name"].startswith("speckle.upload")]
+    assert {s["name"] for s in uploads} == {"speckle.upload", "speckle.upload.diff"}
+    assert all(s["parent"].startswith("speckle.serialize") for s in uploads)
+    assert ("speckle.upload.bytes", uploads[-1]["compressed_bytes"]) in tracer.metrics
+
+
+def test_opentelemetry_adapter():
+    pytest.importorskip("opentelemetry")
+    tracing.enable_opentelemetry()
+    try:
+        with tracing.span("speckle.test", key="value") as span:
+            span.set_attribute("other", 1)
+        tracing.record("speckle.test.bytes", 10)
+    finally:
+        tracing.set_tracer(None)